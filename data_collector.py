@@ -1,7 +1,23 @@
+"""
+Collects webcam images per label into CollectedImages/<label>/.
+
+    python data_collector.py --frames 5 --interval 2
+    python data_collector.py --source video.mp4 --labels Hello Yes --no-preview
+    python data_collector.py --source synthetic --frames 3 --interval 0   # headless
+
+One capture stays open for all labels. The capture thread only grabs
+frames; a pool of writer threads JPEG-encodes and writes them from a
+bounded queue. Label directories are appended to, never replaced.
+"""
 import os
-import cv2
 import time
 import uuid
+import queue
+import argparse
+import threading
+
+import cv2
+import numpy as np
 
 IMAGE_PATH = "CollectedImages"
 
@@ -9,24 +25,213 @@ labels = ['Hello', 'Yes', 'No', 'Thanks', 'IloveYou', 'Please']
 
 number_of_images = 5
 
-for label in labels:
-    
-    img_path = os.path.join(IMAGE_PATH, label)
-    os.makedirs(img_path)
+# Seconds between saved frames and before each label starts
+CAPTURE_INTERVAL = 2.0
+LABEL_DELAY = 3.0
+
+WRITER_THREADS = 2
+WRITE_QUEUE_SIZE = 64
+JPEG_QUALITY = 95
+
+
+class SyntheticSource:
+    """
+    cv2.VideoCapture stand-in producing generated frames, so the
+    collector runs without a camera (CI, tests)
+    """
+
+    def __init__(self, width: int = 640, height: int = 480):
+        self.width, self.height = width, height
+        self.count = 0
+
+    def isOpened(self) -> bool:
+        return True
+
+    def grab(self) -> bool:
+        self.count += 1
+        return True
+
+    def retrieve(self):
+        frame = np.full((self.height, self.width, 3), self.count % 256, dtype=np.uint8)
+        cv2.putText(frame, str(self.count), (20, 60), cv2.FONT_HERSHEY_SIMPLEX, 2, (255, 255, 255), 3)
+        return True, frame
+
+    def read(self):
+        self.grab()
+        return self.retrieve()
+
+    def release(self) -> None:
+        pass
+
+
+def open_source(source: str):
+    """
+    'synthetic', a camera index, or a video file / stream URL. Files use
+    hardware decoding when the OpenCV build supports it; cameras are
+    asked for MJPG and a one-frame buffer so reads return fresh frames.
+    """
+    if source == "synthetic":
+        return SyntheticSource()
+
+    if source.isdigit():
+        cap = cv2.VideoCapture(int(source))
+        cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*"MJPG"))
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+    elif hasattr(cv2, "CAP_PROP_HW_ACCELERATION"):
+        cap = cv2.VideoCapture(
+            source, cv2.CAP_ANY,
+            [cv2.CAP_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY]
+        )
+    else:
+        cap = cv2.VideoCapture(source)
+
+    if not cap.isOpened():
+        raise RuntimeError(f"Could not open video source {source}")
+    return cap
+
+
+class ImageWriter:
+    """
+    Writer threads draining a bounded queue of (path, frame); a full
+    queue blocks the capture loop instead of growing memory
+    """
 
-    #open camera 
-    cap = cv2.VideoCapture(0)
-    print(f"Collecting images for {label}")
-    time.sleep(3)
+    def __init__(self, threads: int = WRITER_THREADS, max_pending: int = WRITE_QUEUE_SIZE,
+                 quality: int = JPEG_QUALITY):
+        self.queue = queue.Queue(maxsize=max_pending)
+        self.params = [cv2.IMWRITE_JPEG_QUALITY, quality]
+        self.written = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+        self._threads = [
+            threading.Thread(target=self._work, name=f"writer-{i}", daemon=True)
+            for i in range(max(1, threads))
+        ]
+        for thread in self._threads:
+            thread.start()
 
-    for imgnum in range(number_of_images):
-        ret,frame = cap.read()
-        imagename=os.path.join(IMAGE_PATH,label,label+'.'+'{}.jpg'.format(str(uuid.uuid1())))
-        cv2.imwrite(imagename, frame)
-        cv2.imshow('frame', frame)
-        time.sleep(2)
+    def _work(self) -> None:
+        while True:
+            item = self.queue.get()
+            if item is None:
+                break
+            path, frame = item
+            try:
+                ok, buffer = cv2.imencode(".jpg", frame, self.params)
+                if not ok:
+                    raise IOError("JPEG encoding failed")
+                tmp_path = path + ".tmp"
+                with open(tmp_path, "wb") as f:
+                    f.write(buffer.tobytes())
+                os.replace(tmp_path, path)
+                with self._lock:
+                    self.written += 1
+            except Exception as e:
+                # Keep draining: a dead writer would leave submit() and
+                # close() blocked on the queue
+                print(f"Failed to write {path}: {e}")
+                with self._lock:
+                    self.errors += 1
 
-        if cv2.waitKey(1) & 0xFF==ord('q'):
+    def submit(self, path: str, frame: np.ndarray) -> None:
+        self.queue.put((path, frame))
+
+    def close(self) -> None:
+        for _ in self._threads:
+            self.queue.put(None)
+        for thread in self._threads:
+            thread.join()
+
+
+def file_fps(cap) -> float:
+    """
+    Frame rate of a video file; 0 for cameras, streams and synthetic
+    frames, which report no frame count
+    """
+    if not hasattr(cap, "get") or cap.get(cv2.CAP_PROP_FRAME_COUNT) <= 0:
+        return 0.0
+    return cap.get(cv2.CAP_PROP_FPS) or 0.0
+
+
+def wait_grabbing(cap, seconds: float) -> None:
+    """
+    Keeps grabbing (without decoding) while waiting, so the next read
+    is a current frame rather than one sitting in the driver buffer.
+    A video file has no clock to wait for, so it is advanced by
+    seconds' worth of frames instead.
+    """
+    fps = file_fps(cap)
+    if fps:
+        for _ in range(int(round(seconds * fps))):
+            if not cap.grab():
+                break
+        return
+
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        if not cap.grab():
             break
-    
-    cap.release()
\ No newline at end of file
+
+
+def collect(cap, writer: ImageWriter, labels: list, frames: int, interval: float,
+            label_delay: float, image_path: str = IMAGE_PATH, preview: bool = True) -> int:
+    captured = 0
+    for label in labels:
+        img_path = os.path.join(image_path, label)
+        os.makedirs(img_path, exist_ok=True)
+
+        print(f"Collecting images for {label}")
+        wait_grabbing(cap, label_delay)
+
+        for imgnum in range(frames):
+            if imgnum:
+                wait_grabbing(cap, interval)
+
+            ret, frame = cap.read()
+            if not ret:
+                print("Video source ended")
+                return captured
+
+            imagename = os.path.join(img_path, label + '.' + '{}.jpg'.format(str(uuid.uuid1())))
+            writer.submit(imagename, frame)
+            captured += 1
+
+            if preview:
+                cv2.imshow('frame', frame)
+                if cv2.waitKey(1) & 0xFF == ord('q'):
+                    return captured
+    return captured
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--source", default="0", help="camera index, video file/URL or 'synthetic'")
+    parser.add_argument("--labels", nargs="+", default=labels)
+    parser.add_argument("--frames", type=int, default=number_of_images, help="images per label")
+    parser.add_argument("--interval", type=float, default=CAPTURE_INTERVAL, help="seconds between images")
+    parser.add_argument("--label-delay", type=float, default=LABEL_DELAY, help="seconds before each label")
+    parser.add_argument("--output", default=IMAGE_PATH)
+    parser.add_argument("--writers", type=int, default=WRITER_THREADS)
+    parser.add_argument("--quality", type=int, default=JPEG_QUALITY)
+    parser.add_argument("--no-preview", action="store_true")
+    args = parser.parse_args()
+
+    cap = open_source(args.source)
+    writer = ImageWriter(threads=args.writers, quality=args.quality)
+    preview = not args.no_preview and args.source != "synthetic"
+    try:
+        captured = collect(
+            cap, writer, args.labels, args.frames, args.interval,
+            args.label_delay, args.output, preview
+        )
+    finally:
+        cap.release()
+        writer.close()
+        if preview:
+            cv2.destroyAllWindows()
+
+    print(f"Captured {captured} images, wrote {writer.written}, {writer.errors} failed")
+
+
+if __name__ == "__main__":
+    main()
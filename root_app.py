@@ -1,4 +1,37 @@
-from signLanguage.pipeline.training_pipeline import TrainPipeline
+"""
+Runs the training pipeline.
 
-obj = TrainPipeline()
-obj.run_pipeline()
+Every run writes its artifacts and its stage state file under
+artifacts/<run id>, where the run id defaults to the current timestamp.
+To rerun an earlier run, skipping the stages it already finished, pass
+its run id (the directory name, also logged at startup):
+
+    python root_app.py --run-id 01_31_2025_10_00_00
+    PIPELINE_RUN_ID=01_31_2025_10_00_00 python root_app.py --force model_trainer
+"""
+import argparse
+import os
+
+# Guarded so process pools can re-import this module (spawn on Windows)
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__.strip().splitlines()[0],
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__.split("\n\n", 1)[1],
+    )
+    parser.add_argument("--run-id", help="rerun this earlier run (same as PIPELINE_RUN_ID)")
+    parser.add_argument("--stage", action="append", help="run only this stage and its dependencies")
+    parser.add_argument("--force", action="append", default=[], help="rerun this stage even if finished")
+    args = parser.parse_args()
+
+    # The run id is read when the pipeline configuration is imported
+    if args.run_id:
+        os.environ["PIPELINE_RUN_ID"] = args.run_id
+
+    from signLanguage.logger import configure_logging
+    from signLanguage.pipeline.training_pipeline import TrainPipeline
+
+    configure_logging()
+
+    obj = TrainPipeline()
+    obj.run_pipeline(targets=args.stage, force=args.force)
@@ -1,62 +1,178 @@
-import torch
-import tempfile
-import sys
 import os
-from fastapi import FastAPI, UploadFile, File
-from PIL import Image
-import io
-import numpy as np
-import cv2
+import json
+import time
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from fastapi import FastAPI, UploadFile, File, Request, WebSocket, WebSocketDisconnect, Header, Response
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.concurrency import run_in_threadpool
 
-from app.s3_operations import S3Operation
-from app.constant import MODEL_PUSHER_BUCKET_NAME, MODEL_PUSHER_S3_MODEL_KEY
-from app.logger import logging
+from app.constant import (
+    MODEL_PUSHER_BUCKET_NAME,
+    MODEL_PUSHER_S3_MODEL_KEY,
+    MODEL_PUSHER_S3_QUANTIZED_MODEL_KEY,
+    INFERENCE_MAX_BATCH_SIZE,
+    INFERENCE_MAX_WAIT_MS,
+    WORKER_POOL_KIND,
+    WORKER_POOL_SIZE,
+    ADMISSION_MAX_PENDING,
+    ADMISSION_RETRY_AFTER_S,
+    VIDEO_FRAME_STRIDE,
+    VIDEO_UPLOAD_CHUNK_SIZE,
+    RESULT_CACHE_MAX_ENTRIES,
+    RESULT_CACHE_TTL_S,
+    MODEL_BACKEND,
+    MODEL_CACHE_DIR,
+    MODEL_CACHE_KEEP_VERSIONS,
+    MODEL_IMG_SIZE,
+    MODEL_RELOAD_INTERVAL_S,
+    ADMIN_TOKEN,
+    METRICS_TIMING_HEADER,
+)
+from app import prefork
+from app.logger import logging, RequestIdMiddleware
+from app.batching import BatchScheduler
+from app.workers import WorkerPool, ServerOverloaded
+from app.stages import decode_image
+from app.postprocess import format_detection
+from app.video import FrameSampler, spool_upload, remove_file
+from app.live import LatestFrameSlot
+from app.cache import ResultCache, make_cache_key
+from app.model_cache import ModelCache
+from app.model_manager import ModelManager
+from app.metrics import (
+    BATCH_SIZE,
+    CACHE_HITS,
+    IN_FLIGHT,
+    MODEL_FORWARD,
+    QUEUE_DEPTH,
+    MetricsMiddleware,
+    StageTimer,
+    observe_model_load,
+    observe_prediction,
+    render_metrics,
+    track_gauges,
+)
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+YOLOV5_DIR = os.path.join(ROOT_DIR, "yolov5")
 
 app = FastAPI(title="Sign Language Detection API")
-model = None
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(RequestIdMiddleware)
 
 
-@app.on_event("startup")
-def load_model():
-    global model
+def run_batch(items):
+    """
+    items are (backend, image) pairs. Each request keeps the backend it
+    started on, so a hot swap never moves an in-flight request to the
+    new model. Returns raw (n, 6) detection arrays; NumPy so they can
+    cross a process pool.
+    """
+    results = [None] * len(items)
+    groups = {}
+    for index, (backend, _) in enumerate(items):
+        groups.setdefault(id(backend), (backend, []))[1].append(index)
 
-    try:
-        logging.info("Starting model load from S3...")
+    for backend, indices in groups.values():
+        BATCH_SIZE.observe(len(indices))
+        with MODEL_FORWARD.labels(backend=backend.name).time():
+            detections = backend.predict([items[i][1] for i in indices])
+        for index, det in zip(indices, detections):
+            results[index] = det
+    return results
 
-        ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        YOLOV5_DIR = os.path.join(ROOT_DIR, "yolov5")
-        sys.path.append(YOLOV5_DIR)
 
-        s3 = S3Operation()
-        model_bytes = s3.read_object(
-            bucket_name=MODEL_PUSHER_BUCKET_NAME,
-            object_name=MODEL_PUSHER_S3_MODEL_KEY,
-            decode=False
-        )
+# The model lives in this process, so forward passes get their own thread;
+# decode and post-processing go to the (thread or process) worker pool.
+scheduler = BatchScheduler(
+    run_batch,
+    max_batch_size=INFERENCE_MAX_BATCH_SIZE,
+    max_wait_ms=INFERENCE_MAX_WAIT_MS,
+    executor=ThreadPoolExecutor(max_workers=1, thread_name_prefix="inference"),
+)
 
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".pt") as f:
-            f.write(model_bytes)
-            model_path = f.name
+cache = ResultCache(
+    max_entries=RESULT_CACHE_MAX_ENTRIES,
+    ttl=RESULT_CACHE_TTL_S,
+)
+
+workers = WorkerPool(
+    kind=WORKER_POOL_KIND,
+    max_workers=WORKER_POOL_SIZE,
+    max_pending=ADMISSION_MAX_PENDING,
+    retry_after=ADMISSION_RETRY_AFTER_S,
+)
+
+def on_model_swap(loaded):
+    # Old entries can never be hit again (the version is in the key)
+    cache.clear()
+    observe_model_load(loaded.info)
+
+
+# The INT8 variant is pushed as a ready-to-serve ONNX graph
+manager = ModelManager(
+    bucket_name=MODEL_PUSHER_BUCKET_NAME,
+    object_name=(
+        MODEL_PUSHER_S3_QUANTIZED_MODEL_KEY
+        if MODEL_BACKEND == "onnx-int8"
+        else MODEL_PUSHER_S3_MODEL_KEY
+    ),
+    backend_kind=MODEL_BACKEND,
+    yolov5_dir=YOLOV5_DIR,
+    model_cache=ModelCache(MODEL_CACHE_DIR, keep_versions=MODEL_CACHE_KEEP_VERSIONS),
+    warmup_size=MODEL_IMG_SIZE,
+    on_swap=on_model_swap,
+)
 
-        model = torch.hub.load(
-            YOLOV5_DIR,
-            "custom",
-            path=model_path,
-            source="local",
-            force_reload=False
-        )
 
-        # 🔥 IMPORTANT: override YOLO default filters
-        model.conf = 0.005    # keep ultra-low confidence boxes
-        model.iou = 0.45
-        model.max_det = 10
+@app.exception_handler(ServerOverloaded)
+async def overloaded_handler(request: Request, exc: ServerOverloaded):
+    return JSONResponse(
+        status_code=503,
+        content={"error": str(exc)},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
 
-        model.eval()
-        print("✅ YOLOv5 model loaded successfully with low conf threshold")
+
+@app.on_event("startup")
+def load_model():
+    try:
+        if manager.current is not None:
+            # Forked from the prefork master: its weights are shared, only
+            # this process' lazy allocations need a warmup
+            manager.warmup(manager.current.backend)
+        else:
+            logging.info("Starting model load from S3...")
+            manager.reload(force=True)
+        logging.info(
+            f"Model ready ({manager.current.backend.name} backend): {manager.current.info}"
+        )
 
     except Exception as e:
         logging.error(f"Model loading failed: {e}")
-        model = None
+
+    # Also started after a failed first load, so the model can still arrive.
+    # Under the prefork master, the master polls and restarts the workers.
+    if prefork.WORKER_ID is None:
+        manager.start_watcher(MODEL_RELOAD_INTERVAL_S)
+
+
+@app.on_event("startup")
+async def start_scheduler():
+    workers.start()
+    await scheduler.start()
+    track_gauges({
+        IN_FLIGHT: lambda: workers.in_flight,
+        QUEUE_DEPTH: lambda: scheduler.queue_depth,
+    })
+
+
+@app.on_event("shutdown")
+async def stop_scheduler():
+    manager.stop_watcher()
+    await scheduler.stop()
+    workers.shutdown()
 
 
 # 🔥 HEALTH CHECK
@@ -65,36 +181,259 @@ def health():
     return {"status": "ok", "message": "Sign Language API is running"}
 
 
+# 🔥 BATCHING STATS
+@app.get("/stats")
+def stats():
+    return {
+        "model": manager.snapshot(),
+        "queue_depth": scheduler.queue_depth,
+        "batching": scheduler.metrics.snapshot(),
+        "workers": workers.snapshot(),
+        "cache": cache.snapshot(),
+        "process": {"pid": os.getpid(), "worker": prefork.WORKER_ID},
+    }
+
+
+# 🔥 PROMETHEUS METRICS
+@app.get("/metrics")
+def metrics():
+    body, content_type = render_metrics()
+    return Response(body, media_type=content_type)
+
+
+# 🔥 ADMIN: load the latest model in the background and swap it in
+@app.post("/admin/reload")
+async def reload_model(force: bool = False, x_admin_token: str = Header(default="")):
+    if ADMIN_TOKEN and x_admin_token != ADMIN_TOKEN:
+        return JSONResponse(status_code=403, content={"error": "Forbidden"})
+
+    # Workers share the master's model, so the master reloads and replaces them
+    if prefork.WORKER_ID is not None:
+        prefork.request_reload(force)
+        return JSONResponse(
+            status_code=202,
+            content={"reload_requested": True, "model": manager.snapshot()},
+        )
+
+    try:
+        reloaded = await run_in_threadpool(manager.reload, force)
+    except Exception as e:
+        logging.error(f"Model reload failed: {e}")
+        return JSONResponse(status_code=500, content={"error": str(e)})
+
+    return {"reloaded": reloaded, "model": manager.snapshot()}
+
+
 # 🔥 PREDICTION ENDPOINT
 @app.post("/predict")
-async def predict(file: UploadFile = File(...)):
-    global model
+async def predict(response: Response, file: UploadFile = File(...)):
+    loaded = manager.current
 
-    if model is None:
+    if loaded is None:
         return {"error": "Model not loaded"}
+    model = loaded.backend
+    timer = StageTimer()
 
-    image_bytes = await file.read()
-    np_img = np.frombuffer(image_bytes, np.uint8)
-    image = cv2.imdecode(np_img, cv2.IMREAD_COLOR)
+    async with workers.admit():
+        with timer("read"):
+            image_bytes = await file.read()
 
-    results = model(image)
-    df = results.pandas().xyxy[0]
+        cache_key = make_cache_key(
+            image_bytes, loaded.version, model.conf, model.iou, model.max_det
+        )
+        result = cache.get(cache_key)
+        cached = result is not None
+        if cached:
+            CACHE_HITS.inc()
+        else:
+            with timer("decode"):
+                image = await workers.run(decode_image, image_bytes)
+            if image is None:
+                return {"error": "Invalid image"}
 
-    # Keep ultra-low confidence
-    df = df[df["confidence"] >= 0.005]
+            with timer("inference"):
+                detections = await scheduler.submit((model, image))
+            with timer("postprocess"):
+                result = await workers.run(format_detection, detections, model.names)
+            cache.put(cache_key, result)
 
-    if df.empty:
-        return {"label": "No sign detected", "confidence": 0}
+        observe_prediction(result)
+        logging.info(
+            "Prediction served",
+            extra={
+                "label": result.get("label"),
+                "cached": cached,
+                "timings_ms": timer.as_ms(),
+            },
+        )
+        if METRICS_TIMING_HEADER:
+            response.headers["Server-Timing"] = timer.header()
+        return result
 
-    best = df.sort_values("confidence", ascending=False).iloc[0]
 
-    return {
-        "label": best["name"],
-        "confidence": float(best["confidence"]),
-        "bbox": {
-            "xmin": float(best["xmin"]),
-            "ymin": float(best["ymin"]),
-            "xmax": float(best["xmax"]),
-            "ymax": float(best["ymax"]),
-        }
-    }
+async def stream_video_predictions(model, video_path: str, stride: int):
+    """
+    Yields one NDJSON line per sampled frame as soon as its batch is done,
+    then a summary line. Only one batch of frames is in memory at a time.
+    """
+    sampler = None
+    frames_processed = 0
+    try:
+        sampler = await run_in_threadpool(FrameSampler, video_path, stride)
+
+        while True:
+            frames = await run_in_threadpool(
+                sampler.read, scheduler.max_batch_size
+            )
+            if not frames:
+                break
+
+            # Submitted together, so the scheduler flushes them as one batch
+            detections = await asyncio.gather(
+                *(scheduler.submit((model, frame)) for _, _, frame in frames)
+            )
+
+            for (index, timestamp_ms, _), det in zip(frames, detections):
+                result = await workers.run(format_detection, det, model.names)
+                observe_prediction(result)
+                result.update({"frame": index, "timestamp_ms": timestamp_ms})
+                frames_processed += 1
+                yield json.dumps(result) + "\n"
+
+        yield json.dumps({
+            "done": True,
+            "frames_processed": frames_processed,
+            "stride": stride,
+        }) + "\n"
+
+    except Exception as e:
+        logging.error(f"Video prediction failed: {e}")
+        yield json.dumps({"error": str(e)}) + "\n"
+
+    finally:
+        if sampler is not None:
+            sampler.close()
+        remove_file(video_path)
+        workers.release()
+
+
+# 🔥 VIDEO PREDICTION ENDPOINT (streams NDJSON, one line per sampled frame)
+@app.post("/predict-video")
+async def predict_video(
+    file: UploadFile = File(...),
+    stride: int = VIDEO_FRAME_STRIDE
+):
+    loaded = manager.current
+
+    if loaded is None:
+        return {"error": "Model not loaded"}
+
+    if stride < 1:
+        return JSONResponse(status_code=422, content={"error": "stride must be >= 1"})
+
+    # Released by the stream generator once the last frame has been sent
+    workers.acquire()
+    try:
+        suffix = os.path.splitext(file.filename or "")[1]
+        video_path = await run_in_threadpool(
+            spool_upload, file.file, VIDEO_UPLOAD_CHUNK_SIZE, suffix
+        )
+    except Exception:
+        workers.release()
+        raise
+
+    return StreamingResponse(
+        # The whole clip is scored by the model that was current at upload
+        stream_video_predictions(loaded.backend, video_path, stride),
+        media_type="application/x-ndjson",
+    )
+
+
+# 🔥 REAL-TIME ENDPOINT: client sends JPEG frames as binary messages and
+# gets one JSON result back per frame that was actually processed
+@app.websocket("/ws/predict")
+async def predict_stream(websocket: WebSocket):
+    await websocket.accept()
+
+    if manager.current is None:
+        await websocket.send_json({"error": "Model not loaded"})
+        await websocket.close()
+        return
+
+    try:
+        workers.acquire()
+    except ServerOverloaded as e:
+        await websocket.send_json({"error": str(e), "retry_after": e.retry_after})
+        await websocket.close(code=1013)
+        return
+
+    slot = LatestFrameSlot()
+    close_code = None
+
+    async def receive_frames():
+        nonlocal close_code
+        seq = 0
+        try:
+            while True:
+                message = await websocket.receive()
+                if message["type"] == "websocket.disconnect":
+                    break
+                data = message.get("bytes")
+                if data is None:
+                    # Text frames are not images; 1003 = unsupported data.
+                    # Closed once the frame in flight has been answered
+                    close_code = 1003
+                    break
+                slot.put((seq, time.perf_counter(), data))
+                seq += 1
+        finally:
+            slot.close()
+
+    receiver = asyncio.create_task(receive_frames())
+
+    try:
+        while True:
+            item = await slot.get()
+            if item is None:
+                break
+
+            seq, received_at, data = item
+            started_at = time.perf_counter()
+
+            model = manager.current.backend
+            timer = StageTimer()
+            with timer("decode"):
+                image = await workers.run(decode_image, data)
+            if image is None:
+                result = {"error": "Invalid image"}
+            else:
+                with timer("inference"):
+                    detections = await scheduler.submit((model, image))
+                with timer("postprocess"):
+                    result = await workers.run(format_detection, detections, model.names)
+                observe_prediction(result)
+
+            finished_at = time.perf_counter()
+            result.update({
+                "frame": seq,
+                "wait_ms": (started_at - received_at) * 1000.0,
+                "inference_ms": (finished_at - started_at) * 1000.0,
+                "latency_ms": (finished_at - received_at) * 1000.0,
+                "received": slot.received,
+                "dropped": slot.dropped,
+            })
+            await websocket.send_json(result)
+
+        if close_code is not None:
+            await websocket.close(code=close_code)
+
+    except WebSocketDisconnect:
+        pass
+
+    finally:
+        receiver.cancel()
+        workers.release()
+        logging.info(
+            f"WebSocket session closed: received={slot.received}, "
+            f"dropped={slot.dropped}"
+        )
@@ -0,0 +1,513 @@
+"""
+Pluggable inference backends for the served YOLOv5 model.
+
+Every backend exposes ``names``, ``conf``, ``iou``, ``max_det`` and
+``predict(images)``, which takes a list of HWC uint8 images and returns
+one (n, 6) xmin/ymin/xmax/ymax/confidence/class NumPy array per image,
+so the response schema does not depend on the backend.
+"""
+import ast
+import contextlib
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from typing import List, Optional
+
+try:
+    import fcntl
+except ImportError:
+    # Windows: no prefork workers, so nothing to serialize against
+    fcntl = None
+
+import cv2
+import numpy as np
+
+from app.logger import logger as logging
+from app.constant import (
+    MODEL_IMG_SIZE,
+    MODEL_CONF_THRESHOLD,
+    MODEL_IOU_THRESHOLD,
+    MODEL_MAX_DET,
+    MODEL_CLASS_NAMES,
+    ONNX_INTRA_OP_THREADS,
+    ONNX_INTER_OP_THREADS,
+    EXPORT_VALIDATION_BOX_ATOL,
+    EXPORT_VALIDATION_CONF_ATOL,
+    EXPORT_VALIDATION_IMAGES,
+)
+
+EXPORT_SUFFIXES = {"onnx": ".onnx", "torchscript": ".torchscript"}
+VALIDATION_SUFFIX = ".validation.json"
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Class offset used to run NMS for all classes in one pass (as in YOLOv5)
+MAX_WH = 7680
+
+
+def add_yolov5_to_path(yolov5_dir: str) -> None:
+    if yolov5_dir not in sys.path:
+        sys.path.append(yolov5_dir)
+
+
+class EagerBackend:
+    name = "eager"
+
+    def __init__(
+        self,
+        weights_path: str,
+        yolov5_dir: str,
+        conf: float = MODEL_CONF_THRESHOLD,
+        iou: float = MODEL_IOU_THRESHOLD,
+        max_det: int = MODEL_MAX_DET,
+    ):
+        import torch
+
+        add_yolov5_to_path(yolov5_dir)
+        self.model = torch.hub.load(
+            yolov5_dir,
+            "custom",
+            path=weights_path,
+            source="local",
+            force_reload=False
+        )
+
+        # 🔥 IMPORTANT: override YOLO default filters
+        self.conf = self.model.conf = conf
+        self.iou = self.model.iou = iou
+        self.max_det = self.model.max_det = max_det
+
+        self.model.eval()
+        self.names = self.model.names
+
+    def predict(self, images: List[np.ndarray]) -> List[np.ndarray]:
+        # AutoShape runs a list of images as a single batched forward pass
+        results = self.model(images)
+        return [det.cpu().numpy() for det in results.xyxy]
+
+
+def letterbox(image: np.ndarray, size: int, color: int = 114):
+    """
+    Resizes keeping aspect ratio and pads to size x size. Returns the
+    padded image, the scale ratio and the (left, top) padding.
+    """
+    h, w = image.shape[:2]
+    ratio = min(size / h, size / w)
+    new_h, new_w = int(round(h * ratio)), int(round(w * ratio))
+
+    if (new_h, new_w) != (h, w):
+        image = cv2.resize(image, (new_w, new_h), interpolation=cv2.INTER_LINEAR)
+
+    top, left = (size - new_h) // 2, (size - new_w) // 2
+    canvas = np.full((size, size, 3), color, dtype=np.uint8)
+    canvas[top:top + new_h, left:left + new_w] = image[..., :3]
+    return canvas, ratio, (left, top)
+
+
+def xywh2xyxy(boxes: np.ndarray) -> np.ndarray:
+    out = np.empty_like(boxes)
+    half_w, half_h = boxes[:, 2] / 2, boxes[:, 3] / 2
+    out[:, 0] = boxes[:, 0] - half_w
+    out[:, 1] = boxes[:, 1] - half_h
+    out[:, 2] = boxes[:, 0] + half_w
+    out[:, 3] = boxes[:, 1] + half_h
+    return out
+
+
+def nms(boxes: np.ndarray, scores: np.ndarray, iou_threshold: float) -> np.ndarray:
+    """
+    Greedy NMS; returns indices of kept boxes, highest score first
+    """
+    x1, y1, x2, y2 = boxes.T
+    areas = (x2 - x1) * (y2 - y1)
+    order = scores.argsort()[::-1]
+
+    keep = []
+    while order.size:
+        i = order[0]
+        keep.append(i)
+        rest = order[1:]
+
+        w = np.clip(np.minimum(x2[i], x2[rest]) - np.maximum(x1[i], x1[rest]), 0, None)
+        h = np.clip(np.minimum(y2[i], y2[rest]) - np.maximum(y1[i], y1[rest]), 0, None)
+        inter = w * h
+        iou = inter / (areas[i] + areas[rest] - inter + 1e-9)
+        order = rest[iou <= iou_threshold]
+
+    return np.asarray(keep, dtype=np.int64)
+
+
+def non_max_suppression(
+    prediction: np.ndarray,
+    conf: float,
+    iou: float,
+    max_det: int
+) -> np.ndarray:
+    """
+    prediction: raw (N, 5 + nc) YOLOv5 head output for one image
+    (cx, cy, w, h, objectness, class scores...)
+    """
+    prediction = prediction[prediction[:, 4] > conf]
+    if not len(prediction):
+        return np.zeros((0, 6), dtype=np.float32)
+
+    scores = prediction[:, 5:] * prediction[:, 4:5]
+    classes = scores.argmax(1)
+    confidences = scores[np.arange(len(scores)), classes]
+
+    mask = confidences > conf
+    boxes = xywh2xyxy(prediction[mask, :4])
+    confidences, classes = confidences[mask], classes[mask]
+
+    keep = nms(boxes + classes[:, None] * MAX_WH, confidences, iou)[:max_det]
+    return np.concatenate(
+        [boxes[keep], confidences[keep, None], classes[keep, None]], axis=1
+    ).astype(np.float32)
+
+
+class ExportedBackend:
+    """
+    Shared pre/post-processing for exported graphs, which take a
+    normalized NCHW batch and return the raw head output. Mirrors
+    AutoShape: letterbox, channels passed through as-is, NMS, rescale.
+    """
+
+    name = "exported"
+    # Batch size baked into the graph, or None when the batch is dynamic
+    fixed_batch: Optional[int] = None
+
+    def __init__(
+        self,
+        img_size: int = MODEL_IMG_SIZE,
+        conf: float = MODEL_CONF_THRESHOLD,
+        iou: float = MODEL_IOU_THRESHOLD,
+        max_det: int = MODEL_MAX_DET,
+    ):
+        self.img_size = img_size
+        self.conf = conf
+        self.iou = iou
+        self.max_det = max_det
+        self.names = MODEL_CLASS_NAMES
+
+    def forward(self, batch: np.ndarray) -> np.ndarray:
+        raise NotImplementedError
+
+    def _forward_batched(self, batch: np.ndarray) -> np.ndarray:
+        if self.fixed_batch is None:
+            return self.forward(batch)
+        step = self.fixed_batch
+        return np.concatenate(
+            [self.forward(batch[i:i + step]) for i in range(0, len(batch), step)]
+        )
+
+    def predict(self, images: List[np.ndarray]) -> List[np.ndarray]:
+        boxed = [letterbox(image, self.img_size) for image in images]
+        batch = np.stack([canvas for canvas, _, _ in boxed])
+        batch = np.ascontiguousarray(batch.transpose(0, 3, 1, 2), dtype=np.float32)
+        batch /= 255.0
+
+        outputs = self._forward_batched(batch)
+
+        detections = []
+        for image, (_, ratio, (left, top)), output in zip(images, boxed, outputs):
+            det = non_max_suppression(output, self.conf, self.iou, self.max_det)
+            det[:, [0, 2]] = ((det[:, [0, 2]] - left) / ratio).clip(0, image.shape[1])
+            det[:, [1, 3]] = ((det[:, [1, 3]] - top) / ratio).clip(0, image.shape[0])
+            detections.append(det)
+        return detections
+
+
+class OnnxBackend(ExportedBackend):
+    name = "onnx"
+
+    def __init__(
+        self,
+        model_path: str,
+        intra_op_threads: int = ONNX_INTRA_OP_THREADS,
+        inter_op_threads: int = ONNX_INTER_OP_THREADS,
+        **kwargs
+    ):
+        super().__init__(**kwargs)
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = intra_op_threads
+        options.inter_op_num_threads = inter_op_threads
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+
+        self.session = ort.InferenceSession(
+            model_path, sess_options=options, providers=["CPUExecutionProvider"]
+        )
+        model_input = self.session.get_inputs()[0]
+        self.input_name = model_input.name
+        if isinstance(model_input.shape[0], int):
+            self.fixed_batch = model_input.shape[0]
+
+        # YOLOv5 export stores stride and names as metadata
+        metadata = self.session.get_modelmeta().custom_metadata_map
+        if "names" in metadata:
+            self.names = ast.literal_eval(metadata["names"])
+
+    def forward(self, batch: np.ndarray) -> np.ndarray:
+        return self.session.run(None, {self.input_name: batch})[0]
+
+
+class TorchScriptBackend(ExportedBackend):
+    name = "torchscript"
+    # Traced graphs keep the batch size they were traced with
+    fixed_batch = 1
+
+    def __init__(self, model_path: str, **kwargs):
+        super().__init__(**kwargs)
+        import torch
+
+        extra_files = {"config.txt": ""}
+        self.module = torch.jit.load(model_path, map_location="cpu", _extra_files=extra_files)
+        self.module.eval()
+
+        if extra_files["config.txt"]:
+            config = json.loads(extra_files["config.txt"])
+            self.names = config.get("names", self.names)
+
+    def forward(self, batch: np.ndarray) -> np.ndarray:
+        import torch
+
+        with torch.inference_mode():
+            output = self.module(torch.from_numpy(batch))
+        if isinstance(output, (list, tuple)):
+            output = output[0]
+        return output.numpy()
+
+
+def export_model(
+    weights_path: str,
+    fmt: str,
+    yolov5_dir: str,
+    output_path: Optional[str] = None,
+    img_size: int = MODEL_IMG_SIZE,
+) -> str:
+    """
+    Exports best.pt with YOLOv5's export.py and returns the exported file
+    """
+    if fmt not in EXPORT_SUFFIXES:
+        raise ValueError(f"Unsupported export format: {fmt!r}")
+
+    add_yolov5_to_path(yolov5_dir)
+    import export as yolov5_export
+
+    logging.info(f"Exporting {weights_path} to {fmt}")
+    exported = yolov5_export.run(
+        weights=weights_path,
+        imgsz=(img_size, img_size),
+        include=(fmt,),
+        device="cpu",
+        dynamic=(fmt == "onnx"),
+    )
+    exported_path = [f for f in exported if f][0]
+
+    if output_path and os.path.abspath(exported_path) != os.path.abspath(output_path):
+        shutil.move(exported_path, output_path)
+        exported_path = output_path
+
+    logging.info(f"Exported model written to {exported_path}")
+    return exported_path
+
+
+def exported_path_for(weights_path: str, fmt: str) -> str:
+    return os.path.splitext(weights_path)[0] + EXPORT_SUFFIXES[fmt]
+
+
+def load_validation_images(paths: Optional[List[str]] = None) -> List[np.ndarray]:
+    paths = paths or [os.path.join(ROOT_DIR, name) for name in EXPORT_VALIDATION_IMAGES]
+    images = [cv2.imread(path) for path in paths]
+    if any(image is None for image in images):
+        raise FileNotFoundError(f"Failed to load one of the validation images {paths}")
+    return images
+
+
+def file_signature(path: str) -> list:
+    stat = os.stat(path)
+    return [os.path.realpath(path), stat.st_size, stat.st_mtime_ns]
+
+
+def validate_export(
+    weights_path: str,
+    model_path: str,
+    candidate,
+    yolov5_dir: str,
+    images: Optional[List[np.ndarray]] = None,
+    box_atol: float = EXPORT_VALIDATION_BOX_ATOL,
+    conf_atol: float = EXPORT_VALIDATION_CONF_ATOL,
+    force: bool = False,
+) -> dict:
+    """
+    Checks an exported backend against eager PyTorch on one batch of
+    validation images and records the report in <model_path>.validation.json,
+    tied to the weights and exported files it was run on. A recorded
+    report for the same files is returned without rerunning the check,
+    unless force is set.
+    """
+    validation_path = model_path + VALIDATION_SUFFIX
+    files = {"weights": file_signature(weights_path), "exported": file_signature(model_path)}
+
+    try:
+        with open(validation_path) as f:
+            report = json.load(f)
+        if not force and report.get("files") == files:
+            return report
+    except (OSError, ValueError):
+        pass
+
+    logging.info(f"Checking {model_path} against eager PyTorch")
+    eager = EagerBackend(weights_path, yolov5_dir)
+    report = compare_backends(
+        eager, candidate, images or load_validation_images(), box_atol, conf_atol
+    )
+    report["files"] = files
+
+    fd, tmp_path = tempfile.mkstemp(
+        dir=os.path.dirname(os.path.abspath(validation_path)),
+        prefix=os.path.basename(validation_path) + ".", suffix=".tmp"
+    )
+    with os.fdopen(fd, "w") as f:
+        json.dump(report, f, indent=2)
+    os.replace(tmp_path, validation_path)
+    return report
+
+
+@contextlib.contextmanager
+def export_lock(model_path: str):
+    """
+    Serializes exporting and validating model_path across processes, so
+    workers that load the model at the same time neither export it twice
+    nor read a half-written graph
+    """
+    if fcntl is None:
+        yield
+        return
+    with open(model_path + ".lock", "w") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def load_backend(kind: str, weights_path: str, yolov5_dir: str, **backend_kwargs):
+    """
+    Builds the configured backend. Exported graphs are cached next to the
+    weights file, so each best.pt is exported only once, and are only
+    served once they have matched eager PyTorch (validate_export). For
+    "onnx-int8" weights_path is the quantized .onnx file itself, judged
+    by the mAP report of scripts/quantize_model.py instead. backend_kwargs
+    go to the backend class (e.g. ONNX Runtime thread counts).
+    """
+    if kind == "eager":
+        return EagerBackend(weights_path, yolov5_dir)
+
+    # Already-quantized ONNX graph produced by scripts/quantize_model.py
+    if kind == "onnx-int8":
+        backend = OnnxBackend(weights_path, **backend_kwargs)
+        backend.name = kind
+        return backend
+
+    if kind not in EXPORT_SUFFIXES:
+        raise ValueError(f"Unknown model backend: {kind!r}")
+
+    model_path = exported_path_for(weights_path, kind)
+    with export_lock(model_path):
+        if not os.path.exists(model_path):
+            export_model(weights_path, kind, yolov5_dir, output_path=model_path)
+
+        backend_class = OnnxBackend if kind == "onnx" else TorchScriptBackend
+        backend = backend_class(model_path, **backend_kwargs)
+        report = validate_export(weights_path, model_path, backend, yolov5_dir)
+
+    if not report["passed"]:
+        raise ValueError(
+            f"{model_path} does not match eager PyTorch: {report['label_mismatches']} "
+            f"label mismatches, max box diff {report['max_box_diff']:.2f}px, "
+            f"max confidence diff {report['max_conf_diff']:.3f}"
+        )
+    return backend
+
+
+def prepare_export(kind: str, weights_path: str, yolov5_dir: str) -> None:
+    """
+    Exports and validates the graph for kind without keeping it loaded,
+    so that later load_backend calls (the prefork workers) only read
+    finished files. Runs single-threaded, leaving no thread pools behind
+    in a process that is about to fork.
+    """
+    if kind not in EXPORT_SUFFIXES:
+        return
+    kwargs = {"intra_op_threads": 1, "inter_op_threads": 1} if kind == "onnx" else {}
+    backend = load_backend(kind, weights_path, yolov5_dir, **kwargs)
+    del backend
+
+
+def compare_backends(
+    reference,
+    candidate,
+    images: List[np.ndarray],
+    box_atol: float,
+    conf_atol: float,
+) -> dict:
+    """
+    Compares the top detection of candidate against reference per image
+    """
+    max_box_diff = 0.0
+    max_conf_diff = 0.0
+    label_mismatches = 0
+
+    for ref_det, cand_det in zip(reference.predict(images), candidate.predict(images)):
+        if not len(ref_det) and not len(cand_det):
+            continue
+        if not len(ref_det) or not len(cand_det):
+            label_mismatches += 1
+            continue
+
+        ref_best = ref_det[np.argmax(ref_det[:, 4])]
+        cand_best = cand_det[np.argmax(cand_det[:, 4])]
+
+        if int(ref_best[5]) != int(cand_best[5]):
+            label_mismatches += 1
+            continue
+
+        max_box_diff = max(max_box_diff, float(np.abs(ref_best[:4] - cand_best[:4]).max()))
+        max_conf_diff = max(max_conf_diff, float(abs(ref_best[4] - cand_best[4])))
+
+    return {
+        "reference": reference.name,
+        "candidate": candidate.name,
+        "images": len(images),
+        "label_mismatches": label_mismatches,
+        "max_box_diff": max_box_diff,
+        "max_conf_diff": max_conf_diff,
+        "passed": (
+            label_mismatches == 0
+            and max_box_diff <= box_atol
+            and max_conf_diff <= conf_atol
+        ),
+    }
+
+
+def median_latency_ms(backend, images: List[np.ndarray], runs: int = 3) -> float:
+    """
+    Median single-image predict() latency over runs passes of images
+    """
+    if not images:
+        return 0.0
+
+    backend.predict(images[:1])  # warm-up
+    timings = []
+    for _ in range(runs):
+        for image in images:
+            start = time.perf_counter()
+            backend.predict([image])
+            timings.append((time.perf_counter() - start) * 1000.0)
+    return statistics.median(timings)
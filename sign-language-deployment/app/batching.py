@@ -0,0 +1,183 @@
+import asyncio
+import contextvars
+import time
+from collections import Counter
+from concurrent.futures import Executor
+from typing import Any, Callable, List, Optional, Tuple
+
+from app.logger import logger as logging, request_id_var
+
+
+# Upper bounds (ms) of the queueing delay histogram buckets
+QUEUE_DELAY_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 250, 500, 1000)
+
+
+class BatchMetrics:
+    """
+    Batch-size distribution and queueing delay of a BatchScheduler
+    """
+
+    def __init__(self):
+        self.batch_sizes = Counter()
+        self.batches = 0
+        self.requests = 0
+        self.queue_delay_sum_ms = 0.0
+        self.queue_delay_max_ms = 0.0
+        self.queue_delay_buckets = Counter()
+
+    def observe_batch(self, size: int) -> None:
+        self.batches += 1
+        self.requests += size
+        self.batch_sizes[size] += 1
+
+    def observe_queue_delay(self, delay_ms: float) -> None:
+        self.queue_delay_sum_ms += delay_ms
+        self.queue_delay_max_ms = max(self.queue_delay_max_ms, delay_ms)
+        for bound in QUEUE_DELAY_BUCKETS_MS:
+            if delay_ms <= bound:
+                self.queue_delay_buckets[bound] += 1
+                return
+        self.queue_delay_buckets["+Inf"] += 1
+
+    def snapshot(self) -> dict:
+        return {
+            "batches": self.batches,
+            "requests": self.requests,
+            "mean_batch_size": (
+                self.requests / self.batches if self.batches else 0.0
+            ),
+            "batch_size_distribution": {
+                str(size): count
+                for size, count in sorted(self.batch_sizes.items())
+            },
+            "queue_delay_ms": {
+                "mean": (
+                    self.queue_delay_sum_ms / self.requests
+                    if self.requests else 0.0
+                ),
+                "max": self.queue_delay_max_ms,
+                "buckets": {
+                    str(bound): self.queue_delay_buckets[bound]
+                    for bound in (*QUEUE_DELAY_BUCKETS_MS, "+Inf")
+                },
+            },
+        }
+
+
+class BatchScheduler:
+    """
+    Collects concurrent inference requests into a queue and runs them as
+    one batched forward pass when either max_batch_size requests are
+    waiting or the oldest one has waited max_wait_ms.
+
+    infer_fn receives a list of inputs and must return a list of results
+    in the same order; each caller of submit() gets its own result back.
+    It runs on executor (a thread pool; None for the loop's default).
+    """
+
+    def __init__(
+        self,
+        infer_fn: Callable[[List[Any]], List[Any]],
+        max_batch_size: int = 8,
+        max_wait_ms: float = 10.0,
+        executor: Optional[Executor] = None,
+    ):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be >= 1")
+
+        self.infer_fn = infer_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.executor = executor
+        self.metrics = BatchMetrics()
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def start(self) -> None:
+        if self._worker is None:
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run())
+            logging.info(
+                f"Batch scheduler started (max_batch_size={self.max_batch_size}, "
+                f"max_wait_ms={self.max_wait * 1000:.1f})"
+            )
+
+    async def stop(self) -> None:
+        if self._worker is None:
+            return
+
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        self._worker = None
+
+        while not self._queue.empty():
+            _, future, _, _ = self._queue.get_nowait()
+            if not future.done():
+                future.set_exception(RuntimeError("Batch scheduler stopped"))
+
+        logging.info("Batch scheduler stopped")
+
+    async def submit(self, item: Any) -> Any:
+        if self._worker is None:
+            raise RuntimeError("Batch scheduler is not running")
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((item, future, time.perf_counter(), request_id_var.get()))
+        return await future
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(
+                        await asyncio.wait_for(self._queue.get(), timeout)
+                    )
+                except asyncio.TimeoutError:
+                    break
+
+            await self._flush(batch)
+
+    async def _flush(self, batch: List[Tuple[Any, asyncio.Future, float, Optional[str]]]) -> None:
+        now = time.perf_counter()
+        self.metrics.observe_batch(len(batch))
+        for _, _, enqueued_at, _ in batch:
+            self.metrics.observe_queue_delay((now - enqueued_at) * 1000.0)
+
+        items = [item for item, _, _, _ in batch]
+        request_ids = [request_id for _, _, _, request_id in batch]
+
+        # Records logged by infer_fn carry the request ID when the batch
+        # holds a single request; a shared batch belongs to none of them
+        context = contextvars.copy_context()
+        context.run(request_id_var.set, request_ids[0] if len(batch) == 1 else None)
+        try:
+            results = await asyncio.get_running_loop().run_in_executor(
+                self.executor, context.run, self.infer_fn, items
+            )
+        except Exception as e:
+            logging.error(f"Batched inference failed: {e}", extra={"request_ids": request_ids})
+            for _, future, _, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future, _, _), result in zip(batch, results):
+            # The caller may have gone away (client disconnect) meanwhile
+            if not future.done():
+                future.set_result(result)
@@ -0,0 +1,85 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+
+def make_cache_key(
+    image_bytes: bytes,
+    model_version: str,
+    conf: float,
+    iou: float,
+    max_det: int
+) -> str:
+    """
+    blake2b of the raw upload plus everything that changes the result, so
+    a reloaded model or new thresholds never hit old entries
+    """
+    digest = hashlib.blake2b(image_bytes, digest_size=16).hexdigest()
+    return f"{digest}:{model_version}:{conf}:{iou}:{max_det}"
+
+
+class ResultCache:
+    """
+    Size-bounded LRU cache whose entries also expire after ttl seconds
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl: float = 300.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            value, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: str, value: Any) -> None:
+        if self.max_entries <= 0:
+            return
+
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def snapshot(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_s": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
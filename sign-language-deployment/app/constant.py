@@ -1,3 +1,110 @@
+import os
+
 MODEL_PUSHER_BUCKET_NAME = "sign-lang-2026-vivek"
 MODEL_PUSHER_S3_MODEL_KEY = "models/sign_language/latest/best.pt"
 LOCAL_MODEL_PATH = "artifacts/best.pt"
+
+# Micro-batching: a batch is flushed when it is full or when the oldest
+# request has waited INFERENCE_MAX_WAIT_MS
+INFERENCE_MAX_BATCH_SIZE = int(os.getenv("INFERENCE_MAX_BATCH_SIZE", "8"))
+INFERENCE_MAX_WAIT_MS = float(os.getenv("INFERENCE_MAX_WAIT_MS", "10"))
+
+# Multi-worker serving (main.py): with SERVER_WORKERS > 1 a master process
+# loads the model once and forks the workers, which share the weights
+# copy-on-write. Each worker gets WORKER_THREADS intra-op threads (torch,
+# ONNX Runtime, OpenCV); by default the cores are split evenly.
+SERVER_WORKERS = int(os.getenv("SERVER_WORKERS", "1"))
+WORKER_THREADS = int(os.getenv(
+    "WORKER_THREADS", str(max(1, (os.cpu_count() or 1) // max(1, SERVER_WORKERS)))
+))
+WORKER_SHUTDOWN_TIMEOUT_S = float(os.getenv("WORKER_SHUTDOWN_TIMEOUT_S", "30"))
+
+# Worker pool for CPU-bound request stages (decode, post-processing).
+# WORKER_POOL_KIND is "thread" or "process". Each server worker has its own
+# pool, so by default the cores are split across them like WORKER_THREADS.
+WORKER_POOL_KIND = os.getenv("WORKER_POOL_KIND", "thread")
+WORKER_POOL_SIZE = int(os.getenv(
+    "WORKER_POOL_SIZE", str(max(1, (os.cpu_count() or 1) // max(1, SERVER_WORKERS)))
+))
+
+# Admission control: requests beyond this many in flight get a 503
+ADMISSION_MAX_PENDING = int(os.getenv("ADMISSION_MAX_PENDING", "64"))
+ADMISSION_RETRY_AFTER_S = int(os.getenv("ADMISSION_RETRY_AFTER_S", "1"))
+
+# /predict-video: every VIDEO_FRAME_STRIDE-th frame is run through the model
+VIDEO_FRAME_STRIDE = int(os.getenv("VIDEO_FRAME_STRIDE", "5"))
+VIDEO_UPLOAD_CHUNK_SIZE = int(os.getenv("VIDEO_UPLOAD_CHUNK_SIZE", str(1024 * 1024)))
+
+# /predict result cache, keyed on the upload bytes, model version and thresholds
+RESULT_CACHE_MAX_ENTRIES = int(os.getenv("RESULT_CACHE_MAX_ENTRIES", "1024"))
+RESULT_CACHE_TTL_S = float(os.getenv("RESULT_CACHE_TTL_S", "300"))
+
+# Inference backend: "eager" (PyTorch via torch.hub), "onnx" (ONNX Runtime),
+# "torchscript" or "onnx-int8". Exported backends are built from the same
+# best.pt; the INT8 variant is downloaded ready-made from S3.
+MODEL_BACKEND = os.getenv("MODEL_BACKEND", "eager")
+MODEL_IMG_SIZE = int(os.getenv("MODEL_IMG_SIZE", "640"))
+MODEL_CONF_THRESHOLD = 0.005    # keep ultra-low confidence boxes
+MODEL_IOU_THRESHOLD = 0.45
+MODEL_MAX_DET = 10
+MODEL_CLASS_NAMES = ["Hello", "IloveYou", "No", "Please", "Thanks", "Yes"]
+
+# ONNX Runtime threading; 0 lets ONNX Runtime decide (with several server
+# workers the intra-op default is WORKER_THREADS)
+ONNX_INTRA_OP_THREADS = int(os.getenv(
+    "ONNX_INTRA_OP_THREADS", str(WORKER_THREADS) if SERVER_WORKERS > 1 else "0"
+))
+ONNX_INTER_OP_THREADS = int(os.getenv("ONNX_INTER_OP_THREADS", "0"))
+
+# Exported backends must match eager outputs within these tolerances on
+# EXPORT_VALIDATION_IMAGES (relative to sign-language-deployment/) before
+# they are served; the result is recorded next to the exported graph
+EXPORT_VALIDATION_BOX_ATOL = 2.0    # pixels
+EXPORT_VALIDATION_CONF_ATOL = 0.02
+EXPORT_VALIDATION_IMAGES = ["test.jpg", "test1.jpg", "test2.jpg"]
+
+# INT8 variant produced by scripts/quantize_model.py; served with MODEL_BACKEND=onnx-int8
+MODEL_PUSHER_S3_QUANTIZED_MODEL_KEY = "models/sign_language/latest/best-int8.onnx"
+LOCAL_QUANTIZED_MODEL_PATH = "artifacts/best-int8.onnx"
+QUANTIZATION_MAX_CALIBRATION_IMAGES = 100
+# Share of the val split held out for static calibration; mAP is measured
+# on the remaining images only
+QUANTIZATION_CALIBRATION_FRACTION = 0.3
+
+# Local model cache: weights are keyed on the S3 ETag, so restarts and new
+# replicas skip the download while the object is unchanged
+MODEL_CACHE_DIR = os.getenv("MODEL_CACHE_DIR", "model_cache")
+MODEL_CACHE_KEEP_VERSIONS = int(os.getenv("MODEL_CACHE_KEEP_VERSIONS", "2"))
+
+# Hot swap: poll the model key every MODEL_RELOAD_INTERVAL_S seconds (0 disables
+# the watcher; POST /admin/reload still works). ADMIN_TOKEN, when set, must be
+# sent as X-Admin-Token to the admin endpoints.
+MODEL_RELOAD_INTERVAL_S = float(os.getenv("MODEL_RELOAD_INTERVAL_S", "60"))
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+
+# S3 transfers: multipart uploads and parallel ranged downloads
+S3_MULTIPART_THRESHOLD = int(os.getenv("S3_MULTIPART_THRESHOLD", str(16 * 1024 * 1024)))
+S3_MULTIPART_CHUNKSIZE = int(os.getenv("S3_MULTIPART_CHUNKSIZE", str(16 * 1024 * 1024)))
+S3_MAX_CONCURRENCY = int(os.getenv("S3_MAX_CONCURRENCY", "8"))
+S3_STREAM_CHUNK_SIZE = 1024 * 1024
+
+# Shared boto3 client: one per process, sized to the transfer concurrency.
+# S3_ENDPOINT_URL points it at an S3-compatible store (moto, MinIO).
+S3_ENDPOINT_URL = os.getenv("S3_ENDPOINT_URL") or None
+S3_MAX_POOL_CONNECTIONS = int(os.getenv("S3_MAX_POOL_CONNECTIONS", str(max(10, 2 * S3_MAX_CONCURRENCY))))
+S3_MAX_ATTEMPTS = int(os.getenv("S3_MAX_ATTEMPTS", "5"))
+S3_CONNECT_TIMEOUT_S = float(os.getenv("S3_CONNECT_TIMEOUT_S", "5"))
+S3_READ_TIMEOUT_S = float(os.getenv("S3_READ_TIMEOUT_S", "60"))
+
+# Observability: GET /metrics is always on; with METRICS_TIMING_HEADER=1 each
+# /predict response also carries a Server-Timing header with its stage times
+METRICS_TIMING_HEADER = os.getenv("METRICS_TIMING_HEADER", "0") == "1"
+
+# Logging: JSON lines written by a background listener into LOG_DIR/app.log,
+# rotated at LOG_MAX_BYTES. Per-request INFO logs beyond LOG_REQUEST_RATE a
+# second are sampled at LOG_SAMPLE_RATE.
+LOG_DIR = os.getenv("LOG_DIR", "log")
+LOG_MAX_BYTES = int(os.getenv("LOG_MAX_BYTES", str(10 * 1024 * 1024)))
+LOG_BACKUP_COUNT = int(os.getenv("LOG_BACKUP_COUNT", "5"))
+LOG_REQUEST_RATE = float(os.getenv("LOG_REQUEST_RATE", "50"))
+LOG_SAMPLE_RATE = float(os.getenv("LOG_SAMPLE_RATE", "0.01"))
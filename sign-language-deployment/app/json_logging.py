@@ -0,0 +1,69 @@
+"""
+JSON-lines log records written off the calling thread, used by the
+training pipeline (signLanguage.logger) and the API (app.logger). Each
+adds its own context filter: the pipeline stage or the request ID.
+
+The API deploys on its own with an identical copy of this module
+(sign-language-deployment/app/json_logging.py), kept in step by
+tests/test_vendored_modules.py.
+"""
+import atexit
+import json
+import logging
+import os
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+# Attributes every LogRecord has; anything else came in through extra=
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": self.formatTime(record, "%Y-%m-%dT%H:%M:%S") + f".{int(record.msecs):03d}",
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and value is not None:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+def configure_queue_logging(
+    log_file: str,
+    context_filter: logging.Filter,
+    max_bytes: int,
+    backup_count: int,
+) -> QueueListener:
+    """
+    Replaces the root handlers with one that only enqueues records (after
+    context_filter stamps them, in the logging thread) and starts a
+    QueueListener thread writing them as JSON lines to a size-rotated
+    log_file
+    """
+    os.makedirs(os.path.dirname(log_file) or ".", exist_ok=True)
+
+    file_handler = RotatingFileHandler(
+        log_file, maxBytes=max_bytes, backupCount=backup_count
+    )
+    file_handler.setFormatter(JsonFormatter())
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.addFilter(context_filter)
+
+    root = logging.getLogger()
+    root.setLevel(logging.INFO)
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+
+    listener = QueueListener(log_queue, file_handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
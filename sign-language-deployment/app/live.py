@@ -0,0 +1,43 @@
+import asyncio
+from typing import Any, Optional
+
+
+class LatestFrameSlot:
+    """
+    Single-slot mailbox between a WebSocket receiver and the inference
+    loop. put() overwrites a frame that has not been picked up yet, so
+    inference always runs on the newest frame and stale frames are dropped
+    instead of queueing up.
+    """
+
+    def __init__(self):
+        self._item: Optional[Any] = None
+        self._event = asyncio.Event()
+        self.closed = False
+        self.received = 0
+        self.dropped = 0
+
+    def put(self, item: Any) -> None:
+        self.received += 1
+        if self._item is not None:
+            self.dropped += 1
+        self._item = item
+        self._event.set()
+
+    def close(self) -> None:
+        self.closed = True
+        self._event.set()
+
+    async def get(self) -> Optional[Any]:
+        """
+        Waits for the newest frame; returns None once the slot is closed
+        and drained
+        """
+        while self._item is None:
+            if self.closed:
+                return None
+            await self._event.wait()
+            self._event.clear()
+
+        item, self._item = self._item, None
+        return item
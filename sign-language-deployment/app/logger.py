@@ -1,15 +1,121 @@
+"""
+Logging for the API: handlers only enqueue records and a QueueListener
+thread formats them as JSON lines into a size-rotated log/app.log, so no
+file I/O happens on the request path.
+
+Records carry the request ID of the request that logged them. Above
+LOG_REQUEST_RATE per-request records per second, further INFO records
+of requests are sampled at LOG_SAMPLE_RATE; warnings and errors always
+get through.
+"""
+import contextvars
 import logging
 import os
+import random
+import threading
+import time
+import uuid
+from logging.handlers import QueueListener
 
-LOG_DIR = "log"
-os.makedirs(LOG_DIR, exist_ok=True)
+from app.constant import (
+    LOG_DIR,
+    LOG_MAX_BYTES,
+    LOG_BACKUP_COUNT,
+    LOG_REQUEST_RATE,
+    LOG_SAMPLE_RATE,
+)
+from app.json_logging import configure_queue_logging
 
 LOG_FILE = os.path.join(LOG_DIR, "app.log")
 
-logging.basicConfig(
-    filename=LOG_FILE,
-    level=logging.INFO,
-    format="[%(asctime)s] %(levelname)s - %(message)s",
-)
+
+def worker_log_file(worker_id: int) -> str:
+    return os.path.join(LOG_DIR, f"app.worker{worker_id}.log")
+
+
+REQUEST_ID_HEADER = "x-request-id"
+
+request_id_var: contextvars.ContextVar = contextvars.ContextVar("request_id", default=None)
+
+
+class RequestContextFilter(logging.Filter):
+    """
+    Stamps records with the current request ID and, under load, samples
+    INFO-and-below records logged inside requests
+    """
+
+    def __init__(self, rate: float = LOG_REQUEST_RATE, sample_rate: float = LOG_SAMPLE_RATE):
+        super().__init__()
+        self.rate = rate
+        self.sample_rate = sample_rate
+        self.sampled_out = 0
+        self._tokens = rate
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _admit(self) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.rate, self._tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+        if random.random() < self.sample_rate:
+            return True
+        self.sampled_out += 1
+        return False
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        if record.request_id is None or record.levelno > logging.INFO or self.rate <= 0:
+            return True
+        return self._admit()
+
+
+class RequestIdMiddleware:
+    """
+    ASGI middleware: takes the request ID from X-Request-ID or makes one,
+    exposes it to log records and echoes it in the response
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers") or [])
+        request_id = headers.get(REQUEST_ID_HEADER.encode(), b"").decode() or uuid.uuid4().hex
+        token = request_id_var.set(request_id)
+
+        async def send_with_id(message):
+            if message["type"] == "http.response.start":
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [
+                    (REQUEST_ID_HEADER.encode(), request_id.encode())
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            request_id_var.reset(token)
+
+
+def configure_logging(log_file: str = LOG_FILE) -> QueueListener:
+    """
+    Routes root logging through a fresh queue and listener thread. Forked
+    server workers call it again with their own file: the listener thread
+    does not survive a fork and rotation is not safe across processes.
+    """
+    return configure_queue_logging(
+        log_file, RequestContextFilter(), LOG_MAX_BYTES, LOG_BACKUP_COUNT
+    )
+
+
+listener = configure_logging()
 
 logger = logging.getLogger("sign-language")
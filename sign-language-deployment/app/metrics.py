@@ -0,0 +1,215 @@
+"""
+Prometheus metrics for the API and a per-request stage timer.
+
+Stage histograms are observed as the request sees them (decode and
+post-processing include the wait for a worker, inference includes the
+batching delay); model_forward_seconds is the batched forward pass
+itself.
+
+With several server workers (PROMETHEUS_MULTIPROC_DIR set before this
+module is imported) every process writes its samples to that directory
+and /metrics aggregates them, so a scrape sees all workers.
+"""
+import os
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+MULTIPROCESS = "PROMETHEUS_MULTIPROC_DIR" in os.environ
+
+# Function-backed gauges are not exported in multiprocess mode, so there
+# they are sampled into the shared files this often instead
+GAUGE_REFRESH_S = 1.0
+
+
+# Seconds; fine-grained at the low end where decode/post-processing live
+LATENCY_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.075,
+    0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 10.0,
+)
+
+REQUEST_LATENCY = Histogram(
+    "sign_request_latency_seconds",
+    "HTTP request latency",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+
+STAGE_LATENCY = Histogram(
+    "sign_stage_latency_seconds",
+    "Per-request time spent in each stage of a prediction",
+    ["stage"],
+    buckets=LATENCY_BUCKETS,
+)
+
+MODEL_FORWARD = Histogram(
+    "sign_model_forward_seconds",
+    "Duration of one batched model forward pass",
+    ["backend"],
+    buckets=LATENCY_BUCKETS,
+)
+
+BATCH_SIZE = Histogram(
+    "sign_model_batch_size",
+    "Images per model forward pass",
+    buckets=(1, 2, 4, 8, 16, 32, 64),
+)
+
+PREDICTIONS = Counter(
+    "sign_predictions_total",
+    "Predictions by label, including 'No sign detected'",
+    ["label"],
+)
+
+CACHE_HITS = Counter(
+    "sign_result_cache_hits_total",
+    "/predict requests answered from the result cache",
+)
+
+MODEL_LOAD = Gauge(
+    "sign_model_load_seconds",
+    "Phases of the last model load (fetch, load, warmup, cold_start)",
+    ["phase"],
+    multiprocess_mode="mostrecent",
+)
+
+MODEL_SWAPS = Counter(
+    "sign_model_swaps_total",
+    "Models swapped in since start",
+)
+
+IN_FLIGHT = Gauge(
+    "sign_requests_in_flight",
+    "Requests holding an admission slot",
+    multiprocess_mode="livesum",
+)
+
+QUEUE_DEPTH = Gauge(
+    "sign_inference_queue_depth",
+    "Images waiting for the batch scheduler",
+    multiprocess_mode="livesum",
+)
+
+
+def observe_prediction(result: dict) -> None:
+    label = result.get("label")
+    if label is not None:
+        PREDICTIONS.labels(label=label).inc()
+
+
+def observe_model_load(info: dict) -> None:
+    for phase in ("fetch", "load", "warmup", "cold_start"):
+        seconds = info.get(f"{phase}_seconds")
+        if seconds is not None:
+            MODEL_LOAD.labels(phase=phase).set(seconds)
+    MODEL_SWAPS.inc()
+
+
+def track_gauges(sources: Dict[Gauge, Callable[[], float]]) -> None:
+    """
+    Backs each gauge with a function read at scrape time or, in
+    multiprocess mode, by a thread sampling it every GAUGE_REFRESH_S
+    """
+    if not MULTIPROCESS:
+        for gauge, fn in sources.items():
+            gauge.set_function(fn)
+        return
+
+    def refresh():
+        while True:
+            for gauge, fn in sources.items():
+                gauge.set(fn())
+            time.sleep(GAUGE_REFRESH_S)
+
+    threading.Thread(target=refresh, name="gauge-refresh", daemon=True).start()
+
+
+def render_metrics():
+    """
+    Returns (body, content type) for GET /metrics
+    """
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
+
+
+class StageTimer:
+    """
+    Times the stages of one request into STAGE_LATENCY and renders them
+    as a Server-Timing header value
+    """
+
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.stages: Dict[str, float] = {}
+        self._stage: Optional[str] = None
+        self._stage_started_at = 0.0
+
+    def __call__(self, stage: str) -> "StageTimer":
+        self._stage = stage
+        return self
+
+    def __enter__(self) -> "StageTimer":
+        self._stage_started_at = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        elapsed = time.perf_counter() - self._stage_started_at
+        self.stages[self._stage] = self.stages.get(self._stage, 0.0) + elapsed
+        STAGE_LATENCY.labels(stage=self._stage).observe(elapsed)
+
+    def as_ms(self) -> Dict[str, float]:
+        return {stage: round(seconds * 1000.0, 3) for stage, seconds in self.stages.items()}
+
+    def header(self) -> str:
+        total = time.perf_counter() - self.started_at
+        parts = [f"{stage};dur={seconds * 1000.0:.2f}" for stage, seconds in self.stages.items()]
+        parts.append(f"total;dur={total * 1000.0:.2f}")
+        return ", ".join(parts)
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware observing REQUEST_LATENCY per route template (not raw
+    path, to keep label cardinality bounded). Streaming responses are
+    timed until their last chunk is sent.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started_at = time.perf_counter()
+        status = [500]
+
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # The router fills in the matched route on this same scope
+            route = scope.get("route")
+            REQUEST_LATENCY.labels(
+                method=scope["method"],
+                route=getattr(route, "path", "unmatched"),
+                status=str(status[0]),
+            ).observe(time.perf_counter() - started_at)
@@ -0,0 +1,130 @@
+import os
+import re
+import time
+from typing import Optional, Tuple
+
+from app.logger import logger as logging
+from app.s3_operations import S3Operation
+
+# Resumable downloads leave <name>.part and <name>.part.json behind
+PARTIAL_MARKER = ".part"
+# Partial downloads older than this are from a crashed process
+STALE_PARTIAL_AGE_S = 3600
+
+
+class ModelCache:
+    """
+    Local directory of model files keyed on the S3 ETag (or version id).
+    A HEAD request decides whether the object changed; if not, the cached
+    file is used as-is. Downloads stream to a partial file that is renamed
+    into place atomically, so a crash never leaves a truncated model, and
+    an interrupted download resumes on the next start.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str,
+        keep_versions: int = 2,
+        s3: Optional[S3Operation] = None,
+    ):
+        self.cache_dir = cache_dir
+        self.keep_versions = keep_versions
+        self.s3 = s3 or S3Operation()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def version_of(head: dict) -> str:
+        version = head.get("VersionId") or head["ETag"]
+        # ETags are quoted and may contain '-' for multipart uploads
+        return re.sub(r"[^A-Za-z0-9]", "", version)
+
+    def path_for(self, object_name: str, version: str) -> str:
+        stem, suffix = os.path.splitext(os.path.basename(object_name))
+        return os.path.join(self.cache_dir, f"{stem}-{version}{suffix}")
+
+    def fetch(self, bucket_name: str, object_name: str) -> Tuple[str, str, bool]:
+        """
+        Returns (local_path, version, downloaded)
+        """
+        try:
+            head = self.s3.head_object(bucket_name, object_name)
+        except Exception as e:
+            cached = self._newest_cached(object_name)
+            if cached is None:
+                raise
+            logging.warning(
+                f"HEAD s3://{bucket_name}/{object_name} failed ({e}); "
+                f"falling back to cached {cached}"
+            )
+            return cached, self._version_from_path(object_name, cached), False
+
+        version = self.version_of(head)
+        local_path = self.path_for(object_name, version)
+
+        if (
+            os.path.exists(local_path)
+            and os.path.getsize(local_path) == head.get("ContentLength")
+        ):
+            logging.info(f"Model cache hit: {local_path}")
+            os.utime(local_path)
+            self.collect_garbage(object_name, keep=local_path)
+            return local_path, version, False
+
+        self.s3.download_file(bucket_name, object_name, local_path)
+
+        logging.info(f"Model cache miss: downloaded {local_path}")
+        self.collect_garbage(object_name, keep=local_path)
+        return local_path, version, True
+
+    def _versions(self, object_name: str):
+        """
+        Cached versions of object_name, newest first, as
+        (version prefix, mtime) pairs. Exported siblings such as
+        best-<etag>.onnx share the prefix of their weights.
+        """
+        stem = os.path.splitext(os.path.basename(object_name))[0] + "-"
+        versions = {}
+        for name in os.listdir(self.cache_dir):
+            if not name.startswith(stem) or PARTIAL_MARKER in name:
+                continue
+            prefix = os.path.splitext(name)[0]
+            mtime = os.path.getmtime(os.path.join(self.cache_dir, name))
+            versions[prefix] = max(versions.get(prefix, 0.0), mtime)
+        return sorted(versions.items(), key=lambda item: -item[1])
+
+    def _newest_cached(self, object_name: str) -> Optional[str]:
+        suffix = os.path.splitext(object_name)[1]
+        for prefix, _ in self._versions(object_name):
+            path = os.path.join(self.cache_dir, prefix + suffix)
+            if os.path.exists(path):
+                return path
+        return None
+
+    @staticmethod
+    def _version_from_path(object_name: str, path: str) -> str:
+        stem = os.path.splitext(os.path.basename(object_name))[0] + "-"
+        return os.path.splitext(os.path.basename(path))[0][len(stem):]
+
+    def collect_garbage(self, object_name: str, keep: str) -> None:
+        """
+        Removes stale partial downloads and all but the newest
+        keep_versions cached versions (never the one in use)
+        """
+        now = time.time()
+        for name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, name)
+            if PARTIAL_MARKER in name and now - os.path.getmtime(path) > STALE_PARTIAL_AGE_S:
+                os.remove(path)
+
+        keep_prefix = os.path.splitext(os.path.basename(keep))[0]
+        kept = 1
+        for prefix, _ in self._versions(object_name):
+            if prefix == keep_prefix:
+                continue
+            if kept < self.keep_versions:
+                kept += 1
+                continue
+            for name in os.listdir(self.cache_dir):
+                if os.path.splitext(name)[0] == prefix:
+                    os.remove(os.path.join(self.cache_dir, name))
+                    logging.info(f"Removed old cached model file {name}")
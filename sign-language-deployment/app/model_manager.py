@@ -0,0 +1,147 @@
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+import numpy as np
+
+from app.backends import load_backend
+from app.logger import logger as logging
+from app.model_cache import ModelCache
+
+
+@dataclass(frozen=True)
+class LoadedModel:
+    backend: Any
+    etag: str
+    version: str
+    info: dict = field(default_factory=dict)
+
+
+class ModelManager:
+    """
+    Owns the served model. A new version is fetched, loaded and warmed up
+    next to the current one and then swapped in with a single reference
+    assignment, so requests never see a missing model and requests that
+    already hold the old LoadedModel finish on it.
+    """
+
+    def __init__(
+        self,
+        bucket_name: str,
+        object_name: str,
+        backend_kind: str,
+        yolov5_dir: str,
+        model_cache: ModelCache,
+        warmup_size: int = 640,
+        on_swap: Optional[Callable[[LoadedModel], None]] = None,
+    ):
+        self.bucket_name = bucket_name
+        self.object_name = object_name
+        self.backend_kind = backend_kind
+        self.yolov5_dir = yolov5_dir
+        self.model_cache = model_cache
+        self.warmup_size = warmup_size
+        self.on_swap = on_swap
+
+        self.current: Optional[LoadedModel] = None
+        self.swaps = 0
+        self._reload_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._watcher: Optional[threading.Thread] = None
+
+    def remote_etag(self) -> str:
+        head = self.model_cache.s3.head_object(self.bucket_name, self.object_name)
+        return ModelCache.version_of(head)
+
+    def warmup(self, backend) -> None:
+        # First inference pays for lazy allocations; keep it off live traffic
+        backend.predict([np.zeros((self.warmup_size, self.warmup_size, 3), np.uint8)])
+
+    def load(self, warmup: bool = True) -> LoadedModel:
+        """
+        With warmup=False the first forward pass is left to whoever serves
+        the model, e.g. each forked worker
+        """
+        started_at = time.perf_counter()
+
+        model_path, etag, downloaded = self.model_cache.fetch(
+            self.bucket_name, self.object_name
+        )
+        fetched_at = time.perf_counter()
+
+        backend = load_backend(self.backend_kind, model_path, self.yolov5_dir)
+        loaded_at = time.perf_counter()
+
+        if warmup:
+            self.warmup(backend)
+        warmed_at = time.perf_counter()
+
+        return LoadedModel(
+            backend=backend,
+            etag=etag,
+            version=f"{backend.name}-{etag}",
+            info={
+                "version": f"{backend.name}-{etag}",
+                "backend": backend.name,
+                "path": model_path,
+                "source": "s3" if downloaded else "local-cache",
+                "fetch_seconds": fetched_at - started_at,
+                "load_seconds": loaded_at - fetched_at,
+                "warmup_seconds": warmed_at - loaded_at,
+                "cold_start_seconds": warmed_at - started_at,
+                "loaded_at": time.time(),
+            },
+        )
+
+    def reload(self, force: bool = False, warmup: bool = True) -> bool:
+        """
+        Loads and swaps in the remote model if its ETag changed (or always
+        with force). Returns True when a new model was swapped in. On
+        failure the current model keeps serving.
+        """
+        with self._reload_lock:
+            if not force and self.current is not None:
+                if self.remote_etag() == self.current.etag:
+                    return False
+
+            loaded = self.load(warmup=warmup)
+            previous, self.current = self.current, loaded
+            self.swaps += 1
+
+        logging.info(
+            f"Model swapped in: {loaded.version} "
+            f"(previous: {previous.version if previous else None})"
+        )
+        if self.on_swap is not None:
+            self.on_swap(loaded)
+        return True
+
+    def _watch(self, interval: float) -> None:
+        while not self._stop.wait(interval):
+            try:
+                self.reload()
+            except Exception as e:
+                logging.error(f"Background model reload failed: {e}")
+
+    def start_watcher(self, interval: float) -> None:
+        if interval <= 0 or self._watcher is not None:
+            return
+        self._stop.clear()
+        self._watcher = threading.Thread(
+            target=self._watch, args=(interval,), name="model-watcher", daemon=True
+        )
+        self._watcher.start()
+        logging.info(f"Model watcher polling every {interval}s")
+
+    def stop_watcher(self) -> None:
+        self._stop.set()
+        if self._watcher is not None:
+            self._watcher.join(timeout=5)
+            self._watcher = None
+
+    def snapshot(self) -> dict:
+        info = dict(self.current.info) if self.current else {}
+        info["swaps"] = self.swaps
+        info["watching"] = self._watcher is not None
+        return info
@@ -1,12 +1,18 @@
 import sys
+from typing import Optional
 from app.exception import SignException
 from app.logger import logger as logging
 from app.s3_operations import S3Operation
-from app.constant import MODEL_PUSHER_BUCKET_NAME, MODEL_PUSHER_S3_MODEL_KEY
+from app.constant import (
+    MODEL_PUSHER_BUCKET_NAME,
+    MODEL_PUSHER_S3_MODEL_KEY,
+    MODEL_PUSHER_S3_QUANTIZED_MODEL_KEY,
+)
 
 class ModelPusher:
-    def __init__(self, local_model_path: str):
+    def __init__(self, local_model_path: str, quantized_model_path: Optional[str] = None):
         self.local_model_path = local_model_path
+        self.quantized_model_path = quantized_model_path
         self.s3_ops = S3Operation()
 
     def push(self):
@@ -17,6 +23,15 @@ class ModelPusher:
                 bucket_name=MODEL_PUSHER_BUCKET_NAME,
                 s3_key=MODEL_PUSHER_S3_MODEL_KEY
             )
+
+            # INT8 variant goes next to best.pt under its own key
+            if self.quantized_model_path:
+                self.s3_ops.upload_file(
+                    file_path=self.quantized_model_path,
+                    bucket_name=MODEL_PUSHER_BUCKET_NAME,
+                    s3_key=MODEL_PUSHER_S3_QUANTIZED_MODEL_KEY
+                )
+
             logging.info("Model pushed to S3 successfully")
         except Exception as e:
             raise SignException(e, sys) from e
@@ -0,0 +1,87 @@
+"""
+Vectorized post-processing of raw YOLOv5 detections.
+
+A detection array has shape (n, 6) with columns
+xmin, ymin, xmax, ymax, confidence, class -- the layout of
+``results.xyxy[i]`` -- so no pandas DataFrame is needed per image.
+"""
+from typing import List, Optional, Sequence, Union
+
+import numpy as np
+
+NO_SIGN_LABEL = "No sign detected"
+
+Names = Union[Sequence[str], dict]
+
+
+def to_numpy(detections) -> np.ndarray:
+    """
+    Accepts a torch tensor or anything array-like and returns an (n, 6)
+    float32 NumPy array
+    """
+    if hasattr(detections, "detach"):
+        detections = detections.detach().cpu().numpy()
+    return np.asarray(detections, dtype=np.float32).reshape(-1, 6)
+
+
+def filter_confidence(detections: np.ndarray, min_confidence: float) -> np.ndarray:
+    return detections[detections[:, 4] >= min_confidence]
+
+
+def top_k(detections: np.ndarray, k: int) -> np.ndarray:
+    """
+    Returns the k most confident detections, highest first
+    """
+    if len(detections) <= k:
+        order = np.argsort(-detections[:, 4], kind="stable")
+    else:
+        part = np.argpartition(-detections[:, 4], k - 1)[:k]
+        order = part[np.argsort(-detections[part, 4], kind="stable")]
+    return detections[order]
+
+
+def to_dict(detection: np.ndarray, names: Names) -> dict:
+    return {
+        "label": names[int(detection[5])],
+        "confidence": float(detection[4]),
+        "bbox": {
+            "xmin": float(detection[0]),
+            "ymin": float(detection[1]),
+            "xmax": float(detection[2]),
+            "ymax": float(detection[3]),
+        }
+    }
+
+
+def best_detection(
+    detections,
+    min_confidence: float = 0.005
+) -> Optional[np.ndarray]:
+    detections = filter_confidence(to_numpy(detections), min_confidence)
+    if len(detections) == 0:
+        return None
+    return detections[int(np.argmax(detections[:, 4]))]
+
+
+def top_detections(
+    detections,
+    names: Names,
+    k: int,
+    min_confidence: float = 0.005
+) -> List[dict]:
+    detections = filter_confidence(to_numpy(detections), min_confidence)
+    return [to_dict(det, names) for det in top_k(detections, k)]
+
+
+def format_detection(
+    detections,
+    names: Names,
+    min_confidence: float = 0.005
+) -> dict:
+    """
+    Builds the /predict response from the single most confident detection
+    """
+    best = best_detection(detections, min_confidence)
+    if best is None:
+        return {"label": NO_SIGN_LABEL, "confidence": 0}
+    return to_dict(best, names)
@@ -0,0 +1,309 @@
+"""
+Pre-fork multi-worker serving.
+
+The master process imports the app, loads the model once and then forks
+the uvicorn workers onto one shared listening socket. Workers inherit
+the weights copy-on-write: inference only reads them, so their pages stay
+shared and memory grows by per-worker activations and buffers, not by a
+model copy per worker. Each worker runs WORKER_THREADS intra-op threads.
+
+The master keeps no model threads of its own (torch runs single-threaded
+there; thread pools do not survive fork), restarts workers that die and
+owns hot reloads: it polls the model key, or takes SIGHUP (SIGUSR1 to
+force) from POST /admin/reload in a worker, loads the new version and
+replaces the workers with ones forked from it.
+
+ONNX Runtime sessions cannot be carried across fork, so for the ONNX
+backends the master fills the local model cache and exports and
+validates the graph once (prepare_export), and every worker only builds
+its own session from the finished files.
+"""
+import gc
+import glob
+import importlib
+import os
+import signal
+import socket
+import tempfile
+import time
+from typing import Dict, Optional
+
+from app.logger import logger as logging
+
+# Backends whose loaded weights are plain tensors that can be inherited
+SHAREABLE_BACKENDS = ("eager", "torchscript")
+
+# Set in forked workers; None in the master and in single-process serving
+WORKER_ID: Optional[int] = None
+
+
+def request_reload(force: bool = False) -> None:
+    """
+    Asks the master to reload the model; called from a worker
+    """
+    os.kill(os.getppid(), signal.SIGUSR1 if force else signal.SIGHUP)
+
+
+def set_thread_counts(threads: int) -> None:
+    import cv2
+    cv2.setNumThreads(threads)
+    try:
+        import torch
+    except ImportError:
+        return
+    torch.set_num_threads(threads)
+
+
+class PreforkServer:
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        workers: int,
+        threads: int,
+        reload_interval: float = 0,
+        shutdown_timeout: float = 30,
+    ):
+        self.host = host
+        self.port = port
+        self.num_workers = workers
+        self.threads = threads
+        self.reload_interval = reload_interval
+        self.shutdown_timeout = shutdown_timeout
+
+        self.workers: Dict[int, int] = {}   # pid -> worker id
+        self.served = None
+        self.sock: Optional[socket.socket] = None
+        self.metrics_dir: Optional[str] = None
+        self._created_metrics_dir = False
+        self._stopping = False
+        self._reload_requested: Optional[bool] = None   # force flag
+        self._cached_version: Optional[str] = None
+        self._retiring = set()
+
+    # ---- master ----
+
+    def setup_metrics_dir(self) -> None:
+        # Must happen before prometheus_client is imported (by the app)
+        self.metrics_dir = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+        if not self.metrics_dir:
+            self.metrics_dir = tempfile.mkdtemp(prefix="sign-metrics-")
+            self._created_metrics_dir = True
+            os.environ["PROMETHEUS_MULTIPROC_DIR"] = self.metrics_dir
+        for path in glob.glob(os.path.join(self.metrics_dir, "*.db")):
+            os.remove(path)
+
+    def cleanup_metrics_dir(self) -> None:
+        if not self._created_metrics_dir:
+            return
+        for path in glob.glob(os.path.join(self.metrics_dir, "*.db")):
+            os.remove(path)
+        os.rmdir(self.metrics_dir)
+
+    def load_model(self, force: bool = True) -> bool:
+        """
+        Loads the model in the master without warming it up (warmup would
+        start thread pools, and each worker warms up its own process).
+        Frozen afterwards so the workers' garbage collector leaves the
+        inherited objects, and the pages holding them, untouched.
+        """
+        manager = self.served.manager
+        gc.unfreeze()
+        try:
+            if manager.backend_kind in SHAREABLE_BACKENDS:
+                return manager.reload(force=force, warmup=False)
+
+            from app.backends import prepare_export
+
+            model_path, version, _ = manager.model_cache.fetch(
+                manager.bucket_name, manager.object_name
+            )
+            changed = force or version != self._cached_version
+            prepare_export(manager.backend_kind, model_path, manager.yolov5_dir)
+            self._cached_version = version
+            logging.info(
+                f"{manager.backend_kind} sessions are not fork-safe; "
+                f"workers load their own from the local model cache"
+            )
+            return changed
+        finally:
+            gc.collect()
+            gc.freeze()
+
+    def bind(self) -> socket.socket:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((self.host, self.port))
+        sock.listen(2048)
+        sock.set_inheritable(True)
+        return sock
+
+    def spawn(self, worker_id: int) -> int:
+        pid = os.fork()
+        if pid == 0:
+            code = 1
+            try:
+                code = self.run_worker(worker_id)
+            finally:
+                os._exit(code)
+        self.workers[pid] = worker_id
+        logging.info(f"Started worker {worker_id} (pid {pid})")
+        return pid
+
+    def stop_workers(self, pids) -> None:
+        self._retiring.update(pids)
+        for pid in pids:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+        deadline = time.monotonic() + self.shutdown_timeout
+        remaining = set(pids)
+        while remaining and time.monotonic() < deadline:
+            self.reap()
+            remaining &= set(self.workers)
+            if remaining:
+                time.sleep(0.1)
+
+        for pid in remaining:
+            logging.warning(f"Worker pid {pid} did not stop in time, killing it")
+            try:
+                os.kill(pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+            os.waitpid(pid, 0)
+            self.forget(pid)
+
+    def forget(self, pid: int) -> Optional[int]:
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(pid)
+        self._retiring.discard(pid)
+        return self.workers.pop(pid, None)
+
+    def reap(self) -> list:
+        """
+        Collects exited workers; returns the ids of the ones that died
+        without being asked to stop
+        """
+        dead = []
+        while self.workers:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                break
+            if pid == 0:
+                break
+            retired = pid in self._retiring
+            worker_id = self.forget(pid)
+            if worker_id is not None and not retired:
+                dead.append(worker_id)
+                if not self._stopping:
+                    logging.warning(
+                        f"Worker {worker_id} (pid {pid}) exited with status "
+                        f"{os.waitstatus_to_exitcode(status)}"
+                    )
+        return dead
+
+    def rolling_restart(self) -> None:
+        """
+        Forks a fresh set of workers from the master's new model, then
+        stops the old ones, which finish their in-flight requests first
+        """
+        old = list(self.workers)
+        for worker_id in range(self.num_workers):
+            self.spawn(worker_id)
+        self.stop_workers(old)
+
+    def reload(self, force: bool) -> None:
+        try:
+            if self.load_model(force=force):
+                self.rolling_restart()
+        except Exception as e:
+            logging.error(f"Model reload in master failed: {e}")
+
+    def _on_stop(self, signum, frame) -> None:
+        self._stopping = True
+
+    def _on_reload(self, signum, frame) -> None:
+        self._reload_requested = bool(self._reload_requested) or signum == signal.SIGUSR1
+
+    def run(self) -> None:
+        self.setup_metrics_dir()
+        try:
+            self.serve()
+        finally:
+            self._stopping = True
+            if self.workers:
+                logging.info("Stopping workers")
+                self.stop_workers(list(self.workers))
+            if self.sock is not None:
+                self.sock.close()
+            self.cleanup_metrics_dir()
+
+    def serve(self) -> None:
+        # No intra-op thread pool may exist in the master when it forks
+        set_thread_counts(1)
+        self.served = importlib.import_module("app.app")
+
+        try:
+            logging.info("Loading model in the prefork master...")
+            self.load_model()
+        except Exception as e:
+            # Workers fall back to loading the model themselves
+            logging.error(f"Model loading in master failed: {e}")
+
+        self.sock = self.bind()
+        signal.signal(signal.SIGTERM, self._on_stop)
+        signal.signal(signal.SIGINT, self._on_stop)
+        signal.signal(signal.SIGHUP, self._on_reload)
+        signal.signal(signal.SIGUSR1, self._on_reload)
+
+        for worker_id in range(self.num_workers):
+            self.spawn(worker_id)
+        logging.info(
+            f"Serving on {self.host}:{self.port} with {self.num_workers} workers "
+            f"of {self.threads} thread(s)"
+        )
+
+        next_poll = time.monotonic() + self.reload_interval
+        while not self._stopping:
+            time.sleep(0.5)
+            for worker_id in self.reap():
+                if not self._stopping:
+                    self.spawn(worker_id)
+
+            if self._reload_requested is not None:
+                force, self._reload_requested = self._reload_requested, None
+                self.reload(force)
+            elif self.reload_interval > 0 and time.monotonic() >= next_poll:
+                next_poll = time.monotonic() + self.reload_interval
+                self.reload(force=False)
+
+    # ---- worker ----
+
+    def run_worker(self, worker_id: int) -> int:
+        global WORKER_ID
+        WORKER_ID = worker_id
+
+        for signum in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP, signal.SIGUSR1):
+            signal.signal(signum, signal.SIG_DFL)
+
+        import uvicorn
+        from app import logger as app_logger
+        from app.s3_client import get_s3_client, reset_clients
+
+        app_logger.listener = app_logger.configure_logging(
+            app_logger.worker_log_file(worker_id)
+        )
+        # Pooled connections are sockets shared with the master
+        reset_clients()
+        self.served.manager.model_cache.s3.s3_client = get_s3_client()
+        set_thread_counts(self.threads)
+
+        server = uvicorn.Server(uvicorn.Config(self.served.app, lifespan="on"))
+        try:
+            server.run(sockets=[self.sock])
+        finally:
+            app_logger.listener.stop()
+        return 0 if server.started else 3
@@ -0,0 +1,241 @@
+"""
+INT8 quantization of the exported ONNX detector with ONNX Runtime, plus
+the mAP@0.5 and latency measurements used to judge the INT8 variant
+against FP32.
+"""
+import glob
+import os
+import random
+from typing import Iterable, List, Optional, Tuple
+
+import cv2
+import numpy as np
+import onnx
+import yaml
+from onnxruntime.quantization import (
+    CalibrationDataReader,
+    QuantFormat,
+    QuantType,
+    quantize_dynamic,
+    quantize_static,
+)
+
+from app.backends import letterbox
+from app.constant import (
+    MODEL_IMG_SIZE,
+    QUANTIZATION_CALIBRATION_FRACTION,
+    QUANTIZATION_MAX_CALIBRATION_IMAGES,
+)
+from app.logger import logger as logging
+# Offline tooling run from the repository checkout, next to the dataset
+from signLanguage.utils.main_utils import resolve_split_dir
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp")
+
+
+def list_images(image_dir: str) -> List[str]:
+    return sorted(
+        path for path in glob.glob(os.path.join(image_dir, "*"))
+        if path.lower().endswith(IMAGE_EXTENSIONS)
+    )
+
+
+def validation_split(data_yaml_path: str, dataset_root: Optional[str] = None):
+    """
+    Returns (image_dir, label_dir) of the val split listed in data.yaml,
+    or of the test split when there is no val. Split paths resolve as in
+    YOLOv5, against dataset_root or else the directory of data.yaml; the
+    ``path`` key is machine specific and ignored.
+    """
+    with open(data_yaml_path) as f:
+        data = yaml.safe_load(f)
+
+    split = next((name for name in ("val", "test") if data.get(name)), None)
+    if split is None:
+        raise ValueError(f"{data_yaml_path} lists neither a val nor a test split")
+    if split != "val":
+        logging.warning(f"{data_yaml_path} has no val split; using {split}")
+
+    root = dataset_root or os.path.dirname(os.path.abspath(data_yaml_path))
+    image_dir = resolve_split_dir(root, data[split])
+    # YOLO convention: .../images -> .../labels
+    label_dir = os.path.join(os.path.dirname(image_dir), "labels")
+    return image_dir, label_dir
+
+
+def split_calibration(
+    image_paths: List[str],
+    fraction: float = QUANTIZATION_CALIBRATION_FRACTION,
+    max_calibration_images: int = QUANTIZATION_MAX_CALIBRATION_IMAGES,
+    seed: int = 0,
+) -> Tuple[List[str], List[str]]:
+    """
+    Splits validation images into disjoint (calibration, evaluation)
+    subsets, so the INT8 mAP is not measured on the images its
+    activation ranges were fitted to. The split is fixed by seed.
+    """
+    shuffled = sorted(image_paths)
+    random.Random(seed).shuffle(shuffled)
+    # At least one image on each side once there are two
+    count = min(max_calibration_images, int(len(shuffled) * fraction), len(shuffled) - 1)
+    count = max(count, min(1, len(shuffled) - 1))
+    return sorted(shuffled[:count]), sorted(shuffled[count:])
+
+
+class ImageCalibrationReader(CalibrationDataReader):
+    """
+    Feeds letterboxed validation images to the static quantization
+    calibrator one at a time
+    """
+
+    def __init__(self, input_name: str, image_paths: Iterable[str], img_size: int):
+        self.input_name = input_name
+        self.img_size = img_size
+        self._paths = iter(image_paths)
+
+    def get_next(self):
+        for path in self._paths:
+            image = cv2.imread(path)
+            if image is None:
+                continue
+            canvas, _, _ = letterbox(image, self.img_size)
+            batch = canvas.transpose(2, 0, 1)[None].astype(np.float32) / 255.0
+            return {self.input_name: batch}
+        return None
+
+
+def copy_metadata(source_path: str, target_path: str) -> None:
+    # Keep the stride/names metadata written by YOLOv5's exporter
+    source = onnx.load(source_path, load_external_data=False)
+    target = onnx.load(target_path)
+    del target.metadata_props[:]
+    for prop in source.metadata_props:
+        target.metadata_props.add(key=prop.key, value=prop.value)
+    onnx.save(target, target_path)
+
+
+def quantize_model(
+    fp32_path: str,
+    output_path: str,
+    mode: str = "static",
+    calibration_images: Optional[List[str]] = None,
+    img_size: int = MODEL_IMG_SIZE,
+    max_calibration_images: int = QUANTIZATION_MAX_CALIBRATION_IMAGES,
+) -> str:
+    logging.info(f"Quantizing {fp32_path} to INT8 ({mode})")
+
+    if mode == "dynamic":
+        quantize_dynamic(fp32_path, output_path, weight_type=QuantType.QUInt8)
+
+    elif mode == "static":
+        if not calibration_images:
+            raise ValueError("Static quantization needs calibration images")
+
+        input_name = onnx.load(fp32_path, load_external_data=False).graph.input[0].name
+        reader = ImageCalibrationReader(
+            input_name, calibration_images[:max_calibration_images], img_size
+        )
+        quantize_static(
+            fp32_path,
+            output_path,
+            reader,
+            quant_format=QuantFormat.QDQ,
+            activation_type=QuantType.QUInt8,
+            weight_type=QuantType.QInt8,
+        )
+
+    else:
+        raise ValueError(f"Unknown quantization mode: {mode!r}")
+
+    copy_metadata(fp32_path, output_path)
+    logging.info(f"INT8 model written to {output_path}")
+    return output_path
+
+
+def read_yolo_labels(label_path: str, width: int, height: int) -> np.ndarray:
+    """
+    Returns (n, 5) class, xmin, ymin, xmax, ymax in pixels
+    """
+    if not os.path.exists(label_path):
+        return np.zeros((0, 5), dtype=np.float32)
+
+    rows = np.loadtxt(label_path, dtype=np.float32, ndmin=2)
+    if not rows.size:
+        return np.zeros((0, 5), dtype=np.float32)
+
+    cls, cx, cy, w, h = rows[:, :5].T
+    return np.stack([
+        cls,
+        (cx - w / 2) * width,
+        (cy - h / 2) * height,
+        (cx + w / 2) * width,
+        (cy + h / 2) * height,
+    ], axis=1)
+
+
+def box_iou(box: np.ndarray, boxes: np.ndarray) -> np.ndarray:
+    w = np.clip(np.minimum(box[2], boxes[:, 2]) - np.maximum(box[0], boxes[:, 0]), 0, None)
+    h = np.clip(np.minimum(box[3], boxes[:, 3]) - np.maximum(box[1], boxes[:, 1]), 0, None)
+    inter = w * h
+    area = (box[2] - box[0]) * (box[3] - box[1])
+    areas = (boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1])
+    return inter / (area + areas - inter + 1e-9)
+
+
+def average_precision(recall: np.ndarray, precision: np.ndarray) -> float:
+    # All-point interpolation (VOC 2010+)
+    recall = np.concatenate([[0.0], recall, [1.0]])
+    precision = np.concatenate([[1.0], precision, [0.0]])
+    precision = np.flip(np.maximum.accumulate(np.flip(precision)))
+    changes = np.where(recall[1:] != recall[:-1])[0]
+    return float(np.sum((recall[changes + 1] - recall[changes]) * precision[changes + 1]))
+
+
+def evaluate_map50(backend, image_paths: List[str], label_dir: str) -> float:
+    """
+    mAP@0.5 of backend over the given images and their YOLO label files
+    """
+    scored = {}       # class -> list of (confidence, is_true_positive)
+    num_truth = {}    # class -> number of ground-truth boxes
+
+    for path in image_paths:
+        image = cv2.imread(path)
+        if image is None:
+            continue
+
+        stem = os.path.splitext(os.path.basename(path))[0]
+        truth = read_yolo_labels(
+            os.path.join(label_dir, stem + ".txt"), image.shape[1], image.shape[0]
+        )
+        for cls in truth[:, 0].astype(int):
+            num_truth[cls] = num_truth.get(cls, 0) + 1
+
+        det = backend.predict([image])[0]
+        det = det[np.argsort(-det[:, 4])]
+        matched = np.zeros(len(truth), dtype=bool)
+
+        for row in det:
+            cls = int(row[5])
+            candidates = np.where((truth[:, 0] == cls) & ~matched)[0]
+            hit = False
+            if len(candidates):
+                ious = box_iou(row[:4], truth[candidates, 1:])
+                best = int(np.argmax(ious))
+                if ious[best] >= 0.5:
+                    matched[candidates[best]] = True
+                    hit = True
+            scored.setdefault(cls, []).append((float(row[4]), hit))
+
+    aps = []
+    for cls, count in num_truth.items():
+        entries = sorted(scored.get(cls, []), key=lambda e: -e[0])
+        if not entries:
+            aps.append(0.0)
+            continue
+        hits = np.array([hit for _, hit in entries], dtype=np.float64)
+        tp = np.cumsum(hits)
+        fp = np.cumsum(1.0 - hits)
+        aps.append(average_precision(tp / count, tp / (tp + fp)))
+
+    return float(np.mean(aps)) if aps else 0.0
+
@@ -1,31 +1,73 @@
 import sys
-import boto3
+from typing import Callable, Iterator, Optional, Union
 from app.exception import SignException
 from app.logger import logger as logging
+from app.s3_client import get_s3_client
+from app.s3_transfer import (
+    make_transfer_config,
+    read_body_into,
+    download_file_resumable,
+    upload_file,
+)
 
 
 
 class S3Operation:
-    def __init__(self):
-        self.s3_client = boto3.client("s3")
+    def __init__(self, s3_client=None):
+        self.s3_client = s3_client or get_s3_client()
+        self.transfer_config = make_transfer_config()
     
-    def read_object(self, bucket_name: str, object_name: str, decode: bool = True):
-     try:
-        obj = self.s3_client.get_object(Bucket=bucket_name, Key=object_name)
-        data = obj["Body"].read()
-        return data.decode() if decode else data
-     except Exception as e:
-        raise SignException(e, sys) from e
+    def read_object(
+        self, bucket_name: str, object_name: str, decode: bool = True
+    ) -> Union[str, memoryview]:
+        """
+        Returns the object as str, or with decode=False as a memoryview
+        over the one buffer it was read into. The view works wherever a
+        bytes-like object does (np.frombuffer, pickle.loads, file writes)
+        but cannot be pickled; call bytes() on it to send it to a process.
+        """
+        try:
+            obj = self.s3_client.get_object(Bucket=bucket_name, Key=object_name)
+            data = read_body_into(obj)
+            return str(data, "utf-8") if decode else data
+        except Exception as e:
+            raise SignException(e, sys) from e
+
+    def list_objects(self, bucket_name: str, prefix: str = "") -> Iterator[dict]:
+        """
+        Yields the object summaries (Key, Size, ETag, ...) under prefix,
+        one listing page at a time
+        """
+        try:
+            paginator = self.s3_client.get_paginator("list_objects_v2")
+            for page in paginator.paginate(Bucket=bucket_name, Prefix=prefix):
+                yield from page.get("Contents", [])
+        except Exception as e:
+            raise SignException(e, sys) from e
 
+    def head_object(self, bucket_name: str, object_name: str) -> dict:
+        try:
+            return self.s3_client.head_object(Bucket=bucket_name, Key=object_name)
+        except Exception as e:
+            raise SignException(e, sys) from e
 
-    def upload_file(self, file_path: str, bucket_name: str, s3_key: str):
+    def upload_file(
+        self,
+        file_path: str,
+        bucket_name: str,
+        s3_key: str,
+        progress_callback: Optional[Callable[[int, int], None]] = None
+    ):
         try:
             logging.info(f"Uploading {file_path} to s3://{bucket_name}/{s3_key}")
 
-            self.s3_client.upload_file(
-                Filename=file_path,
-                Bucket=bucket_name,
-                Key=s3_key
+            upload_file(
+                self.s3_client,
+                file_path,
+                bucket_name,
+                s3_key,
+                transfer_config=self.transfer_config,
+                progress_callback=progress_callback
             )
 
             logging.info("Upload successful")
@@ -34,14 +76,28 @@ class S3Operation:
             logging.error(f"S3 upload failed: {e}")
             raise SignException(e, sys) from e
 
-    def download_file(self, bucket_name: str, s3_key: str, local_path: str):
+    def download_file(
+        self,
+        bucket_name: str,
+        s3_key: str,
+        local_path: str,
+        progress_callback: Optional[Callable[[int, int], None]] = None
+    ):
+        """
+        Parallel ranged download that resumes from local_path.part after
+        an interruption; local_path only appears once it is complete
+        """
         try:
             logging.info(f"Downloading s3://{bucket_name}/{s3_key} to {local_path}")
 
-            self.s3_client.download_file(
-                Bucket=bucket_name,
-                Key=s3_key,
-                Filename=local_path
+            download_file_resumable(
+                self.s3_client,
+                bucket_name,
+                s3_key,
+                local_path,
+                part_size=self.transfer_config.multipart_chunksize,
+                max_workers=self.transfer_config.max_request_concurrency,
+                progress_callback=progress_callback
             )
 
             logging.info("Download successful")
@@ -0,0 +1,216 @@
+"""
+Transfer helpers shared by S3Operation: tuned multipart settings, reads
+straight into a preallocated buffer, progress reporting and resumable
+parallel ranged downloads.
+
+Used by both the training package and the API, which deploys a copy of
+this module (sign-language-deployment/app/s3_transfer.py) that differs
+only in where the S3_* settings come from; tests/test_vendored_modules.py
+keeps the two in step. It logs through the standard logging module and
+imports neither package's logger.
+"""
+import json
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+from boto3.s3.transfer import TransferConfig
+
+from app.constant import (
+    S3_MULTIPART_THRESHOLD,
+    S3_MULTIPART_CHUNKSIZE,
+    S3_MAX_CONCURRENCY,
+    S3_STREAM_CHUNK_SIZE,
+)
+
+PARTIAL_SUFFIX = ".part"
+STATE_SUFFIX = ".part.json"
+
+
+def make_transfer_config(
+    multipart_threshold: int = S3_MULTIPART_THRESHOLD,
+    multipart_chunksize: int = S3_MULTIPART_CHUNKSIZE,
+    max_concurrency: int = S3_MAX_CONCURRENCY,
+) -> TransferConfig:
+    return TransferConfig(
+        multipart_threshold=multipart_threshold,
+        multipart_chunksize=multipart_chunksize,
+        max_concurrency=max_concurrency,
+        use_threads=max_concurrency > 1,
+    )
+
+
+class TransferProgress:
+    """
+    Thread-safe boto3 progress callback. Logs every log_every_pct percent
+    and forwards (transferred, total) to an optional callback.
+    """
+
+    def __init__(
+        self,
+        label: str,
+        total: int,
+        callback: Optional[Callable[[int, int], None]] = None,
+        log_every_pct: int = 10,
+    ):
+        self.label = label
+        self.total = total
+        self.callback = callback
+        self.log_every_pct = log_every_pct
+        self.transferred = 0
+        self._next_log_pct = log_every_pct
+        self._lock = threading.Lock()
+
+    def __call__(self, bytes_amount: int) -> None:
+        with self._lock:
+            self.transferred += bytes_amount
+            transferred = self.transferred
+            pct = transferred * 100 // self.total if self.total else 100
+            should_log = pct >= self._next_log_pct
+            if should_log:
+                self._next_log_pct = (pct // self.log_every_pct + 1) * self.log_every_pct
+
+        if should_log:
+            logging.info(f"{self.label}: {pct}% ({transferred}/{self.total} bytes)")
+        if self.callback is not None:
+            self.callback(transferred, self.total)
+
+
+def read_body_into(response: dict, chunk_size: int = S3_STREAM_CHUNK_SIZE) -> memoryview:
+    """
+    Reads a get_object response body into one preallocated buffer instead
+    of letting the HTTP layer build and join intermediate copies
+    """
+    size = response["ContentLength"]
+    view = memoryview(bytearray(size))
+    offset = 0
+    for chunk in response["Body"].iter_chunks(chunk_size):
+        view[offset:offset + len(chunk)] = chunk
+        offset += len(chunk)
+    return view[:offset]
+
+
+def stream_to_file(
+    response: dict,
+    file_path: str,
+    chunk_size: int = S3_STREAM_CHUNK_SIZE,
+    progress: Optional[Callable[[int], None]] = None,
+) -> None:
+    with open(file_path, "wb") as f:
+        for chunk in response["Body"].iter_chunks(chunk_size):
+            f.write(chunk)
+            if progress is not None:
+                progress(len(chunk))
+
+
+def _load_state(state_path: str, partial_path: str, etag: str, size: int, part_size: int):
+    if not (os.path.exists(state_path) and os.path.exists(partial_path)):
+        return None
+    try:
+        with open(state_path) as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if (state.get("etag"), state.get("size"), state.get("part_size")) != (etag, size, part_size):
+        return None
+    return state
+
+
+def _save_state(state_path: str, state: dict) -> None:
+    tmp_path = state_path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(state, f)
+    os.replace(tmp_path, state_path)
+
+
+def download_file_resumable(
+    s3_client,
+    bucket_name: str,
+    s3_key: str,
+    file_path: str,
+    part_size: int = S3_MULTIPART_CHUNKSIZE,
+    max_workers: int = S3_MAX_CONCURRENCY,
+    progress_callback: Optional[Callable[[int, int], None]] = None,
+) -> str:
+    """
+    Downloads with parallel ranged GETs into <file_path>.part, recording
+    finished parts in <file_path>.part.json. A rerun after an interruption
+    only fetches the missing parts, as long as the object's ETag is
+    unchanged. The finished file is renamed into place atomically.
+    """
+    head = s3_client.head_object(Bucket=bucket_name, Key=s3_key)
+    size, etag = head["ContentLength"], head["ETag"]
+
+    partial_path = file_path + PARTIAL_SUFFIX
+    state_path = file_path + STATE_SUFFIX
+
+    state = _load_state(state_path, partial_path, etag, size, part_size)
+    if state is None:
+        state = {"etag": etag, "size": size, "part_size": part_size, "done": []}
+        with open(partial_path, "wb") as f:
+            f.truncate(size)
+        _save_state(state_path, state)
+    else:
+        logging.info(
+            f"Resuming s3://{bucket_name}/{s3_key}: "
+            f"{len(state['done'])} parts already downloaded"
+        )
+
+    parts = [
+        (index, start, min(start + part_size, size) - 1)
+        for index, start in enumerate(range(0, size, part_size))
+    ]
+    done = set(state["done"])
+    pending = [part for part in parts if part[0] not in done]
+
+    progress = TransferProgress(f"s3://{bucket_name}/{s3_key}", size, progress_callback)
+    progress(sum(end - start + 1 for index, start, end in parts if index in done))
+    state_lock = threading.Lock()
+
+    def fetch(part):
+        index, start, end = part
+        response = s3_client.get_object(
+            Bucket=bucket_name, Key=s3_key, Range=f"bytes={start}-{end}", IfMatch=etag
+        )
+        # One handle per part keeps the writes independent across threads
+        with open(partial_path, "r+b") as f:
+            f.seek(start)
+            for chunk in response["Body"].iter_chunks(S3_STREAM_CHUNK_SIZE):
+                f.write(chunk)
+                progress(len(chunk))
+        with state_lock:
+            done.add(index)
+            state["done"] = sorted(done)
+            _save_state(state_path, state)
+
+    if pending:
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(pending)))) as pool:
+            list(pool.map(fetch, pending))
+
+    os.replace(partial_path, file_path)
+    os.remove(state_path)
+    return file_path
+
+
+def upload_file(
+    s3_client,
+    file_path: str,
+    bucket_name: str,
+    s3_key: str,
+    transfer_config: Optional[TransferConfig] = None,
+    progress_callback: Optional[Callable[[int, int], None]] = None,
+) -> None:
+    progress = TransferProgress(
+        f"{file_path} -> s3://{bucket_name}/{s3_key}",
+        os.path.getsize(file_path),
+        progress_callback,
+    )
+    s3_client.upload_file(
+        Filename=file_path,
+        Bucket=bucket_name,
+        Key=s3_key,
+        Config=transfer_config or make_transfer_config(),
+        Callback=progress,
+    )
@@ -0,0 +1,13 @@
+"""
+CPU-bound request stages. They live at module level so they can run on
+either a thread or a process worker pool.
+"""
+from typing import Union
+
+import cv2
+import numpy as np
+
+
+def decode_image(image_bytes: Union[bytes, memoryview]):
+    np_img = np.frombuffer(image_bytes, np.uint8)
+    return cv2.imdecode(np_img, cv2.IMREAD_COLOR)
@@ -0,0 +1,77 @@
+import os
+import shutil
+import tempfile
+from typing import BinaryIO, List, Tuple
+
+import cv2
+import numpy as np
+
+
+def spool_upload(fileobj: BinaryIO, chunk_size: int, suffix: str = "") -> str:
+    """
+    Copies an upload to a named temporary file chunk by chunk, so the clip
+    is never held in memory as a whole. OpenCV needs a real path to decode
+    from. The caller owns (and must remove) the returned file.
+    """
+    fileobj.seek(0)
+    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as f:
+        shutil.copyfileobj(fileobj, f, chunk_size)
+        return f.name
+
+
+class FrameSampler:
+    """
+    Reads every stride-th frame of a video file. Skipped frames are only
+    grabbed, not decoded, so a large stride is cheap.
+    """
+
+    def __init__(self, video_path: str, stride: int = 1):
+        if stride < 1:
+            raise ValueError("stride must be >= 1")
+
+        self.video_path = video_path
+        self.stride = stride
+        self.frame_index = 0
+        self.exhausted = False
+
+        self._cap = cv2.VideoCapture(video_path)
+        if not self._cap.isOpened():
+            raise ValueError(f"Could not open video: {video_path}")
+
+        self.fps = self._cap.get(cv2.CAP_PROP_FPS) or 0.0
+
+    def read(self, max_frames: int) -> List[Tuple[int, float, np.ndarray]]:
+        """
+        Returns up to max_frames sampled (frame_index, timestamp_ms, frame)
+        tuples; an empty list means the video is exhausted
+        """
+        frames = []
+        while not self.exhausted and len(frames) < max_frames:
+            if not self._cap.grab():
+                self.exhausted = True
+                break
+
+            index = self.frame_index
+            self.frame_index += 1
+            if index % self.stride:
+                continue
+
+            ok, frame = self._cap.retrieve()
+            if not ok:
+                self.exhausted = True
+                break
+
+            timestamp_ms = index * 1000.0 / self.fps if self.fps else 0.0
+            frames.append((index, timestamp_ms, frame))
+
+        return frames
+
+    def close(self) -> None:
+        self._cap.release()
+
+
+def remove_file(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
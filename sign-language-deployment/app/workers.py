@@ -0,0 +1,106 @@
+import asyncio
+import contextvars
+import functools
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Any, Callable
+
+from app.logger import logger as logging
+
+
+class ServerOverloaded(Exception):
+    """
+    Raised when the admission queue is full; mapped to HTTP 503
+    """
+
+    def __init__(self, retry_after: int):
+        super().__init__("Server is overloaded, retry later")
+        self.retry_after = retry_after
+
+
+def create_executor(kind: str, max_workers: int) -> Executor:
+    if kind == "thread":
+        return ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="cpu-stage"
+        )
+    if kind == "process":
+        return ProcessPoolExecutor(max_workers=max_workers)
+    raise ValueError(f"Unknown worker pool kind: {kind!r}")
+
+
+class WorkerPool:
+    """
+    Runs CPU-bound request stages off the event loop and bounds the number
+    of requests in flight, so overload turns into fast 503s instead of an
+    ever-growing backlog.
+
+    Functions passed to run() must be picklable (module level) when the
+    pool is process based.
+    """
+
+    def __init__(
+        self,
+        kind: str = "thread",
+        max_workers: int = 1,
+        max_pending: int = 64,
+        retry_after: int = 1,
+    ):
+        self.kind = kind
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.retry_after = retry_after
+
+        self.in_flight = 0
+        self.rejected = 0
+        self._executor = None
+
+    def start(self) -> None:
+        if self._executor is None:
+            self._executor = create_executor(self.kind, self.max_workers)
+            logging.info(
+                f"Worker pool started (kind={self.kind}, "
+                f"max_workers={self.max_workers}, max_pending={self.max_pending})"
+            )
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def acquire(self) -> None:
+        # Only touched from the event loop thread, so no lock is needed
+        if self.in_flight >= self.max_pending:
+            self.rejected += 1
+            raise ServerOverloaded(self.retry_after)
+        self.in_flight += 1
+
+    def release(self) -> None:
+        self.in_flight -= 1
+
+    @asynccontextmanager
+    async def admit(self):
+        self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    async def run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        if self._executor is None:
+            raise RuntimeError("Worker pool is not running")
+
+        call = functools.partial(fn, *args, **kwargs)
+        if self.kind == "thread":
+            # run_in_executor does not carry context variables over, so
+            # records logged in the stage would lose their request ID
+            call = functools.partial(contextvars.copy_context().run, call)
+        return await asyncio.get_running_loop().run_in_executor(self._executor, call)
+
+    def snapshot(self) -> dict:
+        return {
+            "kind": self.kind,
+            "max_workers": self.max_workers,
+            "max_pending": self.max_pending,
+            "in_flight": self.in_flight,
+            "rejected": self.rejected,
+        }
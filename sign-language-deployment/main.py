@@ -13,8 +13,15 @@ if APP_DIR not in sys.path:
     sys.path.append(APP_DIR)
 
 from app.model_validation import ModelValidation
-from app.constant import LOCAL_MODEL_PATH
+from app.constant import (
+    LOCAL_MODEL_PATH,
+    MODEL_RELOAD_INTERVAL_S,
+    SERVER_WORKERS,
+    WORKER_THREADS,
+    WORKER_SHUTDOWN_TIMEOUT_S,
+)
 from app.logger import logging
+from app.prefork import PreforkServer
 
 def run():
     logging.info("Starting deployment pipeline")
@@ -25,6 +32,18 @@ def run():
 
     logging.info("Model validation passed. Starting API server...")
 
+    # Several workers: load the model once here and fork them (app/prefork.py)
+    if SERVER_WORKERS > 1:
+        PreforkServer(
+            host="0.0.0.0",
+            port=8000,
+            workers=SERVER_WORKERS,
+            threads=WORKER_THREADS,
+            reload_interval=MODEL_RELOAD_INTERVAL_S,
+            shutdown_timeout=WORKER_SHUTDOWN_TIMEOUT_S,
+        ).run()
+        return
+
     uvicorn.run(
         "app.app:app",
         host="0.0.0.0",
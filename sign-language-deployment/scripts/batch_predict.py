@@ -0,0 +1,403 @@
+"""
+Runs the model over a local directory, a glob or an S3 prefix without the API.
+
+Images are read and decoded ahead of the model by a thread pool, pushed
+through the backend in batches and written out as they finish: JSON
+lines appended to one file, or Parquet part files in a directory. A
+rerun with the same output skips the images already written, so an
+interrupted job picks up where it stopped.
+
+Usage:
+    python scripts/batch_predict.py ../CollectedImages --output predictions.jsonl
+    python scripts/batch_predict.py "data/**/*.jpg" --format parquet --output predictions/
+    python scripts/batch_predict.py s3://my-bucket/frames/2026-10-18/ --backend onnx --batch-size 16
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Iterator, List, Optional, Set, Tuple
+
+import numpy as np
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+YOLOV5_DIR = os.path.join(ROOT_DIR, "yolov5")
+
+if ROOT_DIR not in sys.path:
+    sys.path.append(ROOT_DIR)
+
+from app.backends import load_backend
+from app.constant import LOCAL_MODEL_PATH, MODEL_BACKEND, MODEL_MAX_DET
+from app.postprocess import format_detection, top_detections
+from app.stages import decode_image
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp")
+
+PART_PREFIX = "part-"
+# Rows of the part being written, one JSON line per row, appended as each
+# row group is flushed; a .tmp part without its footer is unreadable
+JOURNAL_SUFFIX = ".journal"
+
+
+def is_image(name: str) -> bool:
+    return name.lower().endswith(IMAGE_EXTENSIONS)
+
+
+def split_s3_uri(uri: str) -> Tuple[str, str]:
+    bucket, _, key = uri[len("s3://"):].partition("/")
+    return bucket, key
+
+
+def list_sources(source: str, s3=None) -> List[str]:
+    """
+    Image paths or s3:// URIs for a directory (recursive), a glob pattern,
+    a single file or an S3 prefix, sorted so reruns see the same order
+    """
+    if source.startswith("s3://"):
+        bucket, prefix = split_s3_uri(source)
+        return sorted(
+            f"s3://{bucket}/{obj['Key']}"
+            for obj in s3.list_objects(bucket, prefix)
+            if is_image(obj["Key"])
+        )
+    if os.path.isdir(source):
+        return sorted(
+            os.path.join(dirpath, name)
+            for dirpath, _, filenames in os.walk(source)
+            for name in filenames
+            if is_image(name)
+        )
+    if os.path.isfile(source):
+        return [source]
+    return sorted(path for path in glob.glob(source, recursive=True) if is_image(path))
+
+
+def load_image(source: str, s3=None) -> Tuple[str, Optional[np.ndarray], Optional[str]]:
+    try:
+        if source.startswith("s3://"):
+            data = s3.read_object(*split_s3_uri(source), decode=False)
+        else:
+            with open(source, "rb") as f:
+                data = f.read()
+        image = decode_image(data)
+        if image is None:
+            return source, None, "could not decode image"
+        return source, image, None
+    except Exception as e:
+        return source, None, str(e)
+
+
+def prefetch(sources: Iterable[str], workers: int, depth: int, s3=None) -> Iterator[tuple]:
+    """
+    Yields (source, image, error) in input order while up to depth images
+    are being read and decoded ahead on the pool
+    """
+    sources = iter(sources)
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="prefetch") as pool:
+        for source in sources:
+            pending.append(pool.submit(load_image, source, s3))
+            if len(pending) >= depth:
+                break
+        while pending:
+            yield pending.popleft().result()
+            for source in sources:
+                pending.append(pool.submit(load_image, source, s3))
+                break
+
+
+def batches(items: Iterable[tuple], size: int) -> Iterator[List[tuple]]:
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def predict_batch(backend, batch: List[tuple], top_k: int) -> List[dict]:
+    images = [image for _, image, _ in batch if image is not None]
+    detections = iter(backend.predict(images) if images else [])
+
+    records = []
+    for source, image, error in batch:
+        record = {
+            "source": source,
+            "width": None,
+            "height": None,
+            "label": None,
+            "confidence": None,
+            "detections": [],
+            "error": error,
+        }
+        if image is not None:
+            det = next(detections)
+            best = format_detection(det, backend.names, backend.conf)
+            record.update(
+                height=int(image.shape[0]),
+                width=int(image.shape[1]),
+                label=best["label"],
+                confidence=float(best["confidence"]),
+                detections=top_detections(det, backend.names, top_k, backend.conf),
+            )
+        records.append(record)
+    return records
+
+
+class JsonlWriter:
+    """
+    Appends one JSON line per image and flushes after every batch. On
+    open, a line cut off by an interruption is truncated away.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._truncate_partial_line()
+        self.file = open(path, "a", encoding="utf-8")
+
+    def _truncate_partial_line(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "rb+") as f:
+            data = f.read()
+            if data and not data.endswith(b"\n"):
+                f.truncate(data.rfind(b"\n") + 1)
+
+    def done_sources(self) -> Set[str]:
+        done = set()
+        if not os.path.exists(self.path):
+            return done
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                done.add(json.loads(line)["source"])
+        return done
+
+    def write(self, records: List[dict]) -> None:
+        self.file.write("".join(json.dumps(record) + "\n" for record in records))
+        self.file.flush()
+
+    def close(self) -> None:
+        self.file.close()
+
+
+class ParquetWriter:
+    """
+    Writes part files into a directory, starting a new one once a part
+    holds rows_per_file rows. Rows are flushed in row groups of
+    rows_per_group, each also appended to the part's journal. A part is
+    written as .tmp and renamed once closed; on open, a .tmp left by an
+    interruption is rebuilt from its journal, so at most one row group
+    of work is lost.
+    """
+
+    def __init__(self, path: str, rows_per_file: int, rows_per_group: int):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self.pa, self.pq = pa, pq
+        self.path = path
+        self.rows_per_file = rows_per_file
+        self.rows_per_group = rows_per_group
+        os.makedirs(path, exist_ok=True)
+
+        bbox = pa.struct([(k, pa.float32()) for k in ("xmin", "ymin", "xmax", "ymax")])
+        detection = pa.struct([
+            ("label", pa.string()),
+            ("confidence", pa.float32()),
+            ("bbox", bbox),
+        ])
+        self.schema = pa.schema([
+            ("source", pa.string()),
+            ("width", pa.int32()),
+            ("height", pa.int32()),
+            ("label", pa.string()),
+            ("confidence", pa.float32()),
+            ("detections", pa.list_(detection)),
+            ("error", pa.string()),
+        ])
+
+        self.writer = None
+        self.journal = None
+        self.pending: List[dict] = []
+        self.rows = 0
+        self._recover()
+        self.parts = sorted(
+            name for name in os.listdir(self.path)
+            if name.startswith(PART_PREFIX) and name.endswith(".parquet")
+        )
+
+    def _recover(self) -> None:
+        for name in sorted(os.listdir(self.path)):
+            if not (name.startswith(PART_PREFIX) and name.endswith(JOURNAL_SUFFIX)):
+                continue
+            journal_path = os.path.join(self.path, name)
+            part_path = journal_path[:-len(JOURNAL_SUFFIX)]
+            records = []
+            with open(journal_path, encoding="utf-8") as f:
+                for line in f:
+                    # A line cut off mid-write belongs to an unflushed group
+                    if line.endswith("\n"):
+                        records.append(json.loads(line))
+            if records:
+                print(f"Recovering {len(records)} rows of {os.path.basename(part_path)}")
+                self.pq.write_table(
+                    self.pa.Table.from_pylist(records, schema=self.schema),
+                    part_path + ".tmp",
+                    row_group_size=self.rows_per_group,
+                )
+                os.replace(part_path + ".tmp", part_path)
+            os.remove(journal_path)
+
+        for name in os.listdir(self.path):
+            if name.startswith(PART_PREFIX) and name.endswith(".tmp"):
+                os.remove(os.path.join(self.path, name))
+
+    def done_sources(self) -> Set[str]:
+        done = set()
+        for name in self.parts:
+            table = self.pq.read_table(os.path.join(self.path, name), columns=["source"])
+            done.update(table.column("source").to_pylist())
+        return done
+
+    def _part_path(self) -> str:
+        return os.path.join(self.path, f"{PART_PREFIX}{len(self.parts):05d}.parquet")
+
+    def write(self, records: List[dict]) -> None:
+        self.pending.extend(records)
+        while len(self.pending) >= self.rows_per_group:
+            room = min(self.rows_per_group, self.rows_per_file - self.rows)
+            self._flush_group(self.pending[:room])
+            del self.pending[:room]
+
+    def _flush_group(self, records: List[dict]) -> None:
+        if not records:
+            return
+        if self.writer is None:
+            part_path = self._part_path()
+            self.writer = self.pq.ParquetWriter(part_path + ".tmp", self.schema)
+            self.journal = open(part_path + JOURNAL_SUFFIX, "w", encoding="utf-8")
+
+        self.writer.write_table(self.pa.Table.from_pylist(records, schema=self.schema))
+        self.journal.write("".join(json.dumps(record) + "\n" for record in records))
+        self.journal.flush()
+        os.fsync(self.journal.fileno())
+
+        self.rows += len(records)
+        if self.rows >= self.rows_per_file:
+            self._finish_part()
+
+    def _finish_part(self) -> None:
+        if self.writer is None:
+            return
+        self.writer.close()
+        self.journal.close()
+        part_path = self._part_path()
+        os.replace(part_path + ".tmp", part_path)
+        os.remove(part_path + JOURNAL_SUFFIX)
+        self.parts.append(os.path.basename(part_path))
+        self.writer = self.journal = None
+        self.rows = 0
+
+    def close(self) -> None:
+        while self.pending:
+            room = self.rows_per_file - self.rows
+            self._flush_group(self.pending[:room])
+            del self.pending[:room]
+        self._finish_part()
+
+
+def set_torch_threads(threads: int) -> None:
+    if threads <= 0:
+        return
+    try:
+        import torch
+    except ImportError:
+        return
+    torch.set_num_threads(threads)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("source", help="directory, glob pattern, image file or s3://bucket/prefix")
+    parser.add_argument("--output", required=True,
+                        help="JSONL file, or directory of part files with --format parquet")
+    parser.add_argument("--format", choices=["jsonl", "parquet"], default="jsonl")
+    parser.add_argument("--weights", default=os.path.join(ROOT_DIR, LOCAL_MODEL_PATH))
+    parser.add_argument("--backend", default=MODEL_BACKEND)
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="threads reading and decoding images")
+    parser.add_argument("--prefetch", type=int, default=0,
+                        help="images decoded ahead of the model (default: 4 batches)")
+    parser.add_argument("--threads", type=int, default=0,
+                        help="torch intra-op threads (0 leaves the default)")
+    parser.add_argument("--top-k", type=int, default=MODEL_MAX_DET,
+                        help="detections kept per image")
+    parser.add_argument("--rows-per-file", type=int, default=100_000,
+                        help="rows per Parquet part file")
+    parser.add_argument("--rows-per-group", type=int, default=1024,
+                        help="rows per Parquet row group, the unit of resume progress")
+    parser.add_argument("--no-resume", action="store_true",
+                        help="process every image even if it is already in the output")
+    args = parser.parse_args()
+
+    s3 = None
+    if args.source.startswith("s3://"):
+        from app.s3_operations import S3Operation
+        s3 = S3Operation()
+
+    if args.format == "parquet":
+        writer = ParquetWriter(args.output, args.rows_per_file, args.rows_per_group)
+    else:
+        writer = JsonlWriter(args.output)
+
+    sources = list_sources(args.source, s3)
+    done = set() if args.no_resume else writer.done_sources()
+    todo = [source for source in sources if source not in done]
+    print(f"{len(sources)} images found, {len(sources) - len(todo)} already done, {len(todo)} to go")
+    if not todo:
+        writer.close()
+        return
+
+    set_torch_threads(args.threads)
+    backend = load_backend(args.backend, args.weights, YOLOV5_DIR)
+
+    depth = args.prefetch or 4 * args.batch_size
+    processed = failed = 0
+    started_at = last_report = time.perf_counter()
+    try:
+        for batch in batches(prefetch(todo, args.workers, depth, s3), args.batch_size):
+            records = predict_batch(backend, batch, args.top_k)
+            writer.write(records)
+            processed += len(records)
+            failed += sum(record["error"] is not None for record in records)
+
+            now = time.perf_counter()
+            if now - last_report >= 5 or processed == len(todo):
+                rate = processed / (now - started_at)
+                print(f"{processed}/{len(todo)} images, {rate:.1f} images/s, {failed} failed")
+                last_report = now
+    finally:
+        writer.close()
+
+    elapsed = time.perf_counter() - started_at
+    print(json.dumps({
+        "backend": backend.name,
+        "images": processed,
+        "failed": failed,
+        "seconds": round(elapsed, 3),
+        "images_per_sec": round(processed / elapsed, 2) if elapsed else 0.0,
+        "output": args.output,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
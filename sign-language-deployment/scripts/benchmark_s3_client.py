@@ -0,0 +1,68 @@
+"""
+Measures boto3 import time and S3 client creation / first-call latency
+for a fresh client per S3Operation (the old behaviour) against the shared
+client factory.
+
+Usage:
+    python scripts/benchmark_s3_client.py --operations 20 --bucket sign-lang-2026-vivek
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+start = time.perf_counter()
+import boto3
+BOTO3_IMPORT_MS = (time.perf_counter() - start) * 1000.0
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+if ROOT_DIR not in sys.path:
+    sys.path.append(ROOT_DIR)
+
+from app.constant import MODEL_PUSHER_BUCKET_NAME, S3_ENDPOINT_URL
+from app.s3_client import get_s3_client
+
+
+def measure(make_client, operations: int, bucket: str) -> dict:
+    create_ms, call_ms = [], []
+    for _ in range(operations):
+        start = time.perf_counter()
+        client = make_client()
+        created = time.perf_counter()
+        client.list_objects_v2(Bucket=bucket, MaxKeys=1)
+        called = time.perf_counter()
+
+        create_ms.append((created - start) * 1000.0)
+        call_ms.append((called - created) * 1000.0)
+
+    return {
+        "first_create_ms": create_ms[0],
+        "mean_create_ms": sum(create_ms) / len(create_ms),
+        "first_call_ms": call_ms[0],
+        "mean_call_ms": sum(call_ms) / len(call_ms),
+        "total_ms": sum(create_ms) + sum(call_ms),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--operations", type=int, default=20)
+    parser.add_argument("--bucket", default=MODEL_PUSHER_BUCKET_NAME)
+    args = parser.parse_args()
+
+    report = {
+        "boto3_import_ms": BOTO3_IMPORT_MS,
+        "client_per_operation": measure(
+            lambda: boto3.client("s3", endpoint_url=S3_ENDPOINT_URL),
+            args.operations,
+            args.bucket,
+        ),
+        "shared_client": measure(get_s3_client, args.operations, args.bucket),
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Measures S3 transfer throughput of boto3 defaults against the tuned
+transfer layer. Runs against a local moto server by default, or any
+S3-compatible endpoint given with --endpoint-url.
+
+Usage:
+    python scripts/benchmark_s3_transfer.py --size-mb 256
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+import boto3
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+if ROOT_DIR not in sys.path:
+    sys.path.append(ROOT_DIR)
+
+from app.s3_operations import S3Operation
+
+
+def timed_mb_per_s(fn, size_bytes: int) -> float:
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    return size_bytes / 2**20 / elapsed if elapsed else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size-mb", type=int, default=128)
+    parser.add_argument("--bucket", default="transfer-benchmark")
+    parser.add_argument("--endpoint-url", default=None,
+                        help="S3-compatible endpoint; starts a local moto server if omitted")
+    args = parser.parse_args()
+
+    server = None
+    endpoint_url = args.endpoint_url
+    if endpoint_url is None:
+        from moto.server import ThreadedMotoServer
+
+        server = ThreadedMotoServer(port=0)
+        server.start()
+        host, port = server.get_host_and_port()
+        endpoint_url = f"http://{host}:{port}"
+        os.environ.setdefault("AWS_ACCESS_KEY_ID", "testing")
+        os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "testing")
+        os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+
+    client = boto3.client("s3", endpoint_url=endpoint_url)
+    s3 = S3Operation(s3_client=client)
+    key = "benchmark/blob.bin"
+    size = args.size_mb * 2**20
+
+    try:
+        client.create_bucket(Bucket=args.bucket)
+    except client.exceptions.BucketAlreadyOwnedByYou:
+        pass
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, "source.bin")
+        with open(source, "wb") as f:
+            for _ in range(args.size_mb):
+                f.write(os.urandom(2**20))
+
+        target = os.path.join(tmp, "target.bin")
+        results = {
+            "size_mb": args.size_mb,
+            "endpoint_url": endpoint_url,
+            "upload_default_mb_s": timed_mb_per_s(
+                lambda: client.upload_file(source, args.bucket, key), size
+            ),
+            "upload_tuned_mb_s": timed_mb_per_s(
+                lambda: s3.upload_file(source, args.bucket, key), size
+            ),
+            "download_default_mb_s": timed_mb_per_s(
+                lambda: client.download_file(args.bucket, key, target), size
+            ),
+            "download_tuned_mb_s": timed_mb_per_s(
+                lambda: s3.download_file(args.bucket, key, target), size
+            ),
+            "read_default_mb_s": timed_mb_per_s(
+                lambda: client.get_object(Bucket=args.bucket, Key=key)["Body"].read(), size
+            ),
+            "read_into_buffer_mb_s": timed_mb_per_s(
+                lambda: s3.read_object(args.bucket, key, decode=False), size
+            ),
+        }
+
+    print(json.dumps(results, indent=2))
+
+    if server is not None:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
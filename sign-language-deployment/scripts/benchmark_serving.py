@@ -0,0 +1,391 @@
+"""
+Latency and throughput benchmark for the /predict endpoint.
+
+Replays images from CollectedImages/ against the app, either in-process
+(ASGI, no sockets; stub model or a real weights file) or against a
+running server. Reports latency percentiles, requests/sec, CPU time per
+request, peak RSS and, in-process, a decode / inference / post-process
+breakdown (remotely, from the Server-Timing header when the server sets
+METRICS_TIMING_HEADER=1), as JSON that can be diffed between commits.
+
+Usage:
+    python scripts/benchmark_serving.py --model stub --concurrency 8 --requests 500
+    python scripts/benchmark_serving.py --model best.pt --rate 20 --duration 30 --output bench.json
+    python scripts/benchmark_serving.py --url http://127.0.0.1:8000 --server-pid 1234
+"""
+import argparse
+import asyncio
+import contextlib
+import glob
+import json
+import logging
+import os
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter
+
+import httpx
+import numpy as np
+import psutil
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+if ROOT_DIR not in sys.path:
+    sys.path.append(ROOT_DIR)
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp")
+
+
+class StubBackend:
+    """
+    Stands in for a model: sleeps like a forward pass (releasing the GIL,
+    as torch does) and returns one fixed detection per image
+    """
+
+    name = "stub"
+
+    def __init__(self, names, conf, iou, max_det, batch_ms: float, image_ms: float):
+        self.names = list(names)
+        self.conf, self.iou, self.max_det = conf, iou, max_det
+        self.batch_ms, self.image_ms = batch_ms, image_ms
+
+    def predict(self, images):
+        time.sleep((self.batch_ms + self.image_ms * len(images)) / 1000.0)
+        return [
+            np.array([[8, 8, 120, 120, 0.9, i % len(self.names)]], dtype=np.float32)
+            for i in range(len(images))
+        ]
+
+
+class RssSampler:
+    """
+    Tracks the peak RSS of a process and its children while running
+    """
+
+    def __init__(self, pid: int, interval: float = 0.05):
+        self.process = psutil.Process(pid)
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def rss(self) -> int:
+        total = self.process.memory_info().rss
+        for child in self.process.children(recursive=True):
+            try:
+                total += child.memory_info().rss
+            except psutil.Error:
+                pass
+        return total
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, self.rss())
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+def cpu_seconds(process: psutil.Process) -> float:
+    times = process.cpu_times()
+    return times.user + times.system + times.children_user + times.children_system
+
+
+def percentiles(samples) -> dict:
+    if not samples:
+        return None
+    values = np.asarray(samples, dtype=np.float64)
+    return {
+        "count": int(values.size),
+        "mean": float(values.mean()),
+        "p50": float(np.percentile(values, 50)),
+        "p95": float(np.percentile(values, 95)),
+        "p99": float(np.percentile(values, 99)),
+        "max": float(values.max()),
+    }
+
+
+def timed(fn, samples: list):
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            samples.append((time.perf_counter() - start) * 1000.0)
+    return wrapper
+
+
+def load_images(image_dir: str, limit: int) -> list:
+    paths = sorted(
+        path for path in glob.glob(os.path.join(image_dir, "**", "*"), recursive=True)
+        if path.lower().endswith(IMAGE_EXTENSIONS)
+    )
+    if not paths:
+        raise SystemExit(f"No images found under {image_dir}")
+    images = []
+    for path in paths[:limit or None]:
+        with open(path, "rb") as f:
+            images.append((os.path.basename(path), f.read()))
+    return images
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "HEAD"], cwd=ROOT_DIR, stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def setup_in_process(args):
+    """
+    Imports the app with the model installed directly (no S3), the model
+    watcher and result cache off, and the stage functions timed. Returns
+    (serving module, stage samples).
+    """
+    os.environ["MODEL_RELOAD_INTERVAL_S"] = "0"
+    if not args.use_cache:
+        os.environ["RESULT_CACHE_MAX_ENTRIES"] = "0"
+
+    import app.app as serving
+    from app.constant import (
+        MODEL_BACKEND,
+        MODEL_CLASS_NAMES,
+        MODEL_CONF_THRESHOLD,
+        MODEL_IOU_THRESHOLD,
+        MODEL_MAX_DET,
+        MODEL_IMG_SIZE,
+    )
+    from app.model_manager import LoadedModel
+
+    if args.model == "stub":
+        backend = StubBackend(
+            MODEL_CLASS_NAMES, MODEL_CONF_THRESHOLD, MODEL_IOU_THRESHOLD, MODEL_MAX_DET,
+            args.stub_batch_ms, args.stub_image_ms,
+        )
+    else:
+        from app.backends import load_backend
+        backend = load_backend(MODEL_BACKEND, args.model, serving.YOLOV5_DIR)
+        backend.predict([np.zeros((MODEL_IMG_SIZE, MODEL_IMG_SIZE, 3), np.uint8)])
+
+    stages = {"decode_ms": [], "inference_batch_ms": [], "postprocess_ms": [], "batch_sizes": []}
+
+    predict = backend.predict
+
+    def timed_predict(images):
+        stages["batch_sizes"].append(len(images))
+        return timed(predict, stages["inference_batch_ms"])(images)
+
+    backend.predict = timed_predict
+
+    # Wrapped functions cannot be shipped to a process pool
+    if serving.workers.kind == "thread":
+        serving.decode_image = timed(serving.decode_image, stages["decode_ms"])
+        serving.format_detection = timed(serving.format_detection, stages["postprocess_ms"])
+
+    version = f"{backend.name}-benchmark"
+    serving.manager.current = LoadedModel(
+        backend=backend, etag="benchmark", version=version,
+        info={"version": version, "backend": backend.name, "path": args.model},
+    )
+    serving.manager.reload = lambda force=False: False
+
+    return serving, stages
+
+
+def parse_server_timing(header: str, server_timing: dict) -> None:
+    """
+    Adds the stage durations of a Server-Timing header
+    ("decode;dur=1.20, inference;dur=30.10, ...") to server_timing
+    """
+    for part in header.split(","):
+        name, _, params = part.strip().partition(";")
+        if params.startswith("dur="):
+            server_timing.setdefault(name, []).append(float(params[4:]))
+
+
+async def send(client, images, index, latencies, statuses, server_timing=None):
+    name, data = images[index % len(images)]
+    start = time.perf_counter()
+    try:
+        response = await client.post("/predict", files={"file": (name, data, "image/jpeg")})
+        statuses[response.status_code] += 1
+        ok = response.status_code == 200 and "error" not in response.json()
+        if ok and server_timing is not None and "server-timing" in response.headers:
+            parse_server_timing(response.headers["server-timing"], server_timing)
+    except httpx.HTTPError as e:
+        statuses[type(e).__name__] += 1
+        ok = False
+    if ok:
+        latencies.append((time.perf_counter() - start) * 1000.0)
+    return ok
+
+
+async def generate_load(client, images, args) -> dict:
+    """
+    Closed loop (`concurrency` clients back to back) or, with --rate,
+    open loop arrivals at a fixed rate capped at `concurrency` in flight
+    """
+    latencies, statuses, server_timing = [], Counter(), {}
+    deadline = time.perf_counter() + args.duration if args.duration else None
+    total = None if deadline else args.requests
+    counter = iter(range(sys.maxsize))
+
+    def more(index):
+        if total is not None:
+            return index < total
+        return time.perf_counter() < deadline
+
+    start = time.perf_counter()
+
+    if args.rate:
+        semaphore = asyncio.Semaphore(args.concurrency)
+        tasks = []
+
+        async def limited(index):
+            async with semaphore:
+                await send(client, images, index, latencies, statuses, server_timing)
+
+        for index in counter:
+            if not more(index):
+                break
+            delay = start + index / args.rate - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.create_task(limited(index)))
+        await asyncio.gather(*tasks)
+    else:
+        async def client_loop():
+            for index in counter:
+                if not more(index):
+                    return
+                await send(client, images, index, latencies, statuses, server_timing)
+
+        await asyncio.gather(*(client_loop() for _ in range(args.concurrency)))
+
+    elapsed = time.perf_counter() - start
+    completed = sum(statuses.values())
+    return {
+        "requests": completed,
+        "succeeded": len(latencies),
+        "status_codes": {str(code): count for code, count in statuses.items()},
+        "duration_s": elapsed,
+        "requests_per_sec": len(latencies) / elapsed if elapsed else 0.0,
+        "latency_ms": percentiles(latencies),
+        # Present when the server runs with METRICS_TIMING_HEADER=1
+        "server_timing_ms": {
+            stage: percentiles(samples) for stage, samples in server_timing.items()
+        } or None,
+    }
+
+
+async def run(args) -> dict:
+    images = load_images(args.images, args.max_images)
+
+    if args.url:
+        serving, stages = None, None
+        process = psutil.Process(args.server_pid) if args.server_pid else None
+        client = httpx.AsyncClient(base_url=args.url, timeout=args.timeout)
+    else:
+        serving, stages = setup_in_process(args)
+        process = psutil.Process()
+        await serving.app.router.startup()
+        client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=serving.app),
+            base_url="http://benchmark",
+            timeout=args.timeout,
+        )
+
+    try:
+        for index in range(args.warmup):
+            await send(client, images, index, [], Counter())
+        for samples in (stages or {}).values():
+            samples.clear()
+
+        cpu_before = cpu_seconds(process) if process else None
+        sampler = RssSampler(process.pid) if process else None
+        with sampler or contextlib.nullcontext():
+            load = await generate_load(client, images, args)
+        cpu_used = cpu_seconds(process) - cpu_before if process else None
+
+        server_stats = (await client.get("/stats")).json()
+    finally:
+        await client.aclose()
+        if serving is not None:
+            await serving.app.router.shutdown()
+
+    report = {
+        "commit": git_commit(),
+        "config": {
+            "mode": "remote" if args.url else "in-process",
+            "url": args.url,
+            "model": None if args.url else args.model,
+            "concurrency": args.concurrency,
+            "rate": args.rate,
+            "requests": args.requests,
+            "duration": args.duration,
+            "warmup": args.warmup,
+            "images": len(images),
+            "result_cache": bool(args.url) or args.use_cache,
+        },
+        **load,
+        # In-process this includes the load generator itself
+        "cpu_ms_per_request": (
+            cpu_used * 1000.0 / load["requests"] if cpu_used is not None and load["requests"] else None
+        ),
+        "peak_rss_mb": sampler.peak / 2 ** 20 if sampler else None,
+        "stages": None,
+        "server_stats": server_stats,
+    }
+    if stages is not None:
+        report["stages"] = {
+            "decode_ms": percentiles(stages["decode_ms"]),
+            "inference_batch_ms": percentiles(stages["inference_batch_ms"]),
+            "batch_size_mean": float(np.mean(stages["batch_sizes"])) if stages["batch_sizes"] else None,
+            "postprocess_ms": percentiles(stages["postprocess_ms"]),
+        }
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", default=None, help="benchmark a running server instead of in-process")
+    parser.add_argument("--server-pid", type=int, default=None,
+                        help="pid of the --url server, for CPU and RSS figures")
+    parser.add_argument("--model", default="stub", help="'stub' or a weights file (in-process only)")
+    parser.add_argument("--stub-batch-ms", type=float, default=20.0)
+    parser.add_argument("--stub-image-ms", type=float, default=5.0)
+    parser.add_argument("--images", default=os.path.join(os.path.dirname(ROOT_DIR), "CollectedImages"))
+    parser.add_argument("--max-images", type=int, default=0)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--rate", type=float, default=0.0, help="requests/sec (open loop); 0 = closed loop")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--duration", type=float, default=0.0, help="seconds; overrides --requests")
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--use-cache", action="store_true", help="keep the result cache on (in-process)")
+    parser.add_argument("--output", default=None, help="write the JSON report here as well")
+    args = parser.parse_args()
+
+    # Client-side request logs would land in the app log in-process
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    report = asyncio.run(run(args))
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
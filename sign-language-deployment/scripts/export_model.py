@@ -0,0 +1,77 @@
+"""
+Exports best.pt to ONNX or TorchScript once, checks the exported graph
+against eager PyTorch on sample images and reports latency of both. The
+check is recorded next to the graph, which the API then serves without
+repeating it.
+
+Usage:
+    python scripts/export_model.py --format onnx
+    python scripts/export_model.py --format torchscript --images test.jpg test1.jpg
+"""
+import argparse
+import json
+import os
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+YOLOV5_DIR = os.path.join(ROOT_DIR, "yolov5")
+
+if ROOT_DIR not in sys.path:
+    sys.path.append(ROOT_DIR)
+
+from app.backends import (
+    EagerBackend,
+    OnnxBackend,
+    TorchScriptBackend,
+    export_model,
+    exported_path_for,
+    load_validation_images,
+    median_latency_ms,
+    validate_export,
+)
+from app.constant import (
+    LOCAL_MODEL_PATH,
+    EXPORT_VALIDATION_BOX_ATOL,
+    EXPORT_VALIDATION_CONF_ATOL,
+    EXPORT_VALIDATION_IMAGES,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--weights", default=os.path.join(ROOT_DIR, LOCAL_MODEL_PATH))
+    parser.add_argument("--format", choices=["onnx", "torchscript"], default="onnx")
+    parser.add_argument("--images", nargs="+", default=[
+        os.path.join(ROOT_DIR, name) for name in EXPORT_VALIDATION_IMAGES
+    ])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--box-atol", type=float, default=EXPORT_VALIDATION_BOX_ATOL)
+    parser.add_argument("--conf-atol", type=float, default=EXPORT_VALIDATION_CONF_ATOL)
+    args = parser.parse_args()
+
+    images = load_validation_images(args.images)
+
+    output_path = exported_path_for(args.weights, args.format)
+    export_model(args.weights, args.format, YOLOV5_DIR, output_path=output_path)
+
+    if args.format == "onnx":
+        exported = OnnxBackend(output_path)
+    else:
+        exported = TorchScriptBackend(output_path)
+
+    report = validate_export(
+        args.weights, output_path, exported, YOLOV5_DIR, images,
+        args.box_atol, args.conf_atol, force=True,
+    )
+    report["exported_path"] = output_path
+    eager = EagerBackend(args.weights, YOLOV5_DIR)
+    report["eager_p50_ms"] = median_latency_ms(eager, images, args.runs)
+    report[f"{args.format}_p50_ms"] = median_latency_ms(exported, images, args.runs)
+
+    print(json.dumps(report, indent=2))
+    if not report["passed"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
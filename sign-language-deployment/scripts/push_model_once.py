@@ -1,10 +1,17 @@
-import boto3
+import os
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+if ROOT_DIR not in sys.path:
+    sys.path.append(ROOT_DIR)
+
+from app.s3_operations import S3Operation
 
 BUCKET = "sign-lang-2026-vivek"
 KEY = "models/sign_language/latest/best.pt"
 FILE = "artifacts/best.pt"
 
-s3 = boto3.client("s3")
-s3.upload_file(FILE, BUCKET, KEY)
+S3Operation().upload_file(FILE, BUCKET, KEY)
 
 print("UPLOAD SUCCESSFUL")
@@ -0,0 +1,100 @@
+"""
+Builds the INT8 variant of best.pt and reports its accuracy and latency
+against the FP32 ONNX graph on the validation split from data.yaml. Static
+calibration uses a held-out part of the split; mAP is measured on the rest.
+
+Usage:
+    python scripts/quantize_model.py --mode static --dataset-root /data/sign_language.v4i.yolov5pytorch
+    python scripts/quantize_model.py --mode dynamic --push
+"""
+import argparse
+import json
+import os
+import sys
+
+import cv2
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+YOLOV5_DIR = os.path.join(ROOT_DIR, "yolov5")
+PROJECT_DIR = os.path.dirname(ROOT_DIR)
+
+# app.quantization resolves data.yaml splits with the training package
+for path in (ROOT_DIR, PROJECT_DIR):
+    if path not in sys.path:
+        sys.path.append(path)
+
+from app.backends import OnnxBackend, export_model, exported_path_for, median_latency_ms
+from app.constant import LOCAL_MODEL_PATH, LOCAL_QUANTIZED_MODEL_PATH
+from app.model_pusher import ModelPusher
+from app.quantization import (
+    evaluate_map50,
+    list_images,
+    quantize_model,
+    split_calibration,
+    validation_split,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--weights", default=os.path.join(ROOT_DIR, LOCAL_MODEL_PATH))
+    parser.add_argument("--output", default=os.path.join(ROOT_DIR, LOCAL_QUANTIZED_MODEL_PATH))
+    parser.add_argument("--mode", choices=["static", "dynamic"], default="static")
+    parser.add_argument("--data", default=os.path.join(PROJECT_DIR, "data.yaml"))
+    parser.add_argument("--dataset-root", default=None,
+                        help="overrides the machine specific 'path' in data.yaml")
+    parser.add_argument("--push", action="store_true",
+                        help="upload best.pt and the INT8 model with ModelPusher")
+    args = parser.parse_args()
+
+    image_dir, label_dir = validation_split(args.data, args.dataset_root)
+    images = list_images(image_dir)
+    if not images:
+        raise FileNotFoundError(f"No validation images found in {image_dir}")
+
+    calibration = []
+    if args.mode == "static":
+        calibration, images = split_calibration(images)
+        if not calibration:
+            raise ValueError(f"Static mode needs at least two validation images in {image_dir}")
+
+    fp32_path = exported_path_for(args.weights, "onnx")
+    if not os.path.exists(fp32_path):
+        export_model(args.weights, "onnx", YOLOV5_DIR, output_path=fp32_path)
+
+    quantize_model(fp32_path, args.output, mode=args.mode, calibration_images=calibration)
+
+    fp32 = OnnxBackend(fp32_path)
+    int8 = OnnxBackend(args.output)
+
+    fp32_map = evaluate_map50(fp32, images, label_dir)
+    int8_map = evaluate_map50(int8, images, label_dir)
+    decoded = [image for image in map(cv2.imread, images) if image is not None]
+    fp32_ms = median_latency_ms(fp32, decoded)
+    int8_ms = median_latency_ms(int8, decoded)
+
+    report = {
+        "mode": args.mode,
+        "calibration_images": len(calibration),
+        "evaluation_images": len(images),
+        "fp32_map50": fp32_map,
+        "int8_map50": int8_map,
+        "map50_delta": int8_map - fp32_map,
+        "fp32_p50_ms": fp32_ms,
+        "int8_p50_ms": int8_ms,
+        "speedup": fp32_ms / int8_ms if int8_ms else 0.0,
+        "fp32_size_mb": os.path.getsize(fp32_path) / 2**20,
+        "int8_size_mb": os.path.getsize(args.output) / 2**20,
+    }
+
+    report_path = os.path.splitext(args.output)[0] + "-report.json"
+    with open(report_path, "w") as f:
+        json.dump(report, f, indent=2)
+    print(json.dumps(report, indent=2))
+
+    if args.push:
+        ModelPusher(args.weights, quantized_model_path=args.output).push()
+
+
+if __name__ == "__main__":
+    main()
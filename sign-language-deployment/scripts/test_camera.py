@@ -1,10 +1,16 @@
 import cv2
 import torch
 import os
+import sys
 
 ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 YOLOV5_DIR = os.path.join(ROOT_DIR, "yolov5")
 
+if ROOT_DIR not in sys.path:
+    sys.path.append(ROOT_DIR)
+
+from app.postprocess import best_detection
+
 model = torch.hub.load(
     YOLOV5_DIR,
     "custom",
@@ -25,15 +31,13 @@ while True:
         break
 
     results = model(frame)
-    df = results.pandas().xyxy[0]
-
-    if not df.empty:
-        best = df.sort_values("confidence", ascending=False).iloc[0]
+    best = best_detection(results.xyxy[0])
 
-        label = best["name"]
-        conf = round(float(best["confidence"]), 2)
+    if best is not None:
+        label = model.names[int(best[5])]
+        conf = round(float(best[4]), 2)
 
-        x1, y1, x2, y2 = map(int, [best["xmin"], best["ymin"], best["xmax"], best["ymax"]])
+        x1, y1, x2, y2 = map(int, best[:4])
 
         cv2.rectangle(frame, (x1, y1), (x2, y2), (0,255,0), 2)
         cv2.putText(frame, f"{label} {conf}", (x1, y1-10),
@@ -0,0 +1,95 @@
+"""
+Replays a directory of images against the /ws/predict WebSocket endpoint
+at a fixed frame rate and prints per-frame results and a latency summary.
+
+Usage:
+    python scripts/ws_client.py --images ../CollectedImages --fps 15
+"""
+import argparse
+import asyncio
+import glob
+import json
+import os
+import time
+
+import websockets
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png")
+
+
+def list_images(image_dir: str):
+    paths = [
+        path
+        for path in glob.glob(os.path.join(image_dir, "**", "*"), recursive=True)
+        if path.lower().endswith(IMAGE_EXTENSIONS)
+    ]
+    if not paths:
+        raise FileNotFoundError(f"No images found under {image_dir}")
+    return sorted(paths)
+
+
+def percentile(values, pct: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    index = min(len(values) - 1, int(round(pct / 100.0 * (len(values) - 1))))
+    return values[index]
+
+
+async def replay(url: str, paths, fps: float, loops: int, verbose: bool):
+    frames = [open(path, "rb").read() for path in paths] * loops
+    interval = 1.0 / fps
+    sent_at = {}
+    round_trips = []
+    last = {}
+
+    async with websockets.connect(url, max_size=None) as ws:
+
+        async def send():
+            next_tick = time.perf_counter()
+            for seq, data in enumerate(frames):
+                sent_at[seq] = time.perf_counter()
+                await ws.send(data)
+                next_tick += interval
+                await asyncio.sleep(max(0.0, next_tick - time.perf_counter()))
+
+        async def receive():
+            async for message in ws:
+                result = json.loads(message)
+                if "frame" in result:
+                    round_trips.append(
+                        (time.perf_counter() - sent_at[result["frame"]]) * 1000.0
+                    )
+                last.update(result)
+                if verbose:
+                    print(result)
+
+        receiver = asyncio.create_task(receive())
+        await send()
+        # Give the last frame time to come back before closing
+        await asyncio.sleep(1.0)
+        receiver.cancel()
+
+    print(f"Sent frames      : {len(frames)} at {fps} FPS")
+    print(f"Results received : {len(round_trips)}")
+    print(f"Dropped (server) : {last.get('dropped', 0)}")
+    print(f"Round trip p50   : {percentile(round_trips, 50):.1f} ms")
+    print(f"Round trip p95   : {percentile(round_trips, 95):.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", default="ws://localhost:8000/ws/predict")
+    parser.add_argument("--images", default=os.path.join("..", "CollectedImages"))
+    parser.add_argument("--fps", type=float, default=15.0)
+    parser.add_argument("--loops", type=int, default=1)
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    asyncio.run(
+        replay(args.url, list_images(args.images), args.fps, args.loops, args.verbose)
+    )
+
+
+if __name__ == "__main__":
+    main()
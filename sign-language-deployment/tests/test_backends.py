@@ -0,0 +1,107 @@
+import os
+import time
+
+import numpy as np
+import pytest
+
+pytest.importorskip("cv2")
+
+from app import backends
+
+
+class FakeBackend:
+    def __init__(self, name, detections):
+        self.name = name
+        self.detections = detections
+
+    def predict(self, images):
+        return [self.detections for _ in images]
+
+
+def make_export(tmp_path):
+    weights_path = tmp_path / "best.pt"
+    model_path = tmp_path / "best.onnx"
+    weights_path.write_bytes(b"weights")
+    model_path.write_bytes(b"graph")
+    return str(weights_path), str(model_path)
+
+
+def test_validate_export_records_and_reuses_report(tmp_path, monkeypatch):
+    weights_path, model_path = make_export(tmp_path)
+    det = np.array([[10, 10, 50, 50, 0.9, 2]], dtype=np.float32)
+    eager_loads = []
+
+    def fake_eager(*args):
+        eager_loads.append(args)
+        return FakeBackend("eager", det)
+
+    monkeypatch.setattr(backends, "EagerBackend", fake_eager)
+    images = [np.zeros((64, 64, 3), np.uint8)]
+
+    report = backends.validate_export(
+        weights_path, model_path, FakeBackend("onnx", det + [1, 0, 0, 0, 0, 0]), "yolov5", images
+    )
+    assert report["passed"]
+    assert (tmp_path / ("best.onnx" + backends.VALIDATION_SUFFIX)).exists()
+
+    again = backends.validate_export(weights_path, model_path, None, "yolov5", images)
+    assert again == report
+    assert len(eager_loads) == 1
+
+
+def test_validate_export_fails_on_label_mismatch(tmp_path, monkeypatch):
+    weights_path, model_path = make_export(tmp_path)
+    det = np.array([[10, 10, 50, 50, 0.9, 2]], dtype=np.float32)
+    monkeypatch.setattr(backends, "EagerBackend", lambda *args: FakeBackend("eager", det))
+
+    report = backends.validate_export(
+        weights_path, model_path, FakeBackend("onnx", det + [0, 0, 0, 0, 0, 1]),
+        "yolov5", [np.zeros((64, 64, 3), np.uint8)]
+    )
+    assert not report["passed"]
+    assert report["label_mismatches"] == 1
+
+
+def test_concurrent_loads_export_and_validate_once(tmp_path, monkeypatch):
+    multiprocessing = pytest.importorskip("multiprocessing")
+    if "fork" not in multiprocessing.get_all_start_methods():
+        pytest.skip("needs fork to share the patched backends")
+
+    weights_path = tmp_path / "best.pt"
+    weights_path.write_bytes(b"weights")
+    exports = tmp_path / "exports.log"
+    det = np.array([[10, 10, 50, 50, 0.9, 2]], dtype=np.float32)
+
+    def fake_export(weights, fmt, yolov5_dir, output_path):
+        with open(exports, "a") as log:
+            log.write("export\n")
+        with open(output_path, "wb") as f:
+            for _ in range(20):
+                f.write(b"x" * 1024)
+                f.flush()
+                time.sleep(0.005)
+        return output_path
+
+    class FakeOnnx(FakeBackend):
+        def __init__(self, model_path, **kwargs):
+            assert os.path.getsize(model_path) == 20 * 1024, "read a half-written export"
+            super().__init__("onnx", det)
+
+    monkeypatch.setattr(backends, "export_model", fake_export)
+    monkeypatch.setattr(backends, "OnnxBackend", FakeOnnx)
+    monkeypatch.setattr(backends, "EagerBackend", lambda *args: FakeBackend("eager", det))
+    monkeypatch.setattr(backends, "load_validation_images", lambda: [np.zeros((8, 8, 3), np.uint8)])
+
+    context = multiprocessing.get_context("fork")
+    workers = [
+        context.Process(target=backends.load_backend, args=("onnx", str(weights_path), "yolov5"))
+        for _ in range(4)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    assert [worker.exitcode for worker in workers] == [0, 0, 0, 0]
+    assert exports.read_text() == "export\n"
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
@@ -0,0 +1,44 @@
+import os
+import sys
+
+import pytest
+
+pq = pytest.importorskip("pyarrow.parquet")
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts"))
+
+from batch_predict import JOURNAL_SUFFIX, ParquetWriter
+
+
+def record(i):
+    return {
+        "source": f"img-{i}.jpg", "width": 64, "height": 48, "label": "Hello", "confidence": 0.9,
+        "detections": [{
+            "label": "Hello", "confidence": 0.9,
+            "bbox": {"xmin": 1.0, "ymin": 2.0, "xmax": 3.0, "ymax": 4.0},
+        }],
+        "error": None,
+    }
+
+
+def test_flushed_row_groups_survive_a_hard_kill(tmp_path):
+    writer = ParquetWriter(str(tmp_path), rows_per_file=100, rows_per_group=4)
+    writer.write([record(i) for i in range(10)])
+    # Killed here: two row groups flushed, two rows still buffered, no footer
+    assert any(name.endswith(JOURNAL_SUFFIX) for name in os.listdir(tmp_path))
+
+    resumed = ParquetWriter(str(tmp_path), rows_per_file=100, rows_per_group=4)
+    assert resumed.done_sources() == {f"img-{i}.jpg" for i in range(8)}
+    assert not any(name.endswith((".tmp", JOURNAL_SUFFIX)) for name in os.listdir(tmp_path))
+
+    resumed.write([record(i) for i in range(8, 10)])
+    resumed.close()
+    assert ParquetWriter(str(tmp_path), 100, 4).done_sources() == {f"img-{i}.jpg" for i in range(10)}
+
+
+def test_parts_split_at_rows_per_file(tmp_path):
+    writer = ParquetWriter(str(tmp_path), rows_per_file=5, rows_per_group=2)
+    writer.write([record(i) for i in range(12)])
+    writer.close()
+
+    assert [pq.read_metadata(os.path.join(tmp_path, name)).num_rows for name in writer.parts] == [5, 5, 2]
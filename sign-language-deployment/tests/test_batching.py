@@ -0,0 +1,122 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.batching import BatchScheduler
+
+
+class RecordingInfer:
+    """
+    infer_fn that records each batch and echoes its inputs doubled;
+    optionally blocks until released, to let a queue build up
+    """
+
+    def __init__(self, release: threading.Event = None):
+        self.batches = []
+        self.release = release
+
+    def __call__(self, items):
+        if self.release is not None:
+            self.release.wait(5)
+        self.batches.append(list(items))
+        return [item * 2 for item in items]
+
+
+def run_with(scheduler, main):
+    async def wrapper():
+        await scheduler.start()
+        try:
+            return await main()
+        finally:
+            await scheduler.stop()
+    return asyncio.run(wrapper())
+
+
+def test_full_batch_flushes_before_the_wait_expires():
+    infer = RecordingInfer()
+    scheduler = BatchScheduler(infer, max_batch_size=4, max_wait_ms=5000)
+
+    async def main():
+        start = time.perf_counter()
+        results = await asyncio.gather(*(scheduler.submit(i) for i in range(4)))
+        return results, time.perf_counter() - start
+
+    results, elapsed = run_with(scheduler, main)
+
+    assert results == [0, 2, 4, 6]
+    assert infer.batches == [[0, 1, 2, 3]]
+    assert elapsed < 1
+
+
+def test_partial_batch_flushes_after_max_wait():
+    infer = RecordingInfer()
+    scheduler = BatchScheduler(infer, max_batch_size=8, max_wait_ms=50)
+
+    async def main():
+        start = time.perf_counter()
+        results = await asyncio.gather(*(scheduler.submit(i) for i in range(3)))
+        return results, time.perf_counter() - start
+
+    results, elapsed = run_with(scheduler, main)
+
+    assert results == [0, 2, 4]
+    assert infer.batches == [[0, 1, 2]]
+    assert 0.04 <= elapsed < 1
+    assert scheduler.metrics.snapshot()["batch_size_distribution"] == {"3": 1}
+
+
+def test_each_caller_gets_its_own_result_across_batches():
+    release = threading.Event()
+    infer = RecordingInfer(release)
+    scheduler = BatchScheduler(infer, max_batch_size=3, max_wait_ms=20)
+
+    async def main():
+        tasks = [asyncio.create_task(scheduler.submit(i)) for i in range(7)]
+        # The first batch blocks in the executor while the rest queue up
+        await asyncio.sleep(0.1)
+        release.set()
+        return await asyncio.gather(*tasks)
+
+    results = run_with(scheduler, main)
+
+    assert results == [i * 2 for i in range(7)]
+    assert [len(batch) for batch in infer.batches] == [3, 3, 1]
+    assert sorted(i for batch in infer.batches for i in batch) == list(range(7))
+
+
+def test_inference_error_reaches_every_caller_in_the_batch():
+    def failing(items):
+        raise ValueError(f"bad batch of {len(items)}")
+
+    scheduler = BatchScheduler(failing, max_batch_size=2, max_wait_ms=1000)
+
+    async def main():
+        return await asyncio.gather(
+            scheduler.submit("a"), scheduler.submit("b"), return_exceptions=True
+        )
+
+    errors = run_with(scheduler, main)
+
+    assert [type(e) for e in errors] == [ValueError, ValueError]
+    assert all(str(e) == "bad batch of 2" for e in errors)
+
+
+def test_scheduler_keeps_serving_after_a_failed_batch():
+    calls = []
+
+    def flaky(items):
+        calls.append(items)
+        if len(calls) == 1:
+            raise RuntimeError("boom")
+        return items
+
+    scheduler = BatchScheduler(flaky, max_batch_size=1, max_wait_ms=1)
+
+    async def main():
+        with pytest.raises(RuntimeError):
+            await scheduler.submit(1)
+        return await scheduler.submit(2)
+
+    assert run_with(scheduler, main) == 2
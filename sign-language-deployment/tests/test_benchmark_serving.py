@@ -0,0 +1,44 @@
+import json
+import os
+import subprocess
+import sys
+
+import cv2
+import numpy as np
+import pytest
+
+pytest.importorskip("httpx")
+pytest.importorskip("psutil")
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRIPT = os.path.join(ROOT_DIR, "scripts", "benchmark_serving.py")
+
+
+def test_stub_benchmark_reports_every_request(tmp_path):
+    # The script sets environment variables before importing the app, so it
+    # runs in its own process rather than next to the app the tests import
+    images = tmp_path / "images"
+    images.mkdir()
+    for i in range(3):
+        _, jpeg = cv2.imencode(".jpg", np.full((32, 32, 3), 40 * i, np.uint8))
+        (images / f"{i}.jpg").write_bytes(jpeg.tobytes())
+    output = tmp_path / "bench.json"
+
+    subprocess.run(
+        [
+            sys.executable, SCRIPT, "--model", "stub",
+            "--images", str(images), "--requests", "12", "--concurrency", "3",
+            "--warmup", "2", "--stub-batch-ms", "1", "--stub-image-ms", "1",
+            "--output", str(output),
+        ],
+        cwd=ROOT_DIR, check=True, capture_output=True, timeout=120,
+    )
+
+    with open(output) as f:
+        report = json.load(f)
+    assert report["config"]["mode"] == "in-process"
+    assert (report["requests"], report["succeeded"]) == (12, 12)
+    assert report["status_codes"] == {"200": 12}
+    assert report["latency_ms"]["count"] == 12
+    assert report["stages"]["batch_size_mean"] >= 1
+    assert report["server_stats"]
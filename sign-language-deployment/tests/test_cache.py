@@ -0,0 +1,109 @@
+import cv2
+import numpy as np
+import pytest
+
+from app import cache as cache_module
+from app.cache import ResultCache, make_cache_key
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(cache_module.time, "monotonic", clock)
+    return clock
+
+
+def test_key_changes_with_anything_that_changes_the_result():
+    base = make_cache_key(b"jpeg", "v1", 0.25, 0.45, 10)
+
+    assert make_cache_key(b"jpeg", "v1", 0.25, 0.45, 10) == base
+    assert len({
+        base,
+        make_cache_key(b"jpeg2", "v1", 0.25, 0.45, 10),
+        make_cache_key(b"jpeg", "v2", 0.25, 0.45, 10),
+        make_cache_key(b"jpeg", "v1", 0.3, 0.45, 10),
+        make_cache_key(b"jpeg", "v1", 0.25, 0.5, 10),
+        make_cache_key(b"jpeg", "v1", 0.25, 0.45, 5),
+    }) == 6
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    cache = ResultCache(max_entries=2, ttl=60)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+    assert cache.evictions == 1
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = ResultCache(max_entries=10, ttl=5)
+    cache.put("a", 1)
+
+    clock.now += 4.9
+    assert cache.get("a") == 1
+    clock.now += 0.2
+    assert cache.get("a") is None
+
+    snapshot = cache.snapshot()
+    assert (snapshot["hits"], snapshot["misses"], snapshot["expirations"]) == (1, 1, 1)
+    assert snapshot["entries"] == 0
+
+
+def test_zero_entries_disables_the_cache():
+    cache = ResultCache(max_entries=0)
+    cache.put("a", 1)
+    assert cache.get("a") is None
+
+
+def test_predict_serves_repeats_from_the_cache_until_the_model_changes(monkeypatch):
+    pytest.importorskip("httpx")
+    from fastapi.testclient import TestClient
+
+    from app import app as served
+    from app.model_manager import LoadedModel
+
+    class CountingBackend:
+        name = "fake"
+        names = ["Hello"]
+        conf = iou = 0.5
+        max_det = 10
+        calls = 0
+
+        def predict(self, images):
+            CountingBackend.calls += len(images)
+            return [np.array([[1, 2, 3, 4, 0.9, 0]], dtype=np.float32) for _ in images]
+
+    backend = CountingBackend()
+    monkeypatch.setattr(
+        served.manager, "current",
+        LoadedModel(backend=backend, etag="e1", version="cache-test-v1", info={}),
+    )
+    _, jpeg = cv2.imencode(".jpg", np.full((32, 32, 3), 7, np.uint8))
+    upload = {"file": ("a.jpg", jpeg.tobytes(), "image/jpeg")}
+
+    with TestClient(served.app) as client:
+        CountingBackend.calls = 0
+        first = client.post("/predict", files=upload).json()
+        second = client.post("/predict", files=upload).json()
+        assert first == second
+        assert CountingBackend.calls == 1
+
+        monkeypatch.setattr(
+            served.manager, "current",
+            LoadedModel(backend=backend, etag="e2", version="cache-test-v2", info={}),
+        )
+        client.post("/predict", files=upload)
+        assert CountingBackend.calls == 2
@@ -0,0 +1,56 @@
+import asyncio
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from app.batching import BatchScheduler
+from app.logger import request_id_var
+from app.workers import WorkerPool
+from app.json_logging import JsonFormatter
+
+
+def current_request_id(*_):
+    return request_id_var.get()
+
+
+def test_worker_pool_threads_see_request_id():
+    async def main():
+        pool = WorkerPool(kind="thread", max_workers=2)
+        pool.start()
+        try:
+            request_id_var.set("req-1")
+            return await pool.run(current_request_id)
+        finally:
+            pool.shutdown()
+
+    assert asyncio.run(main()) == "req-1"
+
+
+def test_single_request_batch_sees_request_id():
+    async def main():
+        scheduler = BatchScheduler(
+            lambda items: [request_id_var.get() for _ in items],
+            max_batch_size=4,
+            max_wait_ms=1,
+            executor=ThreadPoolExecutor(max_workers=1),
+        )
+        await scheduler.start()
+        try:
+            request_id_var.set("req-2")
+            return await scheduler.submit("frame")
+        finally:
+            await scheduler.stop()
+
+    assert asyncio.run(main()) == "req-2"
+
+
+def test_json_formatter_keeps_extra_fields():
+    record = logging.LogRecord("sign-language", logging.INFO, __file__, 1, "done", (), None)
+    record.request_id = "req-3"
+    record.stage = None
+
+    entry = json.loads(JsonFormatter().format(record))
+
+    assert entry["message"] == "done"
+    assert entry["request_id"] == "req-3"
+    assert "stage" not in entry
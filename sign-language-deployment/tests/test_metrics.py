@@ -0,0 +1,104 @@
+import cv2
+import numpy as np
+import pytest
+
+pytest.importorskip("httpx")
+
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+from app.metrics import MetricsMiddleware, StageTimer
+
+
+def request_count(method, route, status):
+    return REGISTRY.get_sample_value(
+        "sign_request_latency_seconds_count",
+        {"method": method, "route": route, "status": status},
+    ) or 0.0
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+
+    @app.get("/items/{item_id}")
+    def item(item_id: int):
+        return {"id": item_id}
+
+    @app.get("/stream")
+    def stream():
+        return StreamingResponse(iter([b"a", b"b"]))
+
+    return TestClient(app)
+
+
+def test_requests_are_labelled_with_the_route_template(client):
+    before = request_count("GET", "/items/{item_id}", "200")
+
+    for item_id in range(5):
+        assert client.get(f"/items/{item_id}").status_code == 200
+
+    assert request_count("GET", "/items/{item_id}", "200") == before + 5
+    assert request_count("GET", "/items/3", "200") == 0
+
+
+def test_unmatched_and_failed_requests_keep_cardinality_bounded(client):
+    unmatched = request_count("GET", "unmatched", "404")
+    invalid = request_count("GET", "/items/{item_id}", "422")
+
+    client.get("/no/such/path")
+    client.get("/another/missing/path")
+    client.get("/items/not-a-number")
+
+    assert request_count("GET", "unmatched", "404") == unmatched + 2
+    assert request_count("GET", "/items/{item_id}", "422") == invalid + 1
+
+
+def test_streaming_response_is_observed_once(client):
+    before = request_count("GET", "/stream", "200")
+    assert client.get("/stream").content == b"ab"
+    assert request_count("GET", "/stream", "200") == before + 1
+
+
+def test_stage_timer_renders_server_timing():
+    timer = StageTimer()
+    with timer("decode"):
+        pass
+    with timer("inference"):
+        pass
+
+    header = timer.header()
+    assert [part.split(";")[0] for part in header.split(", ")] == ["decode", "inference", "total"]
+    assert set(timer.as_ms()) == {"decode", "inference"}
+
+
+def test_predict_is_exported_on_metrics(monkeypatch):
+    from app import app as served
+    from app.model_manager import LoadedModel
+
+    class FakeBackend:
+        name = "fake"
+        names = ["Thanks"]
+        conf = iou = 0.5
+        max_det = 10
+
+        def predict(self, images):
+            return [np.array([[1, 2, 3, 4, 0.9, 0]], dtype=np.float32) for _ in images]
+
+    monkeypatch.setattr(
+        served.manager, "current",
+        LoadedModel(backend=FakeBackend(), etag="m", version="metrics-test", info={}),
+    )
+    monkeypatch.setattr(served, "METRICS_TIMING_HEADER", True)
+    _, jpeg = cv2.imencode(".jpg", np.full((32, 32, 3), 42, np.uint8))
+
+    with TestClient(served.app) as client:
+        response = client.post("/predict", files={"file": ("a.jpg", jpeg.tobytes(), "image/jpeg")})
+        body = client.get("/metrics").text
+
+    assert "total;dur=" in response.headers["Server-Timing"]
+    assert 'sign_predictions_total{label="Thanks"}' in body
+    assert 'route="/predict"' in body
@@ -0,0 +1,125 @@
+import os
+import time
+
+import pytest
+
+from app.model_cache import STALE_PARTIAL_AGE_S, ModelCache
+
+BUCKET = "sign-test"
+KEY = "weights/best.pt"
+
+
+class FakeS3:
+    """
+    Stands in for S3Operation: one object whose body and ETag the test
+    changes, with every HEAD and download recorded
+    """
+
+    def __init__(self, body: bytes, etag: str):
+        self.body = body
+        self.etag = etag
+        self.heads = 0
+        self.downloads = []
+        self.fail_head = False
+
+    def head_object(self, bucket_name, object_name):
+        self.heads += 1
+        if self.fail_head:
+            raise ConnectionError("S3 unreachable")
+        return {"ETag": f'"{self.etag}"', "ContentLength": len(self.body)}
+
+    def download_file(self, bucket_name, object_name, file_path):
+        self.downloads.append(file_path)
+        with open(file_path, "wb") as f:
+            f.write(self.body)
+
+
+def age(path, seconds):
+    past = time.time() - seconds
+    os.utime(path, (past, past))
+
+
+@pytest.fixture
+def s3():
+    return FakeS3(b"weights-v1", "etag-1")
+
+
+def test_unchanged_etag_is_a_cache_hit(tmp_path, s3):
+    cache = ModelCache(str(tmp_path), s3=s3)
+
+    path, version, downloaded = cache.fetch(BUCKET, KEY)
+    assert (version, downloaded) == ("etag1", True)
+    assert os.path.basename(path) == "best-etag1.pt"
+
+    assert cache.fetch(BUCKET, KEY) == (path, version, False)
+    assert len(s3.downloads) == 1
+
+
+def test_changed_etag_or_truncated_file_is_a_miss(tmp_path, s3):
+    cache = ModelCache(str(tmp_path), s3=s3)
+    first, _, _ = cache.fetch(BUCKET, KEY)
+
+    with open(first, "wb") as f:
+        f.write(b"trunc")
+    assert cache.fetch(BUCKET, KEY)[2] is True
+
+    s3.body, s3.etag = b"weights-v2!", "etag-2"
+    path, version, downloaded = cache.fetch(BUCKET, KEY)
+    assert (version, downloaded) == ("etag2", True)
+    with open(path, "rb") as f:
+        assert f.read() == b"weights-v2!"
+
+
+def test_falls_back_to_the_newest_cached_version_when_s3_is_down(tmp_path, s3):
+    cache = ModelCache(str(tmp_path), s3=s3)
+    path, version, _ = cache.fetch(BUCKET, KEY)
+
+    s3.fail_head = True
+    assert cache.fetch(BUCKET, KEY) == (path, version, False)
+
+    with pytest.raises(ConnectionError):
+        ModelCache(str(tmp_path / "empty"), s3=s3).fetch(BUCKET, KEY)
+
+
+def test_gc_keeps_newest_versions_with_their_exports(tmp_path, s3):
+    cache = ModelCache(str(tmp_path), keep_versions=2, s3=s3)
+    for i, seconds_ago in ((1, 300), (2, 200), (3, 0)):
+        s3.body, s3.etag = f"weights-v{i}".encode(), f"etag-{i}"
+        path, _, _ = cache.fetch(BUCKET, KEY)
+        # Exported sibling written next to the weights by the backend
+        export = os.path.splitext(path)[0] + ".onnx"
+        open(export, "wb").close()
+        age(path, seconds_ago)
+        age(export, seconds_ago)
+
+    cache.collect_garbage(KEY, keep=path)
+
+    assert sorted(os.listdir(tmp_path)) == [
+        "best-etag2.onnx", "best-etag2.pt", "best-etag3.onnx", "best-etag3.pt",
+    ]
+
+
+def test_gc_never_removes_the_version_in_use(tmp_path, s3):
+    cache = ModelCache(str(tmp_path), keep_versions=1, s3=s3)
+    path, _, _ = cache.fetch(BUCKET, KEY)
+    # Older than a newer, unrelated download that was left behind
+    age(path, 100)
+    open(tmp_path / "best-etagnewer.pt", "wb").close()
+
+    cache.collect_garbage(KEY, keep=path)
+
+    assert os.listdir(tmp_path) == ["best-etag1.pt"]
+
+
+def test_gc_removes_only_stale_partial_downloads(tmp_path, s3):
+    cache = ModelCache(str(tmp_path), s3=s3)
+    stale = tmp_path / "best-etag9.pt.part"
+    fresh = tmp_path / "best-etag8.pt.part"
+    stale.write_bytes(b"x")
+    fresh.write_bytes(b"x")
+    age(stale, STALE_PARTIAL_AGE_S + 60)
+
+    cache.fetch(BUCKET, KEY)
+
+    assert not stale.exists()
+    assert fresh.exists()
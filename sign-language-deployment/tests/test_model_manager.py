@@ -0,0 +1,155 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import numpy as np
+import pytest
+
+from app import model_manager
+from app.model_cache import ModelCache
+from app.model_manager import LoadedModel, ModelManager
+
+
+class GatedBackend:
+    """
+    Labels every detection with its version's class name; predict blocks
+    while the gate is closed, to hold requests in flight
+    """
+    conf = iou = 0.5
+    max_det = 10
+
+    def __init__(self, version: str):
+        self.name = "fake"
+        self.names = [version]
+        self.gate = threading.Event()
+        self.gate.set()
+        self.entered = threading.Event()
+        self.calls = 0
+
+    def predict(self, images):
+        self.calls += 1
+        self.entered.set()
+        assert self.gate.wait(5)
+        return [np.array([[1, 2, 3, 4, 0.9, 0]], dtype=np.float32) for _ in images]
+
+
+class FakeS3:
+    def __init__(self):
+        self.etag = "v1"
+
+    def head_object(self, bucket_name, object_name):
+        return {"ETag": f'"{self.etag}"', "ContentLength": len(self.etag)}
+
+    def download_file(self, bucket_name, object_name, file_path):
+        with open(file_path, "w") as f:
+            f.write(self.etag)
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    backends = {}
+
+    def fake_load_backend(kind, model_path, yolov5_dir):
+        with open(model_path) as f:
+            version = f.read()
+        if version == "broken":
+            raise RuntimeError("corrupt weights")
+        backends[version] = GatedBackend(version)
+        return backends[version]
+
+    monkeypatch.setattr(model_manager, "load_backend", fake_load_backend)
+    s3 = FakeS3()
+    swapped = []
+    manager = ModelManager(
+        bucket_name="sign-test",
+        object_name="best.pt",
+        backend_kind="eager",
+        yolov5_dir="",
+        model_cache=ModelCache(str(tmp_path), s3=s3),
+        warmup_size=32,
+        on_swap=swapped.append,
+    )
+    manager.reload(force=True)
+    return manager, s3, backends, swapped
+
+
+def test_reload_swaps_only_when_the_etag_changes(manager):
+    manager, s3, backends, swapped = manager
+
+    assert manager.reload() is False
+    s3.etag = "v2"
+    assert manager.reload() is True
+
+    assert manager.current.version == "fake-v2"
+    assert [loaded.version for loaded in swapped] == ["fake-v1", "fake-v2"]
+    # Warmed up before it was swapped in
+    assert backends["v2"].calls == 1
+
+
+def test_failed_load_keeps_the_current_model_serving(manager):
+    manager, s3, _, _ = manager
+    s3.etag = "broken"
+
+    with pytest.raises(RuntimeError):
+        manager.reload()
+    assert manager.current.version == "fake-v1"
+
+
+def test_in_flight_request_finishes_on_the_model_it_started_with(manager):
+    manager, s3, backends, _ = manager
+    old = backends["v1"]
+    old.gate.clear()
+    old.entered.clear()
+
+    def serve():
+        loaded = manager.current
+        return loaded.version, loaded.backend.predict([None])
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        in_flight = pool.submit(serve)
+        assert old.entered.wait(5)
+
+        s3.etag = "v2"
+        assert manager.reload() is True
+        # New requests get the new model while the old one is still busy
+        assert pool.submit(serve).result(5)[0] == "fake-v2"
+
+        old.gate.set()
+        assert in_flight.result(5)[0] == "fake-v1"
+
+
+def test_predict_requests_span_a_hot_swap(manager, monkeypatch):
+    pytest.importorskip("httpx")
+    from fastapi.testclient import TestClient
+
+    from app import app as served
+
+    manager, s3, backends, _ = manager
+    monkeypatch.setattr(served.manager, "current", manager.current)
+
+    def post(client, seed):
+        image = np.full((32, 32, 3), seed, np.uint8)
+        _, jpeg = cv2.imencode(".jpg", image)
+        return client.post("/predict", files={"file": ("a.jpg", jpeg.tobytes(), "image/jpeg")})
+
+    with TestClient(served.app) as client, ThreadPoolExecutor(max_workers=2) as pool:
+        old = backends["v1"]
+        old.gate.clear()
+        old.entered.clear()
+        first = pool.submit(post, client, 10)
+        assert old.entered.wait(5)
+
+        s3.etag = "v2"
+        manager.reload()
+        monkeypatch.setattr(served.manager, "current", manager.current)
+        second = pool.submit(post, client, 20)
+
+        old.gate.set()
+        assert first.result(5).json()["label"] == "v1"
+        assert second.result(5).json()["label"] == "v2"
+
+
+def test_loaded_model_is_immutable():
+    loaded = LoadedModel(backend=None, etag="e", version="v")
+    with pytest.raises(AttributeError):
+        loaded.version = "other"
@@ -0,0 +1,154 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("cv2")
+
+from app.backends import ExportedBackend, MAX_WH, nms, non_max_suppression
+from app.postprocess import NO_SIGN_LABEL, format_detection, top_detections
+
+NAMES = ["Hello", "IloveYou", "No", "Please", "Thanks", "Yes"]
+
+
+def random_detections(rng, n):
+    xy = rng.uniform(0, 400, size=(n, 2))
+    wh = rng.uniform(5, 200, size=(n, 2))
+    return np.concatenate([
+        xy, xy + wh,
+        rng.uniform(0, 1, size=(n, 1)),
+        rng.integers(0, len(NAMES), size=(n, 1)),
+    ], axis=1).astype(np.float32)
+
+
+def pandas_format_detection(detections, min_confidence=0.005):
+    """
+    The DataFrame path /predict used before: results.pandas().xyxy[0],
+    filtered and sorted by confidence
+    """
+    pd = pytest.importorskip("pandas")
+    df = pd.DataFrame(detections, columns=["xmin", "ymin", "xmax", "ymax", "confidence", "class"])
+    df["name"] = [NAMES[int(c)] for c in df["class"]]
+    df = df[df["confidence"] >= min_confidence]
+    if df.empty:
+        return {"label": NO_SIGN_LABEL, "confidence": 0}
+    best = df.sort_values("confidence", ascending=False).iloc[0]
+    return {
+        "label": best["name"],
+        "confidence": float(best["confidence"]),
+        "bbox": {key: float(best[key]) for key in ("xmin", "ymin", "xmax", "ymax")},
+    }
+
+
+@pytest.mark.parametrize("n", [0, 1, 7, 50])
+def test_format_detection_matches_the_dataframe_path(n):
+    detections = random_detections(np.random.default_rng(n), n)
+    detections[:2, 4] = [0.001, 0.004][:min(n, 2)]
+
+    assert format_detection(detections, NAMES) == pandas_format_detection(detections)
+
+
+def test_top_detections_are_sorted_and_filtered():
+    detections = random_detections(np.random.default_rng(3), 30)
+    top = top_detections(detections, NAMES, k=5, min_confidence=0.2)
+
+    expected = sorted(detections[detections[:, 4] >= 0.2], key=lambda d: -d[4])[:5]
+    assert [d["confidence"] for d in top] == [float(d[4]) for d in expected]
+    assert [d["label"] for d in top] == [NAMES[int(d[5])] for d in expected]
+
+
+def reference_nms(boxes, scores, iou_threshold):
+    """
+    Textbook greedy NMS, one box at a time
+    """
+    def iou(a, b):
+        w = max(0.0, min(a[2], b[2]) - max(a[0], b[0]))
+        h = max(0.0, min(a[3], b[3]) - max(a[1], b[1]))
+        inter = w * h
+        union = (a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1]) - inter
+        return inter / union
+
+    keep = []
+    for i in sorted(range(len(boxes)), key=lambda i: -scores[i]):
+        if all(iou(boxes[i], boxes[j]) <= iou_threshold for j in keep):
+            keep.append(i)
+    return keep
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_nms_matches_greedy_reference(seed):
+    detections = random_detections(np.random.default_rng(seed), 80).astype(np.float64)
+    boxes, scores = detections[:, :4], detections[:, 4]
+
+    assert nms(boxes, scores, 0.45).tolist() == reference_nms(boxes, scores, 0.45)
+
+
+def raw_head_output(rows):
+    """
+    (cx, cy, w, h, objectness, class scores...) rows as the graph emits
+    """
+    return np.array(rows, dtype=np.float32)
+
+
+def test_non_max_suppression_suppresses_within_a_class_only():
+    one_hot = lambda c: [1.0 if i == c else 0.0 for i in range(len(NAMES))]
+    prediction = raw_head_output([
+        [100, 100, 50, 50, 0.9, *one_hot(0)],
+        [102, 101, 50, 50, 0.8, *one_hot(0)],  # overlaps the first, same class
+        [101, 100, 50, 50, 0.7, *one_hot(3)],  # same place, another class
+        [300, 300, 40, 40, 0.1, *one_hot(1)],  # below conf
+    ])
+
+    det = non_max_suppression(prediction, conf=0.25, iou=0.45, max_det=10)
+
+    assert det[:, 5].tolist() == [0, 3]
+    np.testing.assert_allclose(det[0], [75, 75, 125, 125, 0.9, 0], atol=1e-5)
+    assert non_max_suppression(prediction, conf=0.25, iou=0.45, max_det=1).shape == (1, 6)
+
+
+def test_non_max_suppression_matches_torchvision():
+    torch = pytest.importorskip("torch")
+    torchvision = pytest.importorskip("torchvision")
+
+    rng = np.random.default_rng(0)
+    n = 500
+    prediction = np.concatenate([
+        rng.uniform(0, 640, size=(n, 2)), rng.uniform(10, 200, size=(n, 2)),
+        rng.uniform(0, 1, size=(n, 1)), rng.uniform(0, 1, size=(n, len(NAMES))),
+    ], axis=1).astype(np.float32)
+
+    det = non_max_suppression(prediction, conf=0.25, iou=0.45, max_det=300)
+
+    # YOLOv5's utils.general.non_max_suppression for the single-label case
+    x = torch.from_numpy(prediction)
+    x = x[x[:, 4] > 0.25]
+    x[:, 5:] *= x[:, 4:5]
+    conf, j = x[:, 5:].max(1, keepdim=True)
+    box = torch.cat([x[:, :2] - x[:, 2:4] / 2, x[:, :2] + x[:, 2:4] / 2], 1)
+    x = torch.cat((box, conf, j.float()), 1)[conf.view(-1) > 0.25]
+    keep = torchvision.ops.nms(x[:, :4] + x[:, 5:6] * MAX_WH, x[:, 4], 0.45)[:300]
+
+    np.testing.assert_allclose(det, x[keep].numpy(), atol=1e-4)
+
+
+class StubGraph(ExportedBackend):
+    """
+    Returns a fixed head output per image, to check letterbox undoing
+    """
+    name = "stub"
+
+    def __init__(self, output, **kwargs):
+        super().__init__(**kwargs)
+        self.output = output
+
+    def forward(self, batch):
+        return np.stack([self.output] * len(batch))
+
+
+def test_exported_predict_maps_boxes_back_to_the_image():
+    one_hot = [1.0] + [0.0] * (len(NAMES) - 1)
+    # A 640x320 image letterboxes into 640x640 with 160 px of padding on top
+    backend = StubGraph(raw_head_output([[320, 320, 100, 50, 0.9, *one_hot]]), img_size=640)
+
+    [det] = backend.predict([np.zeros((320, 640, 3), np.uint8)])
+
+    np.testing.assert_allclose(det[0, :4], [270, 135, 370, 185], atol=1e-4)
+    assert format_detection(det, NAMES)["label"] == "Hello"
@@ -0,0 +1,65 @@
+import pickle
+
+import boto3
+import cv2
+import numpy as np
+import pytest
+
+moto = pytest.importorskip("moto")
+
+from app.s3_operations import S3Operation
+from app.stages import decode_image
+
+BUCKET = "sign-test"
+
+
+@pytest.fixture
+def s3(monkeypatch):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+    with moto.mock_aws():
+        client = boto3.client("s3", region_name="us-east-1")
+        client.create_bucket(Bucket=BUCKET)
+        yield S3Operation(s3_client=client)
+
+
+def test_read_object_decodes_text(s3):
+    s3.s3_client.put_object(Bucket=BUCKET, Key="labels.txt", Body="héllo\n".encode())
+
+    assert s3.read_object(BUCKET, "labels.txt") == "héllo\n"
+
+
+def test_read_object_raw_is_memoryview(s3):
+    payload = bytes(range(256)) * 4096
+    s3.s3_client.put_object(Bucket=BUCKET, Key="blob.bin", Body=payload)
+
+    data = s3.read_object(BUCKET, "blob.bin", decode=False)
+
+    assert isinstance(data, memoryview)
+    assert data == payload
+    assert pickle.loads(pickle.dumps(bytes(data))) == payload
+
+
+def test_read_object_raw_feeds_decode_image(s3):
+    image = np.full((32, 48, 3), 200, dtype=np.uint8)
+    _, encoded = cv2.imencode(".png", image)
+    s3.s3_client.put_object(Bucket=BUCKET, Key="frame.png", Body=encoded.tobytes())
+
+    decoded = decode_image(s3.read_object(BUCKET, "frame.png", decode=False))
+
+    assert decoded.shape == image.shape
+    assert np.array_equal(decoded, image)
+
+
+def test_download_file_round_trip(s3, tmp_path):
+    payload = np.random.default_rng(0).bytes(3 * 1024 * 1024 + 17)
+    s3.s3_client.put_object(Bucket=BUCKET, Key="model.pt", Body=payload)
+    s3.transfer_config.multipart_chunksize = 1024 * 1024
+
+    target = tmp_path / "model.pt"
+    s3.download_file(BUCKET, "model.pt", str(target))
+
+    assert target.read_bytes() == payload
+    assert not (tmp_path / "model.pt.part").exists()
+    assert not (tmp_path / "model.pt.part.json").exists()
@@ -0,0 +1,138 @@
+import io
+import json
+import os
+
+import cv2
+import numpy as np
+import pytest
+
+pytest.importorskip("httpx")
+
+from fastapi.testclient import TestClient
+
+from app import app as served
+from app.model_manager import LoadedModel
+from app.video import FrameSampler, remove_file, spool_upload
+
+FPS = 10
+FRAMES = 12
+
+
+class FakeBackend:
+    name = "fake"
+    names = ["Hello"]
+    conf = iou = 0.5
+    max_det = 10
+
+    def __init__(self):
+        self.batches = []
+
+    def predict(self, images):
+        self.batches.append(len(images))
+        return [np.array([[1, 2, 3, 4, 0.9, 0]], dtype=np.float32) for _ in images]
+
+
+def write_video(path) -> str:
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"MJPG"), FPS, (64, 48))
+    if not writer.isOpened():
+        pytest.skip("OpenCV has no MJPG writer here")
+    for i in range(FRAMES):
+        # Each frame's brightness encodes its index
+        writer.write(np.full((48, 64, 3), i * 20, np.uint8))
+    writer.release()
+    return str(path)
+
+
+@pytest.fixture
+def video(tmp_path):
+    return write_video(tmp_path / "clip.avi")
+
+
+def test_sampler_reads_every_stride_th_frame_in_batches(video):
+    sampler = FrameSampler(video, stride=5)
+    try:
+        first = sampler.read(2)
+        rest = sampler.read(2)
+        assert sampler.read(2) == []
+    finally:
+        sampler.close()
+
+    sampled = first + rest
+    assert [index for index, _, _ in sampled] == [0, 5, 10]
+    assert [timestamp for _, timestamp, _ in sampled] == [0.0, 500.0, 1000.0]
+    brightness = [int(frame.mean()) for _, _, frame in sampled]
+    assert all(abs(b - index * 20) <= 3 for b, (index, _, _) in zip(brightness, sampled))
+
+
+def test_sampler_rejects_bad_input(tmp_path):
+    with pytest.raises(ValueError):
+        FrameSampler(str(tmp_path / "missing.avi"), stride=1)
+    with pytest.raises(ValueError):
+        FrameSampler(str(tmp_path / "missing.avi"), stride=0)
+
+
+def test_spool_upload_copies_from_the_start(tmp_path):
+    upload = io.BytesIO(b"x" * 10_000)
+    upload.read(100)
+
+    path = spool_upload(upload, chunk_size=1024, suffix=".avi")
+    try:
+        assert path.endswith(".avi")
+        with open(path, "rb") as f:
+            assert f.read() == b"x" * 10_000
+    finally:
+        remove_file(path)
+    remove_file(path)
+    assert not os.path.exists(path)
+
+
+@pytest.fixture
+def client(monkeypatch):
+    backend = FakeBackend()
+    loaded = LoadedModel(backend=backend, etag="test", version="fake-test", info={})
+    monkeypatch.setattr(served.manager, "current", loaded)
+    with TestClient(served.app) as client:
+        yield client, backend
+
+
+def test_predict_video_streams_one_line_per_sampled_frame(client, video, monkeypatch):
+    client, backend = client
+    spooled = []
+    monkeypatch.setattr(
+        served, "spool_upload", lambda *args: spooled.append(spool_upload(*args)) or spooled[-1]
+    )
+
+    with open(video, "rb") as f:
+        response = client.post("/predict-video?stride=4", files={"file": ("clip.avi", f, "video/avi")})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["frame"] for line in lines[:-1]] == [0, 4, 8]
+    assert all(line["label"] == "Hello" for line in lines[:-1])
+    assert lines[-1] == {"done": True, "frames_processed": 3, "stride": 4}
+    # The three sampled frames go through the model as one batch (after
+    # the startup warmup)
+    assert backend.batches[-1] == 3
+    assert not os.path.exists(spooled[0])
+    assert served.workers.in_flight == 0
+
+
+def test_predict_video_rejects_stride_below_one(client, video):
+    client, _ = client
+    with open(video, "rb") as f:
+        response = client.post("/predict-video?stride=0", files={"file": ("clip.avi", f, "video/avi")})
+
+    assert response.status_code == 422
+    assert served.workers.in_flight == 0
+
+
+def test_undecodable_upload_reports_an_error_line(client):
+    client, _ = client
+    response = client.post(
+        "/predict-video", files={"file": ("clip.avi", b"not a video", "video/avi")}
+    )
+
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert "error" in lines[-1]
+    assert served.workers.in_flight == 0
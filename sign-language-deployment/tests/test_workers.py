@@ -0,0 +1,90 @@
+import asyncio
+
+import cv2
+import numpy as np
+import pytest
+
+pytest.importorskip("httpx")
+
+from fastapi.testclient import TestClient
+
+from app import app as served
+from app.logger import request_id_var
+from app.model_manager import LoadedModel
+from app.workers import ServerOverloaded, WorkerPool
+
+
+class FakeBackend:
+    name = "fake"
+    names = ["Hello"]
+    conf = iou = 0.5
+    max_det = 10
+
+    def predict(self, images):
+        return [np.array([[1, 2, 3, 4, 0.9, 0]], dtype=np.float32) for _ in images]
+
+
+def jpeg_bytes() -> bytes:
+    _, jpeg = cv2.imencode(".jpg", np.zeros((32, 32, 3), np.uint8))
+    return jpeg.tobytes()
+
+
+@pytest.fixture
+def client(monkeypatch):
+    loaded = LoadedModel(backend=FakeBackend(), etag="test", version="fake-test", info={})
+    monkeypatch.setattr(served.manager, "current", loaded)
+    with TestClient(served.app) as client:
+        yield client
+
+
+def test_saturated_pool_answers_503_with_retry_after(client, monkeypatch):
+    monkeypatch.setattr(served.workers, "in_flight", served.workers.max_pending)
+    rejected = served.workers.rejected
+
+    response = client.post("/predict", files={"file": ("a.jpg", jpeg_bytes(), "image/jpeg")})
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == str(served.workers.retry_after)
+    assert served.workers.rejected == rejected + 1
+
+
+def test_admitted_request_is_served_and_released(client):
+    response = client.post("/predict", files={"file": ("a.jpg", jpeg_bytes(), "image/jpeg")})
+
+    assert response.status_code == 200
+    assert response.json()["label"] == "Hello"
+    assert served.workers.in_flight == 0
+
+
+def test_admit_releases_the_slot_when_the_request_fails():
+    pool = WorkerPool(max_pending=1, retry_after=7)
+
+    async def main():
+        with pytest.raises(ValueError):
+            async with pool.admit():
+                raise ValueError("decode failed")
+        async with pool.admit():
+            with pytest.raises(ServerOverloaded) as overloaded:
+                async with pool.admit():
+                    pass
+        return overloaded.value
+
+    overloaded = asyncio.run(main())
+
+    assert overloaded.retry_after == 7
+    assert pool.in_flight == 0
+    assert pool.rejected == 1
+
+
+def test_thread_pool_runs_stages_with_the_request_id():
+    pool = WorkerPool(kind="thread", max_workers=2)
+    pool.start()
+
+    async def main():
+        request_id_var.set("req-7")
+        return await pool.run(request_id_var.get)
+
+    try:
+        assert asyncio.run(main()) == "req-7"
+    finally:
+        pool.shutdown()
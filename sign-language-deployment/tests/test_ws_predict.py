@@ -0,0 +1,41 @@
+import cv2
+import numpy as np
+import pytest
+
+pytest.importorskip("httpx")
+
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+
+from app import app as served
+from app.model_manager import LoadedModel
+
+
+class FakeBackend:
+    name = "fake"
+    names = ["Hello"]
+    conf = iou = 0.5
+
+    def predict(self, images):
+        return [np.array([[1, 2, 3, 4, 0.9, 0]], dtype=np.float32) for _ in images]
+
+
+@pytest.fixture
+def client(monkeypatch):
+    loaded = LoadedModel(backend=FakeBackend(), etag="test", version="fake-test", info={})
+    monkeypatch.setattr(served.manager, "current", loaded)
+    with TestClient(served.app) as client:
+        yield client
+
+
+def test_text_frame_closes_with_unsupported_data(client):
+    _, jpeg = cv2.imencode(".jpg", np.zeros((32, 32, 3), np.uint8))
+
+    with client.websocket_connect("/ws/predict") as ws:
+        ws.send_bytes(jpeg.tobytes())
+        assert ws.receive_json()["frame"] == 0
+
+        ws.send_text("hello")
+        with pytest.raises(WebSocketDisconnect) as closed:
+            ws.receive_json()
+        assert closed.value.code == 1003
@@ -0,0 +1,364 @@
+import os
+import sys
+
+import cv2
+import numpy as np
+import yaml
+
+from signLanguage.logger import logging
+from signLanguage.exception import SignException
+from signLanguage.entity.config_entity import DataDedupConfig
+from signLanguage.entity.artifacts_entity import (
+    DataIngestionArtifact,
+    DataDedupArtifact
+)
+from signLanguage.constant.training_pipeline import DATA_DEDUP_REPORT_FILE
+from signLanguage.utils.artifact_store import ArtifactStore
+from signLanguage.utils.main_utils import (
+    list_dataset_samples,
+    load_data_yaml,
+    process_pool,
+    read_json,
+    resolve_split_dir,
+    write_json,
+)
+
+
+DCT_SIZE = 32
+HASH_SIZE = 8
+HASH_BATCH_SIZE = 512
+
+# Buckets bigger than this are compared row by row instead of through
+# one (n, n) pair matrix
+LARGE_BUCKET_SIZE = 2048
+
+# The representative of a group is taken from the earliest split
+SPLIT_ORDER = ("train", "val", "test", "collected")
+
+
+def dct_matrix(n: int) -> np.ndarray:
+    """
+    Orthonormal DCT-II basis; D @ x @ D.T is the 2-D DCT of x
+    """
+    k = np.arange(n)[:, None]
+    i = np.arange(n)[None, :]
+    matrix = np.sqrt(2.0 / n) * np.cos(np.pi * (2 * i + 1) * k / (2 * n))
+    matrix[0] /= np.sqrt(2.0)
+    return matrix.astype(np.float32)
+
+
+def phash_batch(images: np.ndarray) -> np.ndarray:
+    """
+    64-bit perceptual hashes of a (N, 32, 32) grayscale batch: the 8x8
+    lowest DCT frequencies, thresholded at their median (DC excluded)
+    """
+    basis = dct_matrix(DCT_SIZE)
+    coefficients = basis @ images.astype(np.float32) @ basis.T
+    low = coefficients[:, :HASH_SIZE, :HASH_SIZE].reshape(len(images), -1)
+    median = np.median(low[:, 1:], axis=1, keepdims=True)
+    bits = np.packbits(low > median, axis=1)
+    return bits.view(">u8").ravel().astype(np.uint64)
+
+
+def hash_chunk(paths: list) -> tuple:
+    """
+    (hashes, decoded mask) for one chunk of image paths; runs in a worker
+    process. JPEGs are decoded at quarter scale, which is plenty for a
+    32x32 thumbnail and skips most of the IDCT work.
+    """
+    thumbnails = np.zeros((len(paths), DCT_SIZE, DCT_SIZE), dtype=np.float32)
+    decoded = np.zeros(len(paths), dtype=bool)
+    for index, path in enumerate(paths):
+        image = cv2.imread(path, cv2.IMREAD_REDUCED_GRAYSCALE_4)
+        if image is None:
+            continue
+        thumbnails[index] = cv2.resize(image, (DCT_SIZE, DCT_SIZE), interpolation=cv2.INTER_AREA)
+        decoded[index] = True
+    return phash_batch(thumbnails), decoded
+
+
+def popcount64(values: np.ndarray) -> np.ndarray:
+    return np.unpackbits(
+        values.astype(">u8").view(np.uint8).reshape(-1, 8), axis=1
+    ).sum(axis=1)
+
+
+def _close_pairs(bucket: np.ndarray, hashes: np.ndarray, radius: int) -> np.ndarray:
+    if len(bucket) <= LARGE_BUCKET_SIZE:
+        i, j = np.triu_indices(len(bucket), k=1)
+        left, right = bucket[i], bucket[j]
+        close = popcount64(hashes[left] ^ hashes[right]) <= radius
+        return np.stack([left[close], right[close]], axis=1)
+
+    pairs = []
+    for i in range(len(bucket) - 1):
+        rest = bucket[i + 1:]
+        close = rest[popcount64(hashes[bucket[i]] ^ hashes[rest]) <= radius]
+        pairs.append(np.stack([np.full(len(close), bucket[i]), close], axis=1))
+    return np.concatenate(pairs)
+
+
+def near_duplicate_pairs(hashes: np.ndarray, radius: int) -> np.ndarray:
+    """
+    (k, 2) index pairs whose hashes are within `radius` bits, found with
+    multi-index hashing: the 64 bits are cut into radius + 1 substrings
+    and, by pigeonhole, two hashes within the radius agree exactly on at
+    least one of them, so only hashes sharing a substring bucket are
+    compared. Expects distinct hashes (exact copies are grouped first).
+    """
+    hashes = hashes.astype(np.uint64)
+    bounds = np.linspace(0, 64, min(radius + 1, 64) + 1).astype(int)
+
+    pairs = [np.zeros((0, 2), dtype=np.int64)]
+    for start, stop in zip(bounds[:-1], bounds[1:]):
+        mask = np.uint64((1 << int(stop - start)) - 1)
+        keys = (hashes >> np.uint64(64 - stop)) & mask
+
+        order = np.argsort(keys, kind="stable")
+        edges = np.flatnonzero(np.diff(keys[order])) + 1
+        for bucket in np.split(order, edges):
+            if len(bucket) > 1:
+                pairs.append(_close_pairs(bucket, hashes, radius))
+
+    pairs = np.concatenate(pairs).astype(np.int64)
+    pairs.sort(axis=1)
+    return np.unique(pairs, axis=0)
+
+
+def group_duplicates(hashes: np.ndarray, radius: int) -> list:
+    """
+    Lists of indices (size > 1) connected by near-duplicate pairs
+    """
+    unique, inverse = np.unique(hashes, return_inverse=True)
+    inverse = inverse.ravel()
+
+    parent = list(range(len(unique)))
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for a, b in near_duplicate_pairs(unique, radius):
+        root_a, root_b = find(int(a)), find(int(b))
+        if root_a != root_b:
+            parent[max(root_a, root_b)] = min(root_a, root_b)
+
+    groups = {}
+    for index, unique_index in enumerate(inverse):
+        groups.setdefault(find(int(unique_index)), []).append(index)
+    return [members for members in groups.values() if len(members) > 1]
+
+
+class DataDedup:
+    def __init__(
+        self,
+        data_ingestion_artifact: DataIngestionArtifact,
+        data_dedup_config: DataDedupConfig = DataDedupConfig(),
+    ):
+        try:
+            self.data_ingestion_artifact = data_ingestion_artifact
+            self.data_dedup_config = data_dedup_config
+        except Exception as e:
+            raise SignException(e, sys)
+
+    def collect_samples(self) -> list:
+        """
+        (image path, split) for the feature store splits and CollectedImages;
+        paths are resolved so a cached report stays valid across runs
+        """
+        samples = list_dataset_samples(
+            self.data_ingestion_artifact.feature_store_path,
+            self.data_dedup_config.collected_images_dir,
+        )
+        return [(os.path.realpath(path), split) for path, _, _, split in samples]
+
+    def cache_inputs(self, samples: list) -> dict:
+        files = []
+        for path, split in samples:
+            stat = os.stat(path)
+            files.append([path, stat.st_size, stat.st_mtime_ns, split])
+        return {
+            "hamming_radius": self.data_dedup_config.hamming_radius,
+            "action": self.data_dedup_config.action,
+            "files": files,
+        }
+
+    def compute_hashes(self, paths: list) -> tuple:
+        chunks = [
+            paths[i:i + HASH_BATCH_SIZE] for i in range(0, len(paths), HASH_BATCH_SIZE)
+        ]
+        if not chunks:
+            return np.zeros(0, dtype=np.uint64), np.zeros(0, dtype=bool)
+
+        workers = max(1, min(self.data_dedup_config.max_workers, len(chunks)))
+        with process_pool(workers) as pool:
+            results = list(pool.map(hash_chunk, chunks))
+
+        return (
+            np.concatenate([hashes for hashes, _ in results]),
+            np.concatenate([decoded for _, decoded in results]),
+        )
+
+    def build_report(self, samples: list, work_dir: str) -> dict:
+        paths = [path for path, _ in samples]
+        hashes, decoded = self.compute_hashes(paths)
+
+        readable = np.flatnonzero(decoded)
+        groups = group_duplicates(hashes[readable], self.data_dedup_config.hamming_radius)
+
+        remove = self.data_dedup_config.action == "remove"
+        report_groups, exclude = [], []
+        num_cross_split = 0
+        for members in groups:
+            members = sorted(
+                (samples[readable[index]] for index in members),
+                key=lambda s: (SPLIT_ORDER.index(s[1]), len(os.path.basename(s[0])), s[0])
+            )
+            keep_path, keep_split = members[0]
+            splits = {split for _, split in members}
+            num_cross_split += len(splits) > 1
+
+            # Copies in other splits always go so the group stays on one
+            # side of the split; same-split copies only in "remove" mode
+            dropped = [
+                path for path, split in members[1:]
+                if split != keep_split or remove
+            ]
+            exclude.extend(dropped)
+
+            report_groups.append({
+                "split": keep_split,
+                "keep": keep_path,
+                "members": [{"path": path, "split": split} for path, split in members],
+                "exclude": dropped,
+            })
+
+        report = {
+            "hamming_radius": self.data_dedup_config.hamming_radius,
+            "action": self.data_dedup_config.action,
+            "num_images": len(samples),
+            "num_groups": len(report_groups),
+            "num_cross_split_groups": num_cross_split,
+            "unreadable": [path for path, ok in zip(paths, decoded) if not ok],
+            "groups": report_groups,
+            "exclude": exclude,
+        }
+        write_json(os.path.join(work_dir, DATA_DEDUP_REPORT_FILE), report)
+
+        return {
+            "report_file_name": DATA_DEDUP_REPORT_FILE,
+            "num_images": len(samples),
+            "num_groups": len(report_groups),
+            "num_excluded": len(exclude),
+        }
+
+    def remove_collected_duplicates(self, exclude: list) -> int:
+        """
+        Deletes excluded copies under CollectedImages. Feature store files
+        are shared with the artifact store and are only skipped downstream.
+        """
+        collected_root = os.path.realpath(self.data_dedup_config.collected_images_dir)
+        removed = 0
+        for path in exclude:
+            real_path = os.path.realpath(path)
+            if (
+                os.path.commonpath([collected_root, real_path]) == collected_root
+                and os.path.exists(real_path)
+            ):
+                os.remove(real_path)
+                removed += 1
+        return removed
+
+    def write_data_yaml(self, samples: list, exclude: list) -> str:
+        """
+        Writes a data.yaml with the class names of the original and each
+        split as a .txt list of the images dedup kept, so the cache and the
+        trainer (and YOLOv5 itself) all read the same filtered dataset.
+        YOLOv5 requires a val split; without one, test (or else train) is
+        listed as val and the yaml says so.
+        """
+        data, dataset_root = load_data_yaml(self.data_ingestion_artifact.feature_store_path)
+        excluded = {os.path.realpath(path) for path in exclude}
+
+        data_yaml_path = self.data_dedup_config.data_yaml_file_path
+        output_dir = os.path.dirname(os.path.abspath(data_yaml_path))
+        os.makedirs(output_dir, exist_ok=True)
+
+        filtered = {key: value for key, value in data.items() if key != "path"}
+        list_paths = {}
+        for key in ("train", "val", "test"):
+            if not data.get(key):
+                continue
+            # Splits sharing a directory were listed once, under the first
+            split_dir_path = resolve_split_dir(dataset_root, data[key])
+            if split_dir_path in list_paths:
+                filtered[key] = list_paths[split_dir_path]
+                continue
+            kept = [path for path, split in samples if split == key and path not in excluded]
+            list_path = os.path.join(output_dir, f"{key}.txt")
+            with open(list_path, "w") as f:
+                f.writelines(path + "\n" for path in kept)
+            filtered[key] = list_paths[split_dir_path] = list_path
+
+        note = ""
+        if "val" not in filtered:
+            fallback = "test" if "test" in filtered else "train"
+            filtered["val"] = filtered[fallback]
+            note = f"# The source data.yaml has no val split; val is the {fallback} split\n"
+            logging.warning(f"No val split in the dataset, validating on {fallback}")
+
+        with open(data_yaml_path, "w") as f:
+            f.write(note)
+            yaml.safe_dump(filtered, f, sort_keys=False)
+        return data_yaml_path
+
+    def initiate_data_dedup(self) -> DataDedupArtifact:
+        logging.info(
+            "Entered initiate_data_dedup method of DataDedup class"
+        )
+
+        try:
+            samples = self.collect_samples()
+            logging.info(
+                f"Hashing {len(samples)} images for near-duplicates "
+                f"(radius {self.data_dedup_config.hamming_radius})"
+            )
+
+            store = ArtifactStore(self.data_dedup_config.artifact_store_dir)
+            object_dir, outputs = store.run_cached(
+                "data_dedup",
+                self.cache_inputs(samples),
+                lambda work_dir: self.build_report(samples, work_dir),
+            )
+
+            report_file_path = store.link(
+                os.path.join(object_dir, outputs["report_file_name"]),
+                self.data_dedup_config.report_file_path
+            )
+
+            report = read_json(report_file_path)
+            data_yaml_path = self.write_data_yaml(samples, report["exclude"])
+
+            if self.data_dedup_config.action == "remove":
+                removed = self.remove_collected_duplicates(report["exclude"])
+                logging.info(f"Removed {removed} duplicate images from CollectedImages")
+
+            data_dedup_artifact = DataDedupArtifact(
+                report_file_path=report_file_path,
+                data_yaml_path=data_yaml_path,
+                num_images=outputs["num_images"],
+                num_groups=outputs["num_groups"],
+                num_excluded=outputs["num_excluded"],
+            )
+
+            logging.info(
+                "Exited initiate_data_dedup method of DataDedup class"
+            )
+            logging.info(f"Data dedup artifact: {data_dedup_artifact}")
+
+            return data_dedup_artifact
+
+        except Exception as e:
+            raise SignException(e, sys)
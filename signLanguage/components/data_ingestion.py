@@ -1,14 +1,26 @@
 import os
 import sys
-import zipfile
-from six.moves import urllib
-import shutil
+from dataclasses import replace
 
 
 from signLanguage.logger import logging
 from signLanguage.exception import SignException
 from signLanguage.entity.config_entity import DataIngestionConfig
 from signLanguage.entity.artifacts_entity import DataIngestionArtifact
+from signLanguage.utils.main_utils import (
+    sha256_file,
+    read_json,
+    write_json,
+    probe_url,
+    download_url,
+    extract_zip_parallel,
+)
+from signLanguage.utils.artifact_store import ArtifactStore
+from signLanguage.constant.training_pipeline import DATA_INGESTION_FEATURE_STORE_DIR
+
+# Written next to the zip / into the feature store to detect reusable work
+DOWNLOAD_META_SUFFIX = ".meta.json"
+EXTRACTED_MARKER = ".extracted.json"
 
 
 class DataIngestion:
@@ -21,9 +33,26 @@ class DataIngestion:
         except Exception as e:
             raise SignException(e, sys)
 
+    def _is_download_current(self, zip_file_path: str, meta: dict) -> bool:
+        if meta is None or not os.path.exists(zip_file_path):
+            return False
+
+        if os.path.getsize(zip_file_path) != meta.get("size"):
+            return False
+
+        # A pinned hash needs no network round trip
+        expected_sha256 = self.data_ingestion_config.data_download_sha256
+        if expected_sha256:
+            return meta.get("sha256") == expected_sha256
+
+        size, _, etag = probe_url(meta["url"])
+        return (size, etag) == (meta.get("size"), meta.get("etag"))
+
     def download_data(self) -> str:
         """
-        Fetch data from the URL and save it as a zip file
+        Fetch data from the URL and save it as a zip file. Downloads in
+        parallel range requests, resumes after an interruption and is
+        skipped when the same archive is already present.
         """
         try:
             dataset_url = self.data_ingestion_config.data_download_url
@@ -33,12 +62,35 @@ class DataIngestion:
 
             data_file_name = os.path.basename(dataset_url)
             zip_file_path = os.path.join(zip_download_dir, data_file_name)
+            meta_file_path = zip_file_path + DOWNLOAD_META_SUFFIX
+
+            meta = read_json(meta_file_path)
+            if meta is not None and meta.get("url") == dataset_url \
+                    and self._is_download_current(zip_file_path, meta):
+                logging.info(f"Archive {zip_file_path} is up to date, skipping download")
+                return zip_file_path
 
             logging.info(
                 f"Downloading data from {dataset_url} into file {zip_file_path}"
             )
 
-            urllib.request.urlretrieve(dataset_url, zip_file_path)
+            remote = download_url(
+                dataset_url,
+                zip_file_path,
+                part_size=self.data_ingestion_config.download_part_size,
+                max_workers=self.data_ingestion_config.max_workers,
+            )
+
+            sha256 = sha256_file(zip_file_path)
+            expected_sha256 = self.data_ingestion_config.data_download_sha256
+            if expected_sha256 and sha256 != expected_sha256:
+                os.remove(zip_file_path)
+                raise ValueError(
+                    f"Checksum mismatch for {zip_file_path}: "
+                    f"expected {expected_sha256}, got {sha256}"
+                )
+
+            write_json(meta_file_path, dict(remote, sha256=sha256))
 
             logging.info(
                 f"Downloaded data from {dataset_url} into file {zip_file_path}"
@@ -51,17 +103,34 @@ class DataIngestion:
 
     def extract_zip_file(self, zip_file_path: str) -> str:
         """
-        Extract the zip file into the feature store directory
+        Extract the zip file into the feature store directory, unless the
+        same archive (by SHA-256) has already been extracted there
         """
         try:
             feature_store_path = self.data_ingestion_config.feature_store_file_path
             os.makedirs(feature_store_path, exist_ok=True)
 
+            meta = read_json(zip_file_path + DOWNLOAD_META_SUFFIX) or {}
+            sha256 = meta.get("sha256") or sha256_file(zip_file_path)
+
+            marker_path = os.path.join(feature_store_path, EXTRACTED_MARKER)
+            marker = read_json(marker_path)
+            if marker is not None and marker.get("sha256") == sha256:
+                logging.info(
+                    f"{zip_file_path} already extracted at {feature_store_path}, skipping"
+                )
+                return feature_store_path
+
             logging.info(
                 f"Extracting zip file {zip_file_path} into directory {feature_store_path}"
             )
 
-            shutil.unpack_archive(zip_file_path, feature_store_path)
+            files = extract_zip_parallel(
+                zip_file_path,
+                feature_store_path,
+                max_workers=self.data_ingestion_config.max_workers,
+            )
+            write_json(marker_path, {"sha256": sha256, "files": files})
 
             logging.info(
                 f"Extraction completed at {feature_store_path}"
@@ -72,14 +141,71 @@ class DataIngestion:
         except Exception as e:
             raise SignException(e, sys)
 
+    def cache_inputs(self) -> dict:
+        """
+        What identifies the ingested data: the pinned archive hash if there
+        is one, otherwise the remote size and ETag
+        """
+        dataset_url = self.data_ingestion_config.data_download_url
+        expected_sha256 = self.data_ingestion_config.data_download_sha256
+        if expected_sha256:
+            return {"url": dataset_url, "sha256": expected_sha256}
+
+        size, _, etag = probe_url(dataset_url)
+        return {"url": dataset_url, "size": size, "etag": etag}
+
+    def ingest_into(self, work_dir: str) -> dict:
+        """
+        Downloads and extracts into a store work directory
+        """
+        ingestion = DataIngestion(replace(
+            self.data_ingestion_config,
+            data_ingestion_dir=work_dir,
+            feature_store_file_path=os.path.join(work_dir, DATA_INGESTION_FEATURE_STORE_DIR),
+        ))
+        zip_file_path = ingestion.download_data()
+        ingestion.extract_zip_file(zip_file_path)
+        return {
+            "zip_file_name": os.path.basename(zip_file_path),
+            "feature_store_dir": DATA_INGESTION_FEATURE_STORE_DIR,
+        }
+
     def initiate_data_ingestion(self) -> DataIngestionArtifact:
         logging.info(
             "Entered initiate_data_ingestion method of DataIngestion class"
         )
 
         try:
-            zip_file_path = self.download_data()
-            feature_store_path = self.extract_zip_file(zip_file_path)
+            store = ArtifactStore(self.data_ingestion_config.artifact_store_dir)
+            object_dir, outputs = store.run_cached(
+                "data_ingestion", self.cache_inputs(), self.ingest_into
+            )
+
+            # The run directory only links into the store, nothing is copied
+            zip_file_path = store.link(
+                os.path.join(object_dir, outputs["zip_file_name"]),
+                os.path.join(
+                    self.data_ingestion_config.data_ingestion_dir,
+                    outputs["zip_file_name"]
+                )
+            )
+            feature_store_src = os.path.join(object_dir, outputs["feature_store_dir"])
+            try:
+                feature_store_path = store.link(
+                    feature_store_src,
+                    self.data_ingestion_config.feature_store_file_path
+                )
+            except FileExistsError as e:
+                # e.g. the fixed Windows path holds data the store did not
+                # put there; leave it alone and link inside this run instead
+                feature_store_path = store.link(
+                    feature_store_src,
+                    os.path.join(
+                        self.data_ingestion_config.data_ingestion_dir,
+                        DATA_INGESTION_FEATURE_STORE_DIR
+                    )
+                )
+                logging.warning(f"{e}; using {feature_store_path} instead")
 
             data_ingestion_artifact = DataIngestionArtifact(
                 data_zip_file_path=zip_file_path,
@@ -1,6 +1,12 @@
 import os
 import sys
-import shutil
+import hashlib
+from collections import defaultdict
+from dataclasses import replace
+from functools import partial
+
+import cv2
+import numpy as np
 
 from signLanguage.logger import logging
 from signLanguage.exception import SignException
@@ -9,6 +15,65 @@ from signLanguage.entity.artifacts_entity import (
     DataIngestionArtifact,
     DataValidationArtifact
 )
+from signLanguage.utils.artifact_store import ArtifactStore
+from signLanguage.utils.main_utils import (
+    read_json,
+    write_json,
+    find_data_yaml,
+    load_data_yaml,
+    process_pool,
+    resolve_split_dir,
+)
+
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp")
+LABEL_EXTENSION = ".txt"
+
+
+def check_image(image_path: str) -> dict:
+    """
+    Decodes one image; runs in a worker process
+    """
+    try:
+        with open(image_path, "rb") as f:
+            data = f.read()
+        image = cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_COLOR)
+        errors = [] if image is not None else ["image does not decode"]
+        return {
+            "hash": hashlib.blake2b(data, digest_size=16).hexdigest(),
+            "errors": errors,
+        }
+    except Exception as e:
+        return {"hash": None, "errors": [f"unreadable: {e}"]}
+
+
+def check_label(label_path: str, nc: int) -> dict:
+    """
+    Parses one YOLO label file; runs in a worker process
+    """
+    errors = []
+    try:
+        with open(label_path) as f:
+            lines = [line.split() for line in f if line.strip()]
+    except Exception as e:
+        return {"nc": nc, "errors": [f"unreadable: {e}"]}
+
+    for line_no, fields in enumerate(lines, start=1):
+        if len(fields) != 5:
+            errors.append(f"line {line_no}: expected 5 fields, got {len(fields)}")
+            continue
+        try:
+            cls = int(fields[0])
+            coords = [float(value) for value in fields[1:]]
+        except ValueError:
+            errors.append(f"line {line_no}: not numeric")
+            continue
+        if not 0 <= cls < nc:
+            errors.append(f"line {line_no}: class id {cls} outside [0, {nc})")
+        if any(not 0.0 <= value <= 1.0 for value in coords):
+            errors.append(f"line {line_no}: coordinates outside [0, 1]")
+
+    return {"nc": nc, "errors": errors}
 
 
 class DataValidation:
@@ -27,8 +92,13 @@ class DataValidation:
         try:
             validation_status = True
 
+            # Checked where data.yaml is, which may be nested in the archive
             feature_store_path = self.data_ingestion_artifact.feature_store_path
-            existing_files = os.listdir(feature_store_path)
+            try:
+                dataset_root = os.path.dirname(find_data_yaml(feature_store_path))
+            except FileNotFoundError:
+                dataset_root = feature_store_path
+            existing_files = os.listdir(dataset_root)
 
             for required_file in self.data_validation_config.required_file_list:
                 if required_file not in existing_files:
@@ -50,16 +120,214 @@ class DataValidation:
         except Exception as e:
             raise SignException(e, sys)
 
+    def list_split_files(self, dataset_root: str, data: dict) -> dict:
+        """
+        split -> (image paths, label paths) for the splits in data.yaml,
+        resolved against the directory holding data.yaml (see
+        resolve_split_dir). Labels live next to images/ in labels/.
+        """
+        splits = {}
+        for key in ("train", "val", "test"):
+            image_rel = data.get(key)
+            if not image_rel:
+                continue
+            image_dir = resolve_split_dir(dataset_root, image_rel)
+            if image_dir in splits:
+                continue
+
+            label_dir = os.path.join(os.path.dirname(image_dir), "labels")
+
+            images = sorted(
+                os.path.join(image_dir, name)
+                for name in (os.listdir(image_dir) if os.path.isdir(image_dir) else [])
+                if name.lower().endswith(IMAGE_EXTENSIONS)
+            )
+            labels = sorted(
+                os.path.join(label_dir, name)
+                for name in (os.listdir(label_dir) if os.path.isdir(label_dir) else [])
+                if name.endswith(LABEL_EXTENSION)
+            )
+            splits[image_dir] = (images, labels)
+        return splits
+
+    def validate_dataset(self) -> dict:
+        """
+        Deep validation across a process pool: every image decodes, every
+        label parses with class ids below nc and coordinates in [0, 1],
+        images and labels pair up one-to-one, and duplicate images are
+        reported. Per-file results are cached in a manifest keyed by size
+        and mtime, so later runs only re-check changed files.
+        """
+        try:
+            data, dataset_root = load_data_yaml(
+                self.data_ingestion_artifact.feature_store_path
+            )
+            nc = int(data["nc"])
+
+            splits = self.list_split_files(dataset_root, data)
+
+            manifest_path = self.data_validation_config.manifest_file_path
+            cached = (read_json(manifest_path) or {}).get("files", {})
+            entries = {}
+            todo_images, todo_labels = [], []
+
+            for images, labels in splits.values():
+                for kind, paths, todo in (
+                    ("image", images, todo_images),
+                    ("label", labels, todo_labels),
+                ):
+                    for path in paths:
+                        key = os.path.realpath(path)
+                        stat = os.stat(key)
+                        entry = cached.get(key)
+                        if (
+                            entry is not None
+                            and entry["size"] == stat.st_size
+                            and entry["mtime_ns"] == stat.st_mtime_ns
+                            and (kind == "image" or entry.get("nc") == nc)
+                        ):
+                            entries[key] = entry
+                        else:
+                            todo.append((key, stat))
+
+            logging.info(
+                f"Validating {len(todo_images)} images and {len(todo_labels)} labels "
+                f"({len(entries)} unchanged files reused from the manifest)"
+            )
+
+            if todo_images or todo_labels:
+                with process_pool(self.data_validation_config.max_workers) as pool:
+                    for fn, todo in (
+                        (check_image, todo_images),
+                        (partial(check_label, nc=nc), todo_labels),
+                    ):
+                        results = pool.map(fn, [key for key, _ in todo], chunksize=32)
+                        for (key, stat), result in zip(todo, results):
+                            result.update(size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+                            entries[key] = result
+
+            os.makedirs(os.path.dirname(manifest_path) or ".", exist_ok=True)
+            write_json(manifest_path, {"files": entries})
+
+            errors = []
+            hashes = defaultdict(list)
+            image_count = label_count = 0
+
+            for split, (images, labels) in splits.items():
+                image_count += len(images)
+                label_count += len(labels)
+
+                for path in images + labels:
+                    entry = entries[os.path.realpath(path)]
+                    errors.extend(f"{path}: {error}" for error in entry["errors"])
+                    if entry.get("hash"):
+                        hashes[entry["hash"]].append(path)
+
+                image_stems = {os.path.splitext(os.path.basename(p))[0] for p in images}
+                label_stems = {os.path.splitext(os.path.basename(p))[0] for p in labels}
+                errors.extend(
+                    f"{split}: image {stem} has no label file"
+                    for stem in sorted(image_stems - label_stems)
+                )
+                errors.extend(
+                    f"{split}: label {stem} has no image"
+                    for stem in sorted(label_stems - image_stems)
+                )
+
+            duplicates = [paths for paths in hashes.values() if len(paths) > 1]
+
+            report = {
+                "valid": not errors,
+                "images": image_count,
+                "labels": label_count,
+                "rechecked_files": len(todo_images) + len(todo_labels),
+                "errors": errors,
+                "duplicate_groups": duplicates,
+            }
+
+            os.makedirs(self.data_validation_config.data_validation_dir, exist_ok=True)
+            write_json(self.data_validation_config.report_file_path, report)
+
+            logging.info(
+                f"Dataset validation: {len(errors)} errors, "
+                f"{len(duplicates)} duplicate groups"
+            )
+            return report
+
+        except Exception as e:
+            raise SignException(e, sys)
+
+    def cache_inputs(self) -> dict:
+        # The feature store resolves into the content-addressed store, so
+        # its real path identifies the data being validated
+        return {
+            "feature_store": os.path.realpath(
+                self.data_ingestion_artifact.feature_store_path
+            ),
+            "required_file_list": list(self.data_validation_config.required_file_list),
+            "checks": ["required_files", "images", "labels", "pairs", "duplicates"],
+        }
+
+    def validate_into(self, work_dir: str) -> dict:
+        validation = DataValidation(
+            data_ingestion_artifact=self.data_ingestion_artifact,
+            data_validation_config=replace(
+                self.data_validation_config,
+                data_validation_dir=work_dir,
+                valid_status_file_dir=os.path.join(
+                    work_dir,
+                    os.path.basename(self.data_validation_config.valid_status_file_dir)
+                ),
+                report_file_path=os.path.join(
+                    work_dir,
+                    os.path.basename(self.data_validation_config.report_file_path)
+                ),
+            ),
+        )
+
+        status = validation.validate_all_files_exist()
+        if status:
+            status = validation.validate_dataset()["valid"]
+            with open(validation.data_validation_config.valid_status_file_dir, "w") as f:
+                f.write(f"Validation status: {status}")
+
+        return {
+            "validation_status": status,
+            "status_file_name": os.path.basename(
+                self.data_validation_config.valid_status_file_dir
+            ),
+            "report_file_name": (
+                os.path.basename(self.data_validation_config.report_file_path)
+                if os.path.exists(validation.data_validation_config.report_file_path)
+                else None
+            ),
+        }
+
     def initiate_data_validation(self) -> DataValidationArtifact:
         logging.info(
             "Entered initiate_data_validation method of DataValidation class"
         )
 
         try:
-            status = self.validate_all_files_exist()
+            store = ArtifactStore(self.data_validation_config.artifact_store_dir)
+            object_dir, outputs = store.run_cached(
+                "data_validation", self.cache_inputs(), self.validate_into
+            )
+            store.link(
+                os.path.join(object_dir, outputs["status_file_name"]),
+                self.data_validation_config.valid_status_file_dir
+            )
+            report_file_path = None
+            if outputs.get("report_file_name"):
+                report_file_path = store.link(
+                    os.path.join(object_dir, outputs["report_file_name"]),
+                    self.data_validation_config.report_file_path
+                )
+            status = outputs["validation_status"]
 
             data_validation_artifact = DataValidationArtifact(
-                validation_status=status
+                validation_status=status,
+                report_file_path=report_file_path
             )
 
             logging.info(
@@ -69,11 +337,17 @@ class DataValidation:
                 f"Data validation artifact: {data_validation_artifact}"
             )
 
+            # Training expects the archive in the working directory; link
+            # it there instead of copying
             if status:
-                shutil.copy(
-                    self.data_ingestion_artifact.data_zip_file_path,
-                    os.getcwd()
-                )
+                zip_file_path = self.data_ingestion_artifact.data_zip_file_path
+                try:
+                    store.link(
+                        zip_file_path,
+                        os.path.join(os.getcwd(), os.path.basename(zip_file_path))
+                    )
+                except FileExistsError as e:
+                    logging.warning(f"Not linking the archive into the working directory: {e}")
 
             return data_validation_artifact
 
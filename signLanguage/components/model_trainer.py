@@ -0,0 +1,286 @@
+import os
+import sys
+import json
+import time
+import hashlib
+
+import torch
+
+from signLanguage.logger import logging
+from signLanguage.exception import SignException
+from signLanguage.entity.config_entity import ModelTrainerConfig
+from signLanguage.entity.artifacts_entity import (
+    DataDedupArtifact,
+    ModelTrainerArtifact
+)
+from signLanguage.utils.artifact_store import make_link, remove_path
+from signLanguage.utils.main_utils import (
+    list_dataset_samples,
+    peak_rss_mb,
+    read_json,
+    write_json,
+)
+
+
+LAST_CHECKPOINT = "last.pt"
+BEST_CHECKPOINT = "best.pt"
+
+# Written next to YOLOv5's run files
+TRAIN_KEY_FILE = "train_key.json"
+TIMINGS_FILE = "timings.json"
+
+# train.py hard-codes its nominal batch (nbs = 64) and accumulates
+# gradients up to it, so accumulation follows from the batch size and
+# is not a setting of its own; kept here only to report it
+YOLOV5_NOMINAL_BATCH_SIZE = 64
+
+
+def load_checkpoint(path: str) -> dict:
+    # YOLOv5 checkpoints pickle the model object, which torch >= 2.6
+    # refuses to load by default
+    try:
+        return torch.load(path, map_location="cpu", weights_only=False)
+    except TypeError:
+        # torch < 1.13 has no weights_only
+        return torch.load(path, map_location="cpu")
+
+
+class EpochTimer:
+    """
+    YOLOv5 training callbacks that time each epoch's training pass and
+    validation and record throughput, memory and mAP per epoch
+    """
+
+    def __init__(self, timings_path: str, images_per_epoch: int, history: list):
+        self.timings_path = timings_path
+        self.images_per_epoch = images_per_epoch
+        self.history = history
+        self._start = self._train_end = None
+
+    def register(self, callbacks) -> None:
+        callbacks.register_action("on_train_epoch_start", "epoch_timer", self.on_train_epoch_start)
+        callbacks.register_action("on_train_epoch_end", "epoch_timer", self.on_train_epoch_end)
+        callbacks.register_action("on_fit_epoch_end", "epoch_timer", self.on_fit_epoch_end)
+
+    def on_train_epoch_start(self) -> None:
+        self._start = time.perf_counter()
+
+    def on_train_epoch_end(self, epoch: int) -> None:
+        self._train_end = time.perf_counter()
+
+    def on_fit_epoch_end(self, log_vals, epoch, best_fitness, fi) -> None:
+        # log_vals: train box/obj/cls loss, P, R, mAP@0.5, mAP@0.5:0.95,
+        # val box/obj/cls loss, learning rates
+        train_time = self._train_end - self._start
+        stats = {
+            "epoch": epoch,
+            "epoch_time_s": train_time,
+            "val_time_s": time.perf_counter() - self._train_end,
+            "images": self.images_per_epoch,
+            "images_per_sec": self.images_per_epoch / train_time if train_time else 0.0,
+            "loss": float(sum(log_vals[:3])),
+            "map50": float(log_vals[5]),
+            "map50_95": float(log_vals[6]),
+            "fitness": float(fi),
+            "peak_rss_mb": peak_rss_mb(),
+        }
+        # An epoch repeated after a resume replaces the interrupted record
+        self.history[:] = [h for h in self.history if h["epoch"] < epoch] + [stats]
+        write_json(self.timings_path, self.history)
+
+        logging.info(
+            f"Epoch {epoch}: {stats['epoch_time_s']:.1f}s training, {stats['val_time_s']:.1f}s "
+            f"validation, {stats['images_per_sec']:.1f} img/s, mAP@0.5 {stats['map50']:.3f}"
+        )
+
+
+class ModelTrainer:
+    """
+    Trains YOLOv5 on CPU with the train.py of a local YOLOv5 checkout
+    (augmentation, warmup, EMA, per-epoch validation, best.pt chosen by
+    mAP fitness) on the dedup-filtered dataset. A rerun on the same data
+    and settings resumes from last.pt; speed and memory figures land in
+    the artifact.
+    """
+
+    def __init__(
+        self,
+        data_dedup_artifact: DataDedupArtifact,
+        model_trainer_config: ModelTrainerConfig = ModelTrainerConfig(),
+    ):
+        try:
+            self.data_dedup_artifact = data_dedup_artifact
+            self.model_trainer_config = model_trainer_config
+        except Exception as e:
+            raise SignException(e, sys)
+
+    @property
+    def run_dir(self) -> str:
+        return os.path.join(
+            os.path.abspath(self.model_trainer_config.checkpoint_dir),
+            self.model_trainer_config.run_name
+        )
+
+    def import_yolov5(self) -> None:
+        yolov5_dir = os.path.abspath(self.model_trainer_config.yolov5_dir)
+        if not os.path.isdir(yolov5_dir):
+            raise FileNotFoundError(
+                f"YOLOv5 checkout not found at {yolov5_dir}; "
+                "git clone https://github.com/ultralytics/yolov5 or set YOLOV5_DIR"
+            )
+        if yolov5_dir not in sys.path:
+            sys.path.append(yolov5_dir)
+
+    def pin_threads(self) -> None:
+        # After importing YOLOv5, whose utils.general picks its own count;
+        # DataLoader workers run single-threaded regardless
+        torch.set_num_threads(self.model_trainer_config.num_threads)
+        try:
+            torch.set_num_interop_threads(1)
+        except RuntimeError:
+            # Can only be set once, before any inter-op work has started
+            pass
+
+    def train_key(self, samples: list) -> dict:
+        """
+        What a run must match to be resumed: the filtered sample list and
+        the settings YOLOv5 restores from the run's opt.yaml
+        """
+        config = self.model_trainer_config
+        content = json.dumps([(path, split) for path, _, _, split in samples])
+        return {
+            "data": hashlib.sha256(content.encode()).hexdigest(),
+            "weights": config.weight_name,
+            "hyp": config.hyp_file,
+            "epochs": config.no_epochs,
+            "batch_size": config.batch_size,
+            "img_size": config.img_size,
+        }
+
+    def prepare_run(self, key: dict) -> bool:
+        """
+        True to resume the run in run_dir. A run on other data or
+        settings is cleared so YOLOv5 starts a fresh one in its place.
+        """
+        config = self.model_trainer_config
+        last_path = os.path.join(self.run_dir, "weights", LAST_CHECKPOINT)
+        key_path = os.path.join(self.run_dir, TRAIN_KEY_FILE)
+
+        if config.resume and os.path.exists(last_path) and read_json(key_path) == key:
+            return True
+
+        if os.path.exists(self.run_dir):
+            logging.info(f"Starting over: {self.run_dir} holds a run on different data or settings")
+            remove_path(self.run_dir)
+        os.makedirs(self.run_dir)
+        write_json(key_path, key)
+        return False
+
+    def run_finished(self) -> bool:
+        # YOLOv5 strips the optimizer and sets epoch to -1 once the last
+        # epoch is done; such a last.pt cannot be resumed
+        last_path = os.path.join(self.run_dir, "weights", LAST_CHECKPOINT)
+        return load_checkpoint(last_path).get("epoch", -1) == -1
+
+    def train(self, resume: bool, timer: EpochTimer) -> None:
+        import train as yolov5_train
+        from utils.callbacks import Callbacks
+
+        config = self.model_trainer_config
+        yolov5_dir = os.path.abspath(config.yolov5_dir)
+
+        # The same overrides train.run() applies, but through main() so
+        # the timing callbacks can be attached
+        opt = yolov5_train.parse_opt(True)
+        overrides = {
+            "data": os.path.abspath(self.data_dedup_artifact.data_yaml_path),
+            "weights": os.path.join(yolov5_dir, config.weight_name),
+            "hyp": os.path.join(yolov5_dir, config.hyp_file),
+            "epochs": config.no_epochs,
+            "batch_size": config.batch_size,
+            "imgsz": config.img_size,
+            "workers": config.num_workers,
+            "cache": config.cache or None,
+            "device": "cpu",
+            "project": os.path.dirname(self.run_dir),
+            "name": config.run_name,
+            "exist_ok": True,
+        }
+        if resume:
+            overrides["resume"] = os.path.join(self.run_dir, "weights", LAST_CHECKPOINT)
+        for name, value in overrides.items():
+            setattr(opt, name, value)
+
+        callbacks = Callbacks()
+        timer.register(callbacks)
+        self.pin_threads()
+        yolov5_train.main(opt, callbacks)
+
+    def initiate_model_trainer(self) -> ModelTrainerArtifact:
+        logging.info(
+            "Entered initiate_model_trainer method of ModelTrainer class"
+        )
+
+        try:
+            config = self.model_trainer_config
+            os.makedirs(config.model_trainer_dir, exist_ok=True)
+
+            self.import_yolov5()
+
+            samples = list_dataset_samples(self.data_dedup_artifact.data_yaml_path)
+            train_images = sum(split == "train" for _, _, _, split in samples)
+            accumulate = max(1, round(YOLOV5_NOMINAL_BATCH_SIZE / config.batch_size))
+
+            timings_path = os.path.join(self.run_dir, TIMINGS_FILE)
+            resume = self.prepare_run(self.train_key(samples))
+            history = (read_json(timings_path) or []) if resume else []
+
+            if resume and self.run_finished():
+                logging.info(f"{self.run_dir} already finished {config.no_epochs} epochs, reusing it")
+            else:
+                logging.info(
+                    f"{'Resuming' if resume else 'Starting'} YOLOv5 training on {train_images} images "
+                    f"for {config.no_epochs} epochs: batch {config.batch_size}, accumulate {accumulate}, "
+                    f"{config.num_workers} loader workers, {config.num_threads} threads"
+                )
+                self.train(resume, EpochTimer(timings_path, train_images, history))
+
+            train_time = sum(stats["epoch_time_s"] for stats in history)
+            metrics = {
+                "epochs": history,
+                "images_per_sec": sum(stats["images"] for stats in history) / train_time if train_time else 0.0,
+                # Loader workers have exited (and been reaped) by now
+                "peak_rss_mb": peak_rss_mb(include_children=True),
+                "batch_size": config.batch_size,
+                "accumulate": accumulate,
+                "num_workers": config.num_workers,
+                "num_threads": config.num_threads,
+                "run_dir": self.run_dir,
+            }
+            write_json(config.metrics_file_path, metrics)
+
+            # best.pt is YOLOv5's pick by validation fitness (mAP)
+            best_path = os.path.join(self.run_dir, "weights", BEST_CHECKPOINT)
+            trained_model_file_path = os.path.join(config.model_trainer_dir, BEST_CHECKPOINT)
+            remove_path(trained_model_file_path)
+            make_link(best_path, trained_model_file_path)
+
+            model_trainer_artifact = ModelTrainerArtifact(
+                trained_model_file_path=trained_model_file_path,
+                last_checkpoint_path=os.path.join(self.run_dir, "weights", LAST_CHECKPOINT),
+                metrics_file_path=config.metrics_file_path,
+                epochs_completed=len(history),
+                images_per_sec=metrics["images_per_sec"],
+                epoch_times_s=[stats["epoch_time_s"] for stats in history],
+                peak_rss_mb=metrics["peak_rss_mb"],
+            )
+
+            logging.info(
+                "Exited initiate_model_trainer method of ModelTrainer class"
+            )
+            logging.info(f"Model trainer artifact: {model_trainer_artifact}")
+
+            return model_trainer_artifact
+
+        except Exception as e:
+            raise SignException(e, sys)
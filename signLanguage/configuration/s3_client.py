@@ -0,0 +1,83 @@
+"""
+Process-wide boto3 S3 client and per-thread resources. Creating a client
+loads the botocore service model and opens a fresh connection pool, so
+every S3Operation shares one lazily created, thread-safe client instead.
+
+The API deploys on its own with a copy of this module
+(sign-language-deployment/app/s3_client.py) that differs only in where
+the S3_* settings come from; tests/test_vendored_modules.py keeps the two
+in step.
+"""
+import threading
+
+import boto3
+from botocore.config import Config
+
+from signLanguage.constant.training_pipeline import (
+    S3_ENDPOINT_URL,
+    S3_MAX_POOL_CONNECTIONS,
+    S3_MAX_ATTEMPTS,
+    S3_CONNECT_TIMEOUT_S,
+    S3_READ_TIMEOUT_S,
+)
+
+_lock = threading.Lock()
+_clients = {}
+_local = threading.local()
+
+
+def client_config() -> Config:
+    return Config(
+        max_pool_connections=S3_MAX_POOL_CONNECTIONS,
+        retries={"max_attempts": S3_MAX_ATTEMPTS, "mode": "standard"},
+        connect_timeout=S3_CONNECT_TIMEOUT_S,
+        read_timeout=S3_READ_TIMEOUT_S,
+    )
+
+
+def get_s3_client(endpoint_url: str = S3_ENDPOINT_URL):
+    """
+    Returns the shared client for endpoint_url, creating it on first use.
+    boto3 clients are thread-safe; sessions are not, so creation is locked.
+    """
+    client = _clients.get(endpoint_url)
+    if client is not None:
+        return client
+
+    with _lock:
+        client = _clients.get(endpoint_url)
+        if client is None:
+            client = boto3.session.Session().client(
+                "s3", endpoint_url=endpoint_url, config=client_config()
+            )
+            _clients[endpoint_url] = client
+    return client
+
+
+def get_s3_resource(endpoint_url: str = S3_ENDPOINT_URL):
+    """
+    boto3 resources are not thread-safe, so each thread gets its own,
+    created once and reused. They all issue their requests through the
+    shared client, and so through its connection pool.
+    """
+    resources = getattr(_local, "resources", None)
+    if resources is None:
+        resources = _local.resources = {}
+
+    resource = resources.get(endpoint_url)
+    if resource is None:
+        resource = boto3.session.Session().resource(
+            "s3", endpoint_url=endpoint_url, config=client_config()
+        )
+        resource.meta.client = get_s3_client(endpoint_url)
+        resources[endpoint_url] = resource
+    return resource
+
+
+def reset_clients() -> None:
+    """
+    Drops cached clients, e.g. in a worker process after fork
+    """
+    with _lock:
+        _clients.clear()
+    _local.__dict__.clear()
@@ -1,21 +1,28 @@
 import sys
 import os
-import boto3
 import pickle
 from io import StringIO, BytesIO
-from typing import Union, List
+from typing import Callable, Optional, Union, List
 from pandas import DataFrame
 from mypy_boto3_s3.service_resource import Bucket
 
 from signLanguage.exception import SignException
 from signLanguage.logger import logging
+from signLanguage.configuration.s3_client import get_s3_client, get_s3_resource
+from signLanguage.configuration.s3_transfer import (
+    make_transfer_config,
+    read_body_into,
+    download_file_resumable,
+    upload_file,
+)
 
 
 class S3Operation:
-    def __init__(self):
+    def __init__(self, s3_client=None, s3_resource=None):
         try:
-            self.s3_client = boto3.client("s3")
-            self.s3_resource = boto3.resource("s3")
+            self.s3_client = s3_client or get_s3_client()
+            self.s3_resource = s3_resource or get_s3_resource()
+            self.transfer_config = make_transfer_config()
         except Exception as e:
             raise SignException(e, sys) from e
 
@@ -27,18 +34,19 @@ class S3Operation:
         object_name,
         decode: bool = True,
         make_readable: bool = False
-    ) -> Union[StringIO, str, bytes]:
+    ) -> Union[StringIO, BytesIO, str, memoryview]:
         """
-        Reads an S3 object body
+        Reads an S3 object body into one preallocated buffer. Returns str,
+        or with decode=False a memoryview over that buffer (bytes-like,
+        but not picklable); make_readable wraps either in a file object.
         """
         logging.info("Entered the read_object method of S3Operation class")
         try:
-            data = (
-                object_name.get()["Body"].read().decode()
-                if decode
-                else object_name.get()["Body"].read()
-            )
-            return StringIO(data) if make_readable else data
+            data = read_body_into(object_name.get())
+            if decode:
+                data = str(data, "utf-8")
+                return StringIO(data) if make_readable else data
+            return BytesIO(data) if make_readable else data
 
         except Exception as e:
             raise SignException(e, sys) from e
@@ -117,17 +125,21 @@ class S3Operation:
         self,
         file_path: str,
         bucket_name: str,
-        s3_key: str
+        s3_key: str,
+        progress_callback: Optional[Callable[[int, int], None]] = None
     ) -> None:
         """
-        Uploads local file to S3
+        Uploads local file to S3 (multipart above the configured threshold)
         """
         logging.info("Entered the upload_file method of S3Operation class")
         try:
-            self.s3_client.upload_file(
-                Filename=file_path,
-                Bucket=bucket_name,
-                Key=s3_key
+            upload_file(
+                self.s3_client,
+                file_path,
+                bucket_name,
+                s3_key,
+                transfer_config=self.transfer_config,
+                progress_callback=progress_callback
             )
             logging.info(f"Uploaded {file_path} to s3://{bucket_name}/{s3_key}")
 
@@ -181,8 +193,7 @@ class S3Operation:
                 Key=s3_model_key
             )
 
-            model_bytes = response["Body"].read()
-            model = pickle.loads(model_bytes)
+            model = pickle.loads(read_body_into(response))
 
             logging.info("Model loaded successfully from S3")
             return model
@@ -197,17 +208,23 @@ class S3Operation:
         self,
         bucket_name: str,
         s3_key: str,
-        download_path: str
+        download_path: str,
+        progress_callback: Optional[Callable[[int, int], None]] = None
     ) -> None:
         """
-        Downloads file from S3 to local system
+        Downloads file from S3 to local system with parallel ranged GETs,
+        resuming from download_path.part after an interruption
         """
         logging.info("Entered the download_file method of S3Operation class")
         try:
-            self.s3_client.download_file(
-                Bucket=bucket_name,
-                Key=s3_key,
-                Filename=download_path
+            download_file_resumable(
+                self.s3_client,
+                bucket_name,
+                s3_key,
+                download_path,
+                part_size=self.transfer_config.multipart_chunksize,
+                max_workers=self.transfer_config.max_request_concurrency,
+                progress_callback=progress_callback
             )
 
             logging.info(f"Downloaded s3://{bucket_name}/{s3_key} to {download_path}")
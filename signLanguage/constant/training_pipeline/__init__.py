@@ -3,6 +3,24 @@ import os
 # Common artifacts directory
 ARTIFACTS_DIR: str = "artifacts"
 
+# Set to an existing run's timestamp to rerun it, skipping finished stages
+PIPELINE_RUN_ID: str = os.getenv("PIPELINE_RUN_ID", "")
+
+# Finished stages, their input fingerprints, wall time and peak memory
+PIPELINE_STATE_FILE: str = "pipeline_state.json"
+
+# Independent stages run concurrently up to this many at a time
+PIPELINE_MAX_PARALLEL_STAGES: int = int(os.getenv("PIPELINE_MAX_PARALLEL_STAGES", "2"))
+
+# Default process count of a stage's pool: concurrent stages (validation
+# and dedup) split the cores instead of each starting one per core
+PIPELINE_STAGE_WORKERS: int = max(
+    1, (os.cpu_count() or 1) // max(1, PIPELINE_MAX_PARALLEL_STAGES)
+)
+
+# Content-addressed store of stage outputs shared by all pipeline runs
+ARTIFACT_STORE_DIR_NAME: str = "store"
+
 """
 Data Ingestion related constants start with DATA_INGESTION_ variable name
 """
@@ -15,6 +33,15 @@ DATA_DOWNLOAD_URL: str = (
     "https://github.com/Vivekananda-nitt27/End_to_end_sign_language_project/raw/main/data/sign_language_data.zip"
 )
 
+# Expected SHA-256 of the archive; when unset the hash is only recorded
+DATA_DOWNLOAD_SHA256: str = os.getenv("DATA_DOWNLOAD_SHA256", "")
+
+DATA_INGESTION_PART_SIZE: int = 8 * 1024 * 1024
+
+DATA_INGESTION_MAX_WORKERS: int = int(os.getenv("DATA_INGESTION_MAX_WORKERS", "8"))
+
+DATA_INGESTION_TIMEOUT_S: float = 60.0
+
 """
 Data Validation related constants start with DATA_VALIDATION_ variable name
 """
@@ -29,6 +56,90 @@ DATA_VALIDATION_ALL_REQUIRED_FILES = [
     "data.yaml"
 ]
 
+DATA_VALIDATION_REPORT_FILE: str = "report.json"
+
+# Per-file results keyed by size and mtime, shared by all runs
+DATA_VALIDATION_MANIFEST_FILE: str = "validation_manifest.json"
+
+DATA_VALIDATION_MAX_WORKERS: int = int(
+    os.getenv("DATA_VALIDATION_MAX_WORKERS", str(PIPELINE_STAGE_WORKERS))
+)
+
+# Images captured by data_collector.py, one directory per label
+COLLECTED_IMAGES_DIR: str = "CollectedImages"
+
+# CollectedImages/<label>/ directories are matched to data.yaml class
+# names ignoring case and punctuation ("Hello" -> "hello"); these are the
+# ones spelled differently (data_collector.py label -> data.yaml name)
+COLLECTED_IMAGES_LABEL_ALIASES: dict = {"IloveYou": "I_love_u"}
+
+
+"""
+Data Dedup related constants start with DATA_DEDUP_ variable name
+"""
+
+DATA_DEDUP_DIR_NAME: str = "data_dedup"
+
+DATA_DEDUP_REPORT_FILE: str = "dedup_report.json"
+
+# data.yaml whose splits list only the images dedup kept; what every
+# stage after dedup reads the dataset through
+DATA_DEDUP_DATA_YAML_FILE: str = "data.yaml"
+
+# Max Hamming distance between 64-bit perceptual hashes to call two
+# images near-duplicates
+DATA_DEDUP_HAMMING_RADIUS: int = int(os.getenv("DATA_DEDUP_HAMMING_RADIUS", "4"))
+
+# "report" only lists duplicates; "remove" also drops the extra copies
+# downstream and deletes them from CollectedImages
+DATA_DEDUP_ACTION: str = os.getenv("DATA_DEDUP_ACTION", "report")
+
+DATA_DEDUP_MAX_WORKERS: int = int(
+    os.getenv("DATA_DEDUP_MAX_WORKERS", str(PIPELINE_STAGE_WORKERS))
+)
+
+
+"""
+MODEL TRAINER related constant start with MODEL_TRAINER var name
+"""
+
+MODEL_TRAINER_DIR_NAME: str = "model_trainer"
+
+# Checkpoints live outside the timestamped run dir so a rerun can resume
+MODEL_TRAINER_CHECKPOINT_DIR_NAME: str = "checkpoints"
+
+MODEL_TRAINER_METRICS_FILE: str = "metrics.json"
+
+# YOLOv5 checkout (git clone https://github.com/ultralytics/yolov5)
+MODEL_TRAINER_YOLOV5_DIR: str = os.getenv("YOLOV5_DIR", "yolov5")
+
+MODEL_TRAINER_PRETRAINED_WEIGHT_NAME: str = "yolov5s.pt"
+
+MODEL_TRAINER_HYP_FILE: str = "data/hyps/hyp.scratch-low.yaml"
+
+# YOLOv5 run directory under the checkpoint dir
+MODEL_TRAINER_RUN_NAME: str = "train"
+
+MODEL_TRAINER_IMG_SIZE: int = int(os.getenv("MODEL_TRAINER_IMG_SIZE", "640"))
+
+MODEL_TRAINER_NO_EPOCHS: int = int(os.getenv("MODEL_TRAINER_NO_EPOCHS", "1"))
+
+MODEL_TRAINER_BATCH_SIZE: int = int(os.getenv("MODEL_TRAINER_BATCH_SIZE", "16"))
+
+# YOLOv5's own image cache: "ram", "disk" or "" for none. With "ram" each
+# image is decoded and resized once, not every epoch, and the forked
+# DataLoader workers share the cache; YOLOv5 falls back to decoding from
+# disk when the dataset would not fit in memory
+MODEL_TRAINER_CACHE: str = os.getenv("MODEL_TRAINER_CACHE", "ram")
+
+MODEL_TRAINER_NUM_WORKERS: int = int(
+    os.getenv("MODEL_TRAINER_NUM_WORKERS", str(min(8, os.cpu_count() or 1)))
+)
+
+# Intra-op threads of the training process; loader workers get one each
+MODEL_TRAINER_NUM_THREADS: int = int(
+    os.getenv("MODEL_TRAINER_NUM_THREADS", str(os.cpu_count() or 1))
+)
 
 
 """
@@ -38,3 +149,16 @@ MODEL PUSHER related constant start with MODEL_PUSHER var name
 BUCKET_NAME = "sign-lang-2026-vivek"
 S3_MODEL_NAME = "best.pt"
 
+"""
+S3 transfer related constants start with S3_ var name
+"""
+
+S3_MULTIPART_THRESHOLD: int = int(os.getenv("S3_MULTIPART_THRESHOLD", str(16 * 1024 * 1024)))
+S3_MULTIPART_CHUNKSIZE: int = int(os.getenv("S3_MULTIPART_CHUNKSIZE", str(16 * 1024 * 1024)))
+S3_MAX_CONCURRENCY: int = int(os.getenv("S3_MAX_CONCURRENCY", "8"))
+S3_STREAM_CHUNK_SIZE: int = 1024 * 1024
+S3_ENDPOINT_URL = os.getenv("S3_ENDPOINT_URL") or None
+S3_MAX_POOL_CONNECTIONS: int = int(os.getenv("S3_MAX_POOL_CONNECTIONS", str(max(10, 2 * S3_MAX_CONCURRENCY))))
+S3_MAX_ATTEMPTS: int = int(os.getenv("S3_MAX_ATTEMPTS", "5"))
+S3_CONNECT_TIMEOUT_S: float = float(os.getenv("S3_CONNECT_TIMEOUT_S", "5"))
+S3_READ_TIMEOUT_S: float = float(os.getenv("S3_READ_TIMEOUT_S", "60"))
@@ -1,4 +1,5 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import List
 
 
 @dataclass
@@ -10,3 +11,24 @@ class DataIngestionArtifact:
 @dataclass
 class DataValidationArtifact:
     validation_status: bool
+    report_file_path: str = None
+
+
+@dataclass
+class DataDedupArtifact:
+    report_file_path: str
+    data_yaml_path: str
+    num_images: int
+    num_groups: int
+    num_excluded: int
+
+
+@dataclass
+class ModelTrainerArtifact:
+    trained_model_file_path: str
+    last_checkpoint_path: str
+    metrics_file_path: str
+    epochs_completed: int
+    images_per_sec: float
+    epoch_times_s: List[float] = field(default_factory=list)
+    peak_rss_mb: float = 0.0
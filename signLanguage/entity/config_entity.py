@@ -6,13 +6,19 @@ from signLanguage.constant.training_pipeline import *
 
 
 # Timestamp for artifacts
-TIMESTAMP: str = datetime.now().strftime("%m_%d_%Y_%H_%M_%S")
+TIMESTAMP: str = PIPELINE_RUN_ID or datetime.now().strftime("%m_%d_%Y_%H_%M_%S")
 
 
 @dataclass
 class TrainingPipelineConfig:
     artifacts_dir: str = os.path.join(ARTIFACTS_DIR, TIMESTAMP)
 
+    artifact_store_dir: str = os.path.join(ARTIFACTS_DIR, ARTIFACT_STORE_DIR_NAME)
+
+    state_file_path: str = os.path.join(artifacts_dir, PIPELINE_STATE_FILE)
+
+    max_parallel_stages: int = PIPELINE_MAX_PARALLEL_STAGES
+
 
 # Create a single instance to reuse across configs
 training_pipeline_config: TrainingPipelineConfig = TrainingPipelineConfig()
@@ -36,6 +42,14 @@ class DataIngestionConfig:
     )
 
     data_download_url: str = DATA_DOWNLOAD_URL
+
+    data_download_sha256: str = DATA_DOWNLOAD_SHA256
+
+    download_part_size: int = DATA_INGESTION_PART_SIZE
+
+    max_workers: int = DATA_INGESTION_MAX_WORKERS
+
+    artifact_store_dir: str = training_pipeline_config.artifact_store_dir
     
     
 @dataclass
@@ -52,3 +66,85 @@ class DataValidationConfig:
 
     required_file_list = DATA_VALIDATION_ALL_REQUIRED_FILES
 
+    report_file_path: str = os.path.join(
+        data_validation_dir,
+        DATA_VALIDATION_REPORT_FILE
+    )
+
+    manifest_file_path: str = os.path.join(
+        training_pipeline_config.artifact_store_dir,
+        DATA_VALIDATION_MANIFEST_FILE
+    )
+
+    max_workers: int = DATA_VALIDATION_MAX_WORKERS
+
+    artifact_store_dir: str = training_pipeline_config.artifact_store_dir
+
+
+@dataclass
+class DataDedupConfig:
+    data_dedup_dir: str = os.path.join(
+        training_pipeline_config.artifacts_dir,
+        DATA_DEDUP_DIR_NAME
+    )
+
+    report_file_path: str = os.path.join(
+        data_dedup_dir,
+        DATA_DEDUP_REPORT_FILE
+    )
+
+    data_yaml_file_path: str = os.path.join(
+        data_dedup_dir,
+        DATA_DEDUP_DATA_YAML_FILE
+    )
+
+    hamming_radius: int = DATA_DEDUP_HAMMING_RADIUS
+
+    action: str = DATA_DEDUP_ACTION
+
+    collected_images_dir: str = COLLECTED_IMAGES_DIR
+
+    max_workers: int = DATA_DEDUP_MAX_WORKERS
+
+    artifact_store_dir: str = training_pipeline_config.artifact_store_dir
+
+
+@dataclass
+class ModelTrainerConfig:
+    model_trainer_dir: str = os.path.join(
+        training_pipeline_config.artifacts_dir,
+        MODEL_TRAINER_DIR_NAME
+    )
+
+    checkpoint_dir: str = os.path.join(
+        ARTIFACTS_DIR,
+        MODEL_TRAINER_DIR_NAME,
+        MODEL_TRAINER_CHECKPOINT_DIR_NAME
+    )
+
+    metrics_file_path: str = os.path.join(
+        model_trainer_dir,
+        MODEL_TRAINER_METRICS_FILE
+    )
+
+    yolov5_dir: str = MODEL_TRAINER_YOLOV5_DIR
+
+    weight_name: str = MODEL_TRAINER_PRETRAINED_WEIGHT_NAME
+
+    hyp_file: str = MODEL_TRAINER_HYP_FILE
+
+    run_name: str = MODEL_TRAINER_RUN_NAME
+
+    no_epochs: int = MODEL_TRAINER_NO_EPOCHS
+
+    batch_size: int = MODEL_TRAINER_BATCH_SIZE
+
+    img_size: int = MODEL_TRAINER_IMG_SIZE
+
+    cache: str = MODEL_TRAINER_CACHE
+
+    num_workers: int = MODEL_TRAINER_NUM_WORKERS
+
+    num_threads: int = MODEL_TRAINER_NUM_THREADS
+
+    resume: bool = True
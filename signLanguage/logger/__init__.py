@@ -1,19 +1,93 @@
+"""
+Logging for the training pipeline: handlers only enqueue records and a
+QueueListener thread writes them as JSON lines into a size-rotated
+log/<timestamp>.log, so stages never block on log file I/O.
+
+Only the entry point configures logging (configure_logging), so the
+modules re-imported by spawn and forkserver pool workers open no log file
+of their own. Pool workers instead send their records to the parent's
+listener through a multiprocessing queue (init_worker_logging).
+
+Records logged while a pipeline stage runs carry its name (see
+stage_var); stage timings come through `extra=`.
+"""
+import atexit
+import contextvars
 import logging
 import os
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
 from from_root import from_root
 
+from signLanguage.utils.json_logging import configure_queue_logging
+
 
 LOG_FILE = f"{datetime.now().strftime('%m_%d_%Y_%H_%M_%S')}.log"
 
-log_path = os.path.join(from_root(), 'log', LOG_FILE)
+log_dir = os.path.join(from_root(), 'log')
+
+os.makedirs(log_dir, exist_ok=True)
+
+lOG_FILE_PATH = os.path.join(log_dir, LOG_FILE)
+
+LOG_MAX_BYTES = int(os.getenv("LOG_MAX_BYTES", str(10 * 1024 * 1024)))
+LOG_BACKUP_COUNT = int(os.getenv("LOG_BACKUP_COUNT", "5"))
+
+stage_var: contextvars.ContextVar = contextvars.ContextVar("stage", default=None)
+
+
+class StageContextFilter(logging.Filter):
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.stage = getattr(record, "stage", None) or stage_var.get()
+        return True
+
+
+listener: Optional[QueueListener] = None
+
+_worker_queue = None
+
+
+def configure_logging() -> QueueListener:
+    """
+    Routes root logging to the log file; called once by the entry point
+    """
+    global listener
+    if listener is None:
+        listener = configure_queue_logging(
+            lOG_FILE_PATH, StageContextFilter(), LOG_MAX_BYTES, LOG_BACKUP_COUNT
+        )
+    return listener
+
+
+def worker_log_queue(context) -> Optional[object]:
+    """
+    A queue of the multiprocessing context for pool workers to log into,
+    relayed to the log file by a second listener in this process. None
+    while logging is not configured, so workers keep the default handling.
+    """
+    global _worker_queue
+    if listener is None:
+        return None
+    if _worker_queue is None:
+        _worker_queue = context.Queue()
+        relay = QueueListener(_worker_queue, *listener.handlers, respect_handler_level=True)
+        relay.start()
+        atexit.register(relay.stop)
+    return _worker_queue
 
-os.makedirs(log_path, exist_ok=True)
 
-lOG_FILE_PATH = os.path.join(log_path, LOG_FILE)
+def init_worker_logging(log_queue, stage: Optional[str]) -> None:
+    """
+    Process pool initializer: the worker's records go to the parent's log
+    queue, stamped with the stage that started the pool
+    """
+    stage_var.set(stage)
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.addFilter(StageContextFilter())
 
-logging.basicConfig(
-    filename=lOG_FILE_PATH,
-    format= "[ %(asctime)s ] %(name)s - %(levelname)s - %(message)s",
-    level= logging.INFO
-)
\ No newline at end of file
+    root = logging.getLogger()
+    root.setLevel(logging.INFO)
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
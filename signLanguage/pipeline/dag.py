@@ -0,0 +1,279 @@
+import os
+import sys
+import json
+import time
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from dataclasses import asdict, dataclass, is_dataclass
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+import psutil
+
+from signLanguage.logger import logging, stage_var
+from signLanguage.exception import SignException
+from signLanguage.utils.main_utils import read_json, write_json
+
+
+@dataclass
+class Stage:
+    """
+    One pipeline step. `run` gets a dict of the artifacts named in
+    `inputs` and returns the artifact published as `output`. When `when`
+    returns False the stage and everything downstream of it is skipped.
+    """
+    name: str
+    run: Callable[[Dict[str, Any]], Any]
+    inputs: Tuple[str, ...] = ()
+    output: Optional[str] = None
+    output_type: Optional[type] = None
+    when: Optional[Callable[[Dict[str, Any]], bool]] = None
+
+
+class MemoryMonitor:
+    """
+    Samples the RSS of this process and its children in the background,
+    so each stage can report the peak seen while it ran. Stages share the
+    process, so concurrent stages see the same peak.
+    """
+
+    def __init__(self, interval: float = 0.1):
+        self.interval = interval
+        self.process = psutil.Process()
+        self._marks: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def rss_mb(self) -> float:
+        rss = self.process.memory_info().rss
+        for child in self.process.children(recursive=True):
+            try:
+                rss += child.memory_info().rss
+            except psutil.Error:
+                pass
+        return rss / 2 ** 20
+
+    def _sample(self) -> None:
+        while not self._stop.wait(self.interval):
+            current = self.rss_mb()
+            with self._lock:
+                for name, peak in self._marks.items():
+                    self._marks[name] = max(peak, current)
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._sample, name="memory-monitor", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def begin(self, name: str) -> None:
+        with self._lock:
+            self._marks[name] = self.rss_mb()
+
+    def end(self, name: str) -> float:
+        current = self.rss_mb()
+        with self._lock:
+            return max(self._marks.pop(name), current)
+
+
+def fingerprint(artifacts: Dict[str, Any]) -> str:
+    content = {
+        name: asdict(artifact) if is_dataclass(artifact) else artifact
+        for name, artifact in artifacts.items()
+    }
+    return hashlib.sha256(
+        json.dumps(content, sort_keys=True, default=str).encode()
+    ).hexdigest()
+
+
+def outputs_exist(artifact: dict) -> bool:
+    return all(
+        os.path.exists(value)
+        for key, value in artifact.items()
+        if key.endswith("_path") and isinstance(value, str) and value
+    )
+
+
+class PipelineDAG:
+    """
+    Runs stages as soon as their input artifacts exist, with independent
+    stages in parallel threads (in the training pipeline that is data
+    validation and dedup, after ingestion). The heavy stages fan out to
+    their own process pools, which start their workers with forkserver or
+    spawn rather than fork, since other threads are alive by then. That
+    goes through a multiprocessing context (process_pool); the global
+    start method is left alone, so the YOLOv5 DataLoader still forks its
+    workers and they share its image cache.
+
+    Finished stages are recorded in a state file with a fingerprint of
+    their inputs; a rerun against the same state file reuses a stage's
+    artifact instead of running it again as long as the inputs match and
+    the files it points to are still there. Each stage reports its wall
+    time and peak memory.
+    """
+
+    def __init__(self, stages: Iterable[Stage], state_file_path: str, max_workers: int = 2):
+        self.stages = {stage.name: stage for stage in stages}
+        self.state_file_path = state_file_path
+        self.max_workers = max(1, max_workers)
+
+        self.producers = {
+            stage.output: stage.name for stage in self.stages.values() if stage.output
+        }
+        for stage in self.stages.values():
+            missing = [name for name in stage.inputs if name not in self.producers]
+            if missing:
+                raise ValueError(f"Stage {stage.name} needs unknown artifacts {missing}")
+
+    def required_stages(self, targets: Optional[Iterable[str]]) -> list:
+        """
+        The targets and every stage they depend on, in declaration order
+        """
+        if not targets:
+            return list(self.stages)
+
+        needed, pending = set(), list(targets)
+        while pending:
+            name = pending.pop()
+            if name not in self.stages:
+                raise ValueError(f"Unknown stage {name}")
+            if name not in needed:
+                needed.add(name)
+                pending.extend(self.producers[a] for a in self.stages[name].inputs)
+        return [name for name in self.stages if name in needed]
+
+    def _try_reuse(self, stage: Stage, record: dict, inputs_key: str):
+        if (
+            record.get("status") != "done"
+            or record.get("inputs_key") != inputs_key
+            or stage.output_type is None
+            or not outputs_exist(record.get("artifact") or {})
+        ):
+            return None
+        try:
+            return stage.output_type(**record["artifact"])
+        except TypeError:
+            # Recorded by an older version of the artifact; run it again
+            return None
+
+    def _run_stage(self, stage: Stage, inputs: dict, monitor: MemoryMonitor) -> tuple:
+        token = stage_var.set(stage.name)
+        monitor.begin(stage.name)
+        start = time.perf_counter()
+        try:
+            artifact = stage.run(inputs)
+        finally:
+            wall_time = time.perf_counter() - start
+            peak = monitor.end(stage.name)
+            stage_var.reset(token)
+        return artifact, wall_time, peak
+
+    def run(self, targets: Optional[Iterable[str]] = None, force: Iterable[str] = ()) -> dict:
+        """
+        Runs the target stages (all by default) and their dependencies.
+        Stages in `force` run even if a finished result is recorded.
+        Returns the artifacts by name.
+        """
+        try:
+            order = self.required_stages(targets)
+            force = set(force)
+            state = read_json(self.state_file_path) or {}
+            os.makedirs(os.path.dirname(self.state_file_path) or ".", exist_ok=True)
+
+            artifacts: Dict[str, Any] = {}
+            remaining = list(order)
+            skipped = set()
+            running = {}
+            failure = None
+
+            def record(name: str, entry: dict) -> None:
+                state[name] = entry
+                write_json(self.state_file_path, state)
+
+            monitor = MemoryMonitor()
+            monitor.start()
+            try:
+                with ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="stage"
+                ) as pool:
+                    while remaining or running:
+                        progressed = failure is None
+                        while progressed:
+                            progressed = False
+                            for name in list(remaining):
+                                stage = self.stages[name]
+                                if any(self.producers[a] in skipped for a in stage.inputs):
+                                    remaining.remove(name)
+                                    skipped.add(name)
+                                    progressed = True
+                                    logging.info(f"Stage {name} skipped: an upstream stage was skipped")
+                                    continue
+                                if not all(a in artifacts for a in stage.inputs):
+                                    continue
+
+                                remaining.remove(name)
+                                progressed = True
+                                inputs = {a: artifacts[a] for a in stage.inputs}
+
+                                if stage.when is not None and not stage.when(inputs):
+                                    skipped.add(name)
+                                    logging.info(f"Stage {name} skipped: its condition is not met")
+                                    continue
+
+                                inputs_key = fingerprint(inputs)
+                                reused = None
+                                if name not in force:
+                                    reused = self._try_reuse(stage, state.get(name, {}), inputs_key)
+                                if reused is not None:
+                                    artifacts[stage.output] = reused
+                                    logging.info(f"Stage {name} already finished; reusing its artifact")
+                                    continue
+
+                                logging.info(f"Stage {name} started")
+                                future = pool.submit(self._run_stage, stage, inputs, monitor)
+                                running[future] = (name, inputs_key)
+
+                        if not running:
+                            if remaining and failure is None:
+                                raise RuntimeError(f"Stages {remaining} can never run")
+                            break
+
+                        done, _ = wait(running, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            name, inputs_key = running.pop(future)
+                            stage = self.stages[name]
+                            try:
+                                artifact, wall_time, peak = future.result()
+                            except Exception as e:
+                                logging.exception(f"Stage {name} failed")
+                                record(name, {"status": "failed", "error": str(e)})
+                                failure = failure or e
+                                continue
+
+                            if stage.output:
+                                artifacts[stage.output] = artifact
+                            record(name, {
+                                "status": "done",
+                                "inputs_key": inputs_key,
+                                "artifact": asdict(artifact) if is_dataclass(artifact) else None,
+                                "wall_time_s": wall_time,
+                                "peak_rss_mb": peak,
+                            })
+                            logging.info(
+                                f"Stage {name} finished in {wall_time:.1f}s, peak RSS {peak:.0f} MB",
+                                extra={"stage": name, "wall_time_s": wall_time, "peak_rss_mb": peak},
+                            )
+            finally:
+                monitor.stop()
+
+            if failure is not None:
+                raise failure
+
+            return artifacts
+
+        except Exception as e:
+            raise SignException(e, sys)
@@ -1,24 +1,37 @@
+import os
 import sys
+from typing import Iterable, Optional
 
 from signLanguage.logger import logging
 from signLanguage.exception import SignException
 from signLanguage.components.data_ingestion import DataIngestion
 from signLanguage.components.data_validation import DataValidation
+from signLanguage.components.data_dedup import DataDedup
+from signLanguage.components.model_trainer import ModelTrainer
+from signLanguage.pipeline.dag import PipelineDAG, Stage
 from signLanguage.entity.config_entity import (
+    TrainingPipelineConfig,
     DataIngestionConfig,
-    DataValidationConfig
+    DataValidationConfig,
+    DataDedupConfig,
+    ModelTrainerConfig
 )
 from signLanguage.entity.artifacts_entity import (
     DataIngestionArtifact,
-    DataValidationArtifact
+    DataValidationArtifact,
+    DataDedupArtifact,
+    ModelTrainerArtifact
 )
 
 
 class TrainPipeline:
     def __init__(self):
         try:
+            self.training_pipeline_config = TrainingPipelineConfig()
             self.data_ingestion_config = DataIngestionConfig()
             self.data_validation_config = DataValidationConfig()
+            self.data_dedup_config = DataDedupConfig()
+            self.model_trainer_config = ModelTrainerConfig()
         except Exception as e:
             raise SignException(e, sys)
 
@@ -79,13 +92,115 @@ class TrainPipeline:
         except Exception as e:
             raise SignException(e, sys) from e
 
-    def run_pipeline(self) -> None:
+    def start_data_dedup(
+        self,
+        data_ingestion_artifact: DataIngestionArtifact
+    ) -> DataDedupArtifact:
+
+        logging.info(
+            "Entered the start_data_dedup method of TrainPipeline class"
+        )
+
+        try:
+            data_dedup = DataDedup(
+                data_ingestion_artifact=data_ingestion_artifact,
+                data_dedup_config=self.data_dedup_config,
+            )
+
+            data_dedup_artifact = data_dedup.initiate_data_dedup()
+
+            logging.info(
+                "Exited the start_data_dedup method of TrainPipeline class"
+            )
+
+            return data_dedup_artifact
+
+        except Exception as e:
+            raise SignException(e, sys) from e
+
+    def start_model_trainer(
+        self,
+        data_dedup_artifact: DataDedupArtifact
+    ) -> ModelTrainerArtifact:
+
+        logging.info(
+            "Entered the start_model_trainer method of TrainPipeline class"
+        )
+
         try:
-            data_ingestion_artifact = self.start_data_ingestion()
+            model_trainer = ModelTrainer(
+                data_dedup_artifact=data_dedup_artifact,
+                model_trainer_config=self.model_trainer_config,
+            )
+
+            model_trainer_artifact = model_trainer.initiate_model_trainer()
+
+            logging.info(
+                "Exited the start_model_trainer method of TrainPipeline class"
+            )
+
+            return model_trainer_artifact
+
+        except Exception as e:
+            raise SignException(e, sys) from e
 
-            data_validation_artifact = self.start_data_validation(
-                data_ingestion_artifact=data_ingestion_artifact
+    def stages(self) -> list:
+        """
+        The pipeline as a DAG: each stage names the artifacts it consumes
+        and the one it produces; validation and dedup only need the
+        ingested data and run side by side.
+        """
+        return [
+            Stage(
+                name="data_ingestion",
+                run=lambda a: self.start_data_ingestion(),
+                output="data_ingestion_artifact",
+                output_type=DataIngestionArtifact,
+            ),
+            Stage(
+                name="data_validation",
+                run=lambda a: self.start_data_validation(a["data_ingestion_artifact"]),
+                inputs=("data_ingestion_artifact",),
+                output="data_validation_artifact",
+                output_type=DataValidationArtifact,
+            ),
+            Stage(
+                name="data_dedup",
+                run=lambda a: self.start_data_dedup(a["data_ingestion_artifact"]),
+                inputs=("data_ingestion_artifact",),
+                output="data_dedup_artifact",
+                output_type=DataDedupArtifact,
+            ),
+            Stage(
+                name="model_trainer",
+                run=lambda a: self.start_model_trainer(a["data_dedup_artifact"]),
+                inputs=("data_validation_artifact", "data_dedup_artifact"),
+                output="model_trainer_artifact",
+                output_type=ModelTrainerArtifact,
+                when=lambda a: a["data_validation_artifact"].validation_status,
+            ),
+        ]
+
+    def run_pipeline(
+        self,
+        targets: Optional[Iterable[str]] = None,
+        force: Iterable[str] = ()
+    ) -> dict:
+        """
+        Runs the target stages (all by default) and what they depend on;
+        stages already finished in this run are reused unless forced
+        """
+        try:
+            logging.info(
+                f"Pipeline run {os.path.basename(self.training_pipeline_config.artifacts_dir)}; "
+                f"set PIPELINE_RUN_ID to it to rerun this run"
+            )
+            dag = PipelineDAG(
+                self.stages(),
+                state_file_path=self.training_pipeline_config.state_file_path,
+                max_workers=self.training_pipeline_config.max_parallel_stages,
             )
+            return dag.run(targets=targets, force=force)
 
         except Exception as e:
             raise SignException(e, sys)
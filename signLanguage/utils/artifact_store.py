@@ -0,0 +1,168 @@
+import os
+import sys
+import json
+import shutil
+import hashlib
+from datetime import datetime
+from typing import Callable, Optional, Tuple
+
+from signLanguage.logger import logging
+from signLanguage.exception import SignException
+from signLanguage.utils.main_utils import read_json, write_json
+
+
+MANIFEST_FILE_NAME = "manifest.json"
+BUILDING_SUFFIX = ".building"
+# One record per path link() created, so only those are ever replaced
+LINKS_DIR_NAME = "links"
+
+
+def make_link(src: str, dst: str) -> None:
+    """
+    Makes dst point at src without copying: a hardlink for files, a
+    symlink for directories. Falls back to a copy where links are not
+    allowed (e.g. symlinks on Windows without developer mode).
+    """
+    parent = os.path.dirname(dst)
+    if parent:
+        os.makedirs(parent, exist_ok=True)
+
+    if os.path.isdir(src):
+        try:
+            os.symlink(src, dst, target_is_directory=True)
+        except OSError:
+            shutil.copytree(src, dst)
+    else:
+        try:
+            os.link(src, dst)
+        except OSError:
+            try:
+                os.symlink(src, dst)
+            except OSError:
+                shutil.copy2(src, dst)
+
+
+def remove_path(path: str) -> None:
+    if os.path.islink(path) or os.path.isfile(path):
+        os.remove(path)
+    elif os.path.isdir(path):
+        shutil.rmtree(path)
+
+
+class ArtifactStore:
+    """
+    Content-addressed store of pipeline stage outputs.
+
+    A stage's outputs live in a directory named after the hash of the
+    stage name and its inputs/config. Runs that hash to an existing entry
+    reuse it instead of recomputing; per-run artifact directories only
+    hold links into the store.
+    """
+
+    def __init__(self, root_dir: str):
+        self.root_dir = root_dir
+        os.makedirs(root_dir, exist_ok=True)
+
+    @staticmethod
+    def key_for(stage: str, inputs: dict) -> str:
+        payload = json.dumps({"stage": stage, "inputs": inputs}, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def object_dir(self, key: str) -> str:
+        return os.path.join(self.root_dir, key[:2], key)
+
+    def _link_record_path(self, dst: str) -> str:
+        digest = hashlib.sha256(os.path.abspath(dst).encode()).hexdigest()
+        return os.path.join(self.root_dir, LINKS_DIR_NAME, f"{digest}.json")
+
+    def owns(self, path: str) -> bool:
+        """
+        True if path is a link into the store or was created by link()
+        (a hardlink or copy made where links are not allowed)
+        """
+        root = os.path.realpath(self.root_dir) + os.sep
+        if os.path.islink(path) and os.path.realpath(path).startswith(root):
+            return True
+        return read_json(self._link_record_path(path)) is not None
+
+    def link(self, src: str, dst: str) -> str:
+        """
+        Points dst at src (a path inside the store). A dst that is already
+        there is only replaced when the store created it; anything else
+        raises FileExistsError rather than being deleted.
+        """
+        src = os.path.realpath(src)
+
+        if os.path.lexists(dst):
+            if os.path.realpath(dst) == src or (
+                os.path.isfile(dst) and os.path.samefile(dst, src)
+            ):
+                return dst
+            if not self.owns(dst):
+                raise FileExistsError(
+                    f"{dst} exists and was not created by the artifact store; "
+                    f"not replacing it"
+                )
+            remove_path(dst)
+
+        make_link(src, dst)
+        if not os.path.islink(dst):
+            record_path = self._link_record_path(dst)
+            os.makedirs(os.path.dirname(record_path), exist_ok=True)
+            write_json(record_path, {
+                "path": os.path.abspath(dst),
+                "src": src,
+            })
+        return dst
+
+    def lookup(self, key: str) -> Optional[dict]:
+        """
+        Returns the manifest of a completed entry, or None
+        """
+        return read_json(os.path.join(self.object_dir(key), MANIFEST_FILE_NAME))
+
+    def run_cached(
+        self,
+        stage: str,
+        inputs: dict,
+        build: Callable[[str], dict],
+    ) -> Tuple[str, dict]:
+        """
+        Returns (object_dir, outputs) for the stage. On a miss, build is
+        called with a work directory to write its outputs into and must
+        return a JSON-serialisable dict describing them (paths relative to
+        the directory). The work directory survives a failed build so
+        resumable steps can pick up where they stopped.
+        """
+        try:
+            key = self.key_for(stage, inputs)
+            object_dir = self.object_dir(key)
+
+            manifest = self.lookup(key)
+            if manifest is not None:
+                logging.info(f"Reusing cached {stage} outputs from {object_dir}")
+                return object_dir, manifest["outputs"]
+
+            work_dir = object_dir + BUILDING_SUFFIX
+            os.makedirs(work_dir, exist_ok=True)
+
+            logging.info(f"No cached {stage} outputs, building into {work_dir}")
+            outputs = build(work_dir)
+
+            write_json(os.path.join(work_dir, MANIFEST_FILE_NAME), {
+                "stage": stage,
+                "key": key,
+                "inputs": inputs,
+                "outputs": outputs,
+                "created_at": datetime.now().isoformat(),
+            })
+
+            # A manifest-less leftover is an incomplete earlier entry
+            if os.path.isdir(object_dir):
+                shutil.rmtree(object_dir)
+            os.replace(work_dir, object_dir)
+
+            return object_dir, outputs
+
+        except Exception as e:
+            raise SignException(e, sys)
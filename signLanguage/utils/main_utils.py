@@ -0,0 +1,392 @@
+import os
+import sys
+import json
+import hashlib
+import multiprocessing
+import re
+import threading
+import urllib.request
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import List, Optional, Tuple
+
+import yaml
+
+from signLanguage.logger import init_worker_logging, logging, stage_var, worker_log_queue
+from signLanguage.exception import SignException
+from signLanguage.constant.training_pipeline import (
+    COLLECTED_IMAGES_LABEL_ALIASES,
+    DATA_INGESTION_TIMEOUT_S,
+)
+
+
+HASH_CHUNK_SIZE = 1024 * 1024
+STREAM_CHUNK_SIZE = 256 * 1024
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp")
+
+# Pipeline stages run on threads next to the memory monitor and the log
+# listener; a child forked while one of them holds a lock (logging, malloc)
+# can deadlock, so worker processes are never forked from this process
+SAFE_START_METHOD = (
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
+
+
+def sha256_file(file_path: str) -> str:
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def process_pool(max_workers: int) -> ProcessPoolExecutor:
+    """
+    ProcessPoolExecutor whose workers start with SAFE_START_METHOD and log
+    through this process' log file
+    """
+    context = multiprocessing.get_context(SAFE_START_METHOD)
+    log_queue = worker_log_queue(context)
+    if log_queue is None:
+        return ProcessPoolExecutor(max_workers=max_workers, mp_context=context)
+
+    return ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=context,
+        initializer=init_worker_logging,
+        initargs=(log_queue, stage_var.get()),
+    )
+
+
+def read_json(file_path: str) -> Optional[dict]:
+    try:
+        with open(file_path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def write_json(file_path: str, content: dict) -> None:
+    """
+    Writes through a temporary file so readers never see a partial file
+    """
+    tmp_path = file_path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(content, f, indent=2)
+    os.replace(tmp_path, file_path)
+
+
+def peak_rss_mb(include_children: bool = False) -> float:
+    """
+    Peak resident set size of this process (or of its largest reaped
+    child, if bigger) in MB
+    """
+    try:
+        import resource
+    except ImportError:
+        # Windows: psutil exposes the peak working set instead
+        import psutil
+        info = psutil.Process().memory_info()
+        return getattr(info, "peak_wset", info.rss) / 2 ** 20
+
+    # ru_maxrss is in KB on Linux and in bytes on macOS
+    scale = 1 if sys.platform == "darwin" else 1024
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if include_children:
+        peak = max(peak, resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    return peak * scale / 2 ** 20
+
+
+def probe_url(url: str, timeout: float = DATA_INGESTION_TIMEOUT_S) -> Tuple[int, bool, str]:
+    """
+    Returns (size, supports_ranges, etag) using a one-byte ranged GET,
+    which, unlike HEAD, survives redirects (e.g. GitHub raw links)
+    """
+    request = urllib.request.Request(url, headers={"Range": "bytes=0-0"})
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        etag = response.headers.get("ETag", "")
+        content_range = response.headers.get("Content-Range", "")
+        match = re.match(r"bytes \d+-\d+/(\d+)", content_range)
+
+        if response.status == 206 and match:
+            return int(match.group(1)), True, etag
+
+        return int(response.headers.get("Content-Length", 0)), False, etag
+
+
+def _fetch_range(url: str, file_path: str, start: int, end: int, timeout: float) -> None:
+    request = urllib.request.Request(url, headers={"Range": f"bytes={start}-{end}"})
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        if response.status != 206:
+            raise IOError(f"Server ignored range request for {url}")
+
+        # One handle per part keeps the writes independent across threads
+        with open(file_path, "r+b") as f:
+            f.seek(start)
+            received = 0
+            for chunk in iter(lambda: response.read(STREAM_CHUNK_SIZE), b""):
+                f.write(chunk)
+                received += len(chunk)
+
+    # read(n) returns b"" on a dropped connection instead of raising, so a
+    # short part must not be recorded as done
+    if received != end - start + 1:
+        raise IOError(
+            f"Incomplete range {start}-{end} of {url}: got {received} bytes"
+        )
+
+
+def download_url(
+    url: str,
+    file_path: str,
+    part_size: int,
+    max_workers: int,
+    timeout: float = DATA_INGESTION_TIMEOUT_S,
+) -> dict:
+    """
+    Downloads url to file_path with parallel HTTP range requests.
+
+    Parts land in <file_path>.part and finished parts are recorded in
+    <file_path>.part.json, so an interrupted download resumes where it
+    stopped as long as the remote size and ETag are unchanged. Servers
+    without range support get a plain streaming GET. Returns the remote
+    metadata (url, size, etag) of the downloaded file.
+    """
+    try:
+        size, supports_ranges, etag = probe_url(url, timeout)
+        remote = {"url": url, "size": size, "etag": etag}
+
+        partial_path = file_path + ".part"
+        state_path = file_path + ".part.json"
+
+        if not supports_ranges or size == 0:
+            logging.info(f"{url} does not support range requests; streaming it")
+            with urllib.request.urlopen(url, timeout=timeout) as response, \
+                    open(partial_path, "wb") as f:
+                for chunk in iter(lambda: response.read(STREAM_CHUNK_SIZE), b""):
+                    f.write(chunk)
+            if size and os.path.getsize(partial_path) != size:
+                raise IOError(f"Incomplete download of {url}")
+            os.replace(partial_path, file_path)
+            return remote
+
+        state = read_json(state_path)
+        if (
+            state is None
+            or not os.path.exists(partial_path)
+            or {k: state.get(k) for k in remote} != remote
+            or state.get("part_size") != part_size
+        ):
+            state = dict(remote, part_size=part_size, done=[])
+            with open(partial_path, "wb") as f:
+                f.truncate(size)
+            write_json(state_path, state)
+        else:
+            logging.info(
+                f"Resuming download of {url}: {len(state['done'])} parts already present"
+            )
+
+        parts = [
+            (index, start, min(start + part_size, size) - 1)
+            for index, start in enumerate(range(0, size, part_size))
+        ]
+        done = set(state["done"])
+        pending = [part for part in parts if part[0] not in done]
+        state_lock = threading.Lock()
+
+        def fetch(part):
+            index, start, end = part
+            _fetch_range(url, partial_path, start, end, timeout)
+            with state_lock:
+                done.add(index)
+                state["done"] = sorted(done)
+                write_json(state_path, state)
+
+        if pending:
+            workers = max(1, min(max_workers, len(pending)))
+            logging.info(f"Downloading {len(pending)} parts of {url} with {workers} workers")
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                list(pool.map(fetch, pending))
+
+        os.replace(partial_path, file_path)
+        os.remove(state_path)
+        return remote
+
+    except Exception as e:
+        raise SignException(e, sys)
+
+
+def _extract_members(zip_file_path: str, members: List[str], target_dir: str) -> None:
+    # ZipFile objects are not safe to share between threads
+    with zipfile.ZipFile(zip_file_path) as archive:
+        for member in members:
+            archive.extract(member, target_dir)
+
+
+def extract_zip_parallel(zip_file_path: str, target_dir: str, max_workers: int) -> int:
+    """
+    Extracts the archive with members split across worker threads
+    (decompression releases the GIL). Returns the number of members.
+    """
+    try:
+        target_root = os.path.realpath(target_dir)
+
+        with zipfile.ZipFile(zip_file_path) as archive:
+            members = archive.namelist()
+
+        for member in members:
+            destination = os.path.realpath(os.path.join(target_root, member))
+            if os.path.commonpath([target_root, destination]) != target_root:
+                raise ValueError(f"Unsafe path in archive: {member}")
+
+        files = [member for member in members if not member.endswith("/")]
+        for directory in {os.path.dirname(member) for member in files} | {
+            member for member in members if member.endswith("/")
+        }:
+            os.makedirs(os.path.join(target_root, directory), exist_ok=True)
+
+        workers = max(1, min(max_workers, len(files)))
+        chunks = [files[i::workers] for i in range(workers)]
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(
+                lambda chunk: _extract_members(zip_file_path, chunk, target_root),
+                chunks
+            ))
+
+        return len(files)
+
+    except Exception as e:
+        raise SignException(e, sys)
+
+
+def find_data_yaml(feature_store_path: str) -> str:
+    """
+    Path of the shallowest data.yaml under the feature store; exports
+    are often nested (e.g. sign_language_data/<export>/data.yaml)
+    """
+    for dirpath, dirnames, filenames in os.walk(feature_store_path, followlinks=True):
+        dirnames.sort()
+        if "data.yaml" in filenames:
+            return os.path.join(dirpath, "data.yaml")
+    raise FileNotFoundError(f"No data.yaml under {feature_store_path}")
+
+
+def load_data_yaml(path: str) -> Tuple[dict, str]:
+    """
+    (parsed data.yaml, directory containing it) for a data.yaml file or
+    for the one found under a feature store directory
+    """
+    data_yaml_path = path if os.path.isfile(path) else find_data_yaml(path)
+    with open(data_yaml_path) as f:
+        data = yaml.safe_load(f)
+    return data, os.path.dirname(data_yaml_path)
+
+
+def resolve_split_dir(dataset_root: str, split_path: str) -> str:
+    """
+    Resolves a data.yaml split path as YOLOv5 does: relative to the
+    directory of data.yaml, dropping a leading '../' when that does not
+    exist (Roboflow exports write '../train/images'). The 'path' key is
+    machine specific and ignored.
+    """
+    resolved = os.path.normpath(os.path.join(dataset_root, split_path))
+    if not os.path.exists(resolved) and split_path.startswith("../"):
+        resolved = os.path.normpath(os.path.join(dataset_root, split_path[3:]))
+    return resolved
+
+
+def label_path_for(image_path: str) -> str:
+    """
+    YOLOv5's label location for an image: the last /images/ component
+    swapped for /labels/ and the extension for .txt
+    """
+    sa, sb = f"{os.sep}images{os.sep}", f"{os.sep}labels{os.sep}"
+    return os.path.splitext(sb.join(image_path.rsplit(sa, 1)))[0] + ".txt"
+
+
+def list_split_images(dataset_root: str, split_path: str) -> List[str]:
+    """
+    Image paths of one data.yaml split, which is either an image
+    directory or a .txt file listing one image path per line
+    """
+    resolved = resolve_split_dir(dataset_root, split_path)
+    if os.path.isfile(resolved):
+        with open(resolved) as f:
+            lines = [line.strip() for line in f if line.strip()]
+        parent = os.path.dirname(resolved)
+        return [
+            os.path.normpath(os.path.join(parent, line)) if line.startswith("./") else line
+            for line in lines
+        ]
+    return [
+        os.path.join(resolved, name)
+        for name in sorted(os.listdir(resolved))
+        if name.lower().endswith(IMAGE_EXTENSIONS)
+    ]
+
+
+def _label_key(name: str) -> str:
+    return re.sub(r"[^0-9a-z]", "", name.lower())
+
+
+def collected_label_index(label: str, names: List[str]) -> int:
+    """
+    Index in names of the class a CollectedImages/<label>/ directory holds,
+    matched ignoring case and punctuation or through
+    COLLECTED_IMAGES_LABEL_ALIASES; -1 when none matches
+    """
+    keys = [_label_key(name) for name in names]
+    for candidate in (label, COLLECTED_IMAGES_LABEL_ALIASES.get(label, "")):
+        if candidate and _label_key(candidate) in keys:
+            return keys.index(_label_key(candidate))
+    return -1
+
+
+def list_dataset_samples(data_path: str, collected_images_dir: str = None) -> list:
+    """
+    (image path, label file path or None, image-level class or -1, split)
+    for the splits of a data.yaml (or of the one under a feature store)
+    and, when given, the CollectedImages/<label>/ dirs (split "collected")
+    """
+    data, dataset_root = load_data_yaml(data_path)
+    names = list(data["names"])
+
+    samples = []
+    seen_splits = set()
+    for key in ("train", "val", "test"):
+        if not data.get(key):
+            continue
+        split_path = resolve_split_dir(dataset_root, data[key])
+        if split_path in seen_splits:
+            continue
+        seen_splits.add(split_path)
+
+        for image_path in list_split_images(dataset_root, data[key]):
+            label_path = label_path_for(image_path)
+            samples.append((
+                image_path,
+                label_path if os.path.exists(label_path) else None,
+                -1,
+                key,
+            ))
+
+    if collected_images_dir and os.path.isdir(collected_images_dir):
+        for label in sorted(os.listdir(collected_images_dir)):
+            label_dir = os.path.join(collected_images_dir, label)
+            if not os.path.isdir(label_dir):
+                continue
+            image_label = collected_label_index(label, names)
+            if image_label == -1:
+                # Still hashed for duplicates (e.g. main/ holds copies of
+                # every label), just without an image-level class
+                logging.warning(
+                    f"{label_dir} matches no class in {names}; "
+                    f"including it unlabelled (see COLLECTED_IMAGES_LABEL_ALIASES)"
+                )
+            for name in sorted(os.listdir(label_dir)):
+                if name.lower().endswith(IMAGE_EXTENSIONS):
+                    samples.append((
+                        os.path.join(label_dir, name), None, image_label, "collected"
+                    ))
+
+    return samples
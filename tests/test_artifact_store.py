@@ -0,0 +1,99 @@
+import os
+
+import pytest
+
+from signLanguage.exception import SignException
+from signLanguage.utils.artifact_store import BUILDING_SUFFIX, ArtifactStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ArtifactStore(str(tmp_path / "store"))
+
+
+def build_counting(calls: list, content: str = "data"):
+    def build(work_dir):
+        calls.append(work_dir)
+        with open(os.path.join(work_dir, "out.txt"), "w") as f:
+            f.write(content)
+        return {"out": "out.txt"}
+    return build
+
+
+def test_same_stage_and_inputs_reuse_the_entry(store):
+    calls = []
+    inputs = {"url": "https://example.com/data.zip", "sha256": "abc"}
+
+    first_dir, outputs = store.run_cached("ingest", inputs, build_counting(calls))
+    second_dir, again = store.run_cached("ingest", dict(reversed(inputs.items())), build_counting(calls))
+
+    assert len(calls) == 1
+    assert (second_dir, again) == (first_dir, outputs)
+    with open(os.path.join(first_dir, outputs["out"])) as f:
+        assert f.read() == "data"
+    assert store.lookup(ArtifactStore.key_for("ingest", inputs))["inputs"] == inputs
+
+
+def test_changed_inputs_or_stage_get_their_own_entry(store):
+    calls = []
+    a, _ = store.run_cached("ingest", {"sha256": "abc"}, build_counting(calls))
+    b, _ = store.run_cached("ingest", {"sha256": "def"}, build_counting(calls))
+    c, _ = store.run_cached("extract", {"sha256": "abc"}, build_counting(calls))
+
+    assert len({a, b, c}) == 3
+    assert len(calls) == 3
+
+
+def test_failed_build_leaves_no_entry_and_keeps_its_work_dir(store):
+    def failing(work_dir):
+        with open(os.path.join(work_dir, "partial.bin"), "w") as f:
+            f.write("half")
+        raise IOError("connection reset")
+
+    with pytest.raises(SignException):
+        store.run_cached("ingest", {"sha256": "abc"}, failing)
+
+    key = ArtifactStore.key_for("ingest", {"sha256": "abc"})
+    assert store.lookup(key) is None
+    work_dir = store.object_dir(key) + BUILDING_SUFFIX
+    assert os.listdir(work_dir) == ["partial.bin"]
+
+    # The retry builds in the same work directory and completes the entry
+    seen = []
+    object_dir, _ = store.run_cached(
+        "ingest", {"sha256": "abc"},
+        lambda d: seen.append(sorted(os.listdir(d))) or {},
+    )
+    assert seen == [["partial.bin"]]
+    assert store.lookup(key) is not None
+    assert not os.path.exists(work_dir)
+
+
+def test_link_points_run_directories_into_the_store(store, tmp_path):
+    object_dir, outputs = store.run_cached("ingest", {}, build_counting([]))
+    src_file = os.path.join(object_dir, outputs["out"])
+
+    linked_file = store.link(src_file, str(tmp_path / "run1" / "out.txt"))
+    linked_dir = store.link(object_dir, str(tmp_path / "run1" / "feature_store"))
+
+    assert os.path.samefile(linked_file, src_file)
+    assert os.path.realpath(linked_dir) == os.path.realpath(object_dir)
+    assert store.owns(linked_file) and store.owns(linked_dir)
+
+
+def test_link_replaces_its_own_links_but_not_user_files(store, tmp_path):
+    old_dir, _ = store.run_cached("ingest", {"v": 1}, build_counting([], "old"))
+    new_dir, _ = store.run_cached("ingest", {"v": 2}, build_counting([], "new"))
+
+    dst = str(tmp_path / "run" / "feature_store")
+    store.link(old_dir, dst)
+    store.link(new_dir, dst)
+    with open(os.path.join(dst, "out.txt")) as f:
+        assert f.read() == "new"
+
+    user_dir = tmp_path / "run" / "data"
+    user_dir.mkdir()
+    (user_dir / "keep.txt").write_text("mine")
+    with pytest.raises(FileExistsError):
+        store.link(new_dir, str(user_dir))
+    assert (user_dir / "keep.txt").read_text() == "mine"
@@ -0,0 +1,126 @@
+import os
+import threading
+import time
+from dataclasses import dataclass
+
+import pytest
+
+from signLanguage.exception import SignException
+from signLanguage.pipeline.dag import PipelineDAG, Stage
+from signLanguage.utils.main_utils import read_json
+
+
+@dataclass
+class FileArtifact:
+    file_path: str
+
+
+class Pipeline:
+    """
+    ingest -> (validate, dedup) -> train, each stage writing one file and
+    recording its runs
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self.runs = []
+        self.fail = set()
+        self.validation_ok = True
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+
+    def stage(self, name, inputs=(), when=None):
+        def run(artifacts):
+            with self.lock:
+                self.active += 1
+                self.max_active = max(self.max_active, self.active)
+            try:
+                time.sleep(0.05)
+                self.runs.append(name)
+                if name in self.fail:
+                    raise RuntimeError(f"{name} failed")
+                path = os.path.join(self.root, f"{name}.txt")
+                with open(path, "w") as f:
+                    f.write(",".join(sorted(a.file_path for a in artifacts.values())))
+                return FileArtifact(file_path=path)
+            finally:
+                with self.lock:
+                    self.active -= 1
+
+        return Stage(
+            name=name, run=run, inputs=tuple(f"{i}_artifact" for i in inputs),
+            output=f"{name}_artifact", output_type=FileArtifact, when=when,
+        )
+
+    def dag(self):
+        return PipelineDAG([
+            self.stage("ingest"),
+            self.stage("validate", ("ingest",)),
+            self.stage("dedup", ("ingest",)),
+            self.stage(
+                "train", ("validate", "dedup"),
+                when=lambda a: self.validation_ok,
+            ),
+        ], state_file_path=os.path.join(self.root, "state", "pipeline_state.json"))
+
+
+@pytest.fixture
+def pipeline(tmp_path):
+    return Pipeline(str(tmp_path))
+
+
+def test_rerun_skips_finished_stages(pipeline):
+    artifacts = pipeline.dag().run()
+    assert sorted(pipeline.runs) == ["dedup", "ingest", "train", "validate"]
+    assert pipeline.max_active == 2
+
+    pipeline.runs.clear()
+    assert pipeline.dag().run() == artifacts
+    assert pipeline.runs == []
+
+    state = read_json(os.path.join(pipeline.root, "state", "pipeline_state.json"))
+    assert {name: entry["status"] for name, entry in state.items()} == dict.fromkeys(
+        ["ingest", "validate", "dedup", "train"], "done"
+    )
+    assert all(entry["wall_time_s"] > 0 for entry in state.values())
+
+
+def test_rerun_after_a_failure_resumes_at_the_failed_stage(pipeline):
+    pipeline.fail = {"dedup"}
+    with pytest.raises(SignException):
+        pipeline.dag().run()
+    assert "train" not in pipeline.runs
+
+    pipeline.fail.clear()
+    pipeline.runs.clear()
+    pipeline.dag().run()
+    assert pipeline.runs == ["dedup", "train"]
+
+
+def test_missing_output_or_forced_stage_runs_again(pipeline):
+    pipeline.dag().run()
+
+    os.remove(os.path.join(pipeline.root, "validate.txt"))
+    pipeline.runs.clear()
+    pipeline.dag().run()
+    # Fingerprints cover the artifacts, which name the same file again,
+    # so train's inputs are unchanged and it is reused
+    assert pipeline.runs == ["validate"]
+
+    pipeline.runs.clear()
+    pipeline.dag().run(force=["dedup", "train"])
+    assert sorted(pipeline.runs) == ["dedup", "train"]
+
+
+def test_targets_run_only_their_dependencies(pipeline):
+    pipeline.dag().run(targets=["validate"])
+    assert sorted(pipeline.runs) == ["ingest", "validate"]
+
+
+def test_false_condition_skips_the_stage(pipeline):
+    pipeline.validation_ok = False
+    artifacts = pipeline.dag().run()
+
+    assert "train" not in pipeline.runs
+    assert "train_artifact" not in artifacts
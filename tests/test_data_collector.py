@@ -0,0 +1,47 @@
+import cv2
+import numpy as np
+
+import data_collector
+from data_collector import ImageWriter, SyntheticSource, wait_grabbing
+
+
+class FakeVideoFile(SyntheticSource):
+    def __init__(self, frames: int, fps: float):
+        super().__init__(width=32, height=24)
+        self.frames, self.fps = frames, fps
+
+    def get(self, prop):
+        return {cv2.CAP_PROP_FRAME_COUNT: self.frames, cv2.CAP_PROP_FPS: self.fps}.get(prop, 0)
+
+    def grab(self) -> bool:
+        if self.count >= self.frames:
+            return False
+        return super().grab()
+
+
+def test_writer_survives_encoder_errors(tmp_path, monkeypatch):
+    real_imencode = cv2.imencode
+
+    def imencode(ext, frame, params):
+        if frame.shape[0] == 1:
+            raise cv2.error("bad frame")
+        return real_imencode(ext, frame, params)
+
+    monkeypatch.setattr(data_collector.cv2, "imencode", imencode)
+
+    writer = ImageWriter(threads=1, max_pending=1)
+    writer.submit(str(tmp_path / "bad.jpg"), np.zeros((1, 1, 3), np.uint8))
+    writer.submit(str(tmp_path / "good.jpg"), np.zeros((8, 8, 3), np.uint8))
+    writer.close()
+
+    assert (writer.written, writer.errors) == (1, 1)
+    assert (tmp_path / "good.jpg").exists()
+
+
+def test_wait_grabbing_steps_video_files_by_frame_count():
+    cap = FakeVideoFile(frames=1000, fps=25)
+    wait_grabbing(cap, 2.0)
+    assert cap.count == 50
+
+    wait_grabbing(cap, 100.0)
+    assert cap.count == 1000
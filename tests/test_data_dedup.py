@@ -0,0 +1,104 @@
+import os
+import shutil
+
+import pytest
+import yaml
+
+from signLanguage.components.data_dedup import DataDedup
+from signLanguage.entity.artifacts_entity import DataIngestionArtifact
+from signLanguage.entity.config_entity import DataDedupConfig
+from signLanguage.utils.main_utils import list_dataset_samples, read_json
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+COLLECTED_DIR = os.path.join(REPO_DIR, "CollectedImages")
+HELLO = "Hello.2427950c-f445-11f0-a488-98bd809af4ec"
+
+# As in the Roboflow export: lower-case names, no val split
+DATA_YAML = {
+    "train": "../train/images",
+    "test": "../test/images",
+    "nc": 6,
+    "names": ["I_love_u", "hello", "no", "please", "thanks", "yes"],
+}
+
+
+@pytest.fixture
+def dataset(tmp_path):
+    if not os.path.exists(os.path.join(COLLECTED_DIR, "Hello", HELLO + " - Copy.jpg")):
+        pytest.skip("CollectedImages not checked out")
+
+    collected = tmp_path / "CollectedImages"
+    for label in ("Hello", "IloveYou", "main"):
+        (collected / label).mkdir(parents=True)
+    for name in (HELLO + ".jpg", HELLO + " - Copy.jpg", HELLO + " - Copy (2).jpg"):
+        shutil.copy(os.path.join(COLLECTED_DIR, "Hello", name), collected / "Hello" / name)
+    love = sorted(os.listdir(os.path.join(COLLECTED_DIR, "IloveYou")))[0]
+    shutil.copy(os.path.join(COLLECTED_DIR, "IloveYou", love), collected / "IloveYou" / love)
+    shutil.copy(os.path.join(COLLECTED_DIR, "main", HELLO + ".jpg"), collected / "main" / (HELLO + ".jpg"))
+
+    export = tmp_path / "feature_store" / "export"
+    for split in ("train", "test"):
+        (export / split / "images").mkdir(parents=True)
+        (export / split / "labels").mkdir(parents=True)
+    for split, label, class_id in (("train", "No", 2), ("test", "Please", 3)):
+        name = sorted(os.listdir(os.path.join(COLLECTED_DIR, label)))[0]
+        shutil.copy(os.path.join(COLLECTED_DIR, label, name), export / split / "images" / "sign.jpg")
+        (export / split / "labels" / "sign.txt").write_text(f"{class_id} 0.5 0.5 0.2 0.2\n")
+    (export / "data.yaml").write_text(yaml.safe_dump(DATA_YAML))
+
+    return tmp_path
+
+
+def make_dedup(root):
+    dedup_dir = root / "artifacts" / "data_dedup"
+    config = DataDedupConfig(
+        data_dedup_dir=str(dedup_dir),
+        report_file_path=str(dedup_dir / "dedup_report.json"),
+        data_yaml_file_path=str(dedup_dir / "data.yaml"),
+        collected_images_dir=str(root / "CollectedImages"),
+        max_workers=1,
+        artifact_store_dir=str(root / "artifacts" / "store"),
+    )
+    ingestion = DataIngestionArtifact(
+        data_zip_file_path="", feature_store_path=str(root / "feature_store")
+    )
+    return DataDedup(ingestion, config)
+
+
+def test_collected_folders_map_to_class_names(dataset):
+    samples = list_dataset_samples(
+        str(dataset / "feature_store"), str(dataset / "CollectedImages")
+    )
+    labels = {
+        os.path.basename(os.path.dirname(path)): label
+        for path, _, label, split in samples if split == "collected"
+    }
+    assert labels == {"Hello": 1, "IloveYou": 0, "main": -1}
+
+
+def test_data_yaml_always_has_val(dataset):
+    artifact = make_dedup(dataset).initiate_data_dedup()
+
+    with open(artifact.data_yaml_path) as f:
+        text = f.read()
+    data = yaml.safe_load(text)
+    assert data["val"] == data["test"]
+    assert "no val split" in text
+    with open(data["val"]) as f:
+        assert [os.path.basename(line.strip()) for line in f] == ["sign.jpg"]
+
+
+def test_dedup_groups_copies_in_collected_images(dataset):
+    artifact = make_dedup(dataset).initiate_data_dedup()
+    report = read_json(artifact.report_file_path)
+
+    assert report["num_images"] == 7
+    hello_dir = os.path.realpath(dataset / "CollectedImages" / "Hello")
+    group = next(g for g in report["groups"] if g["keep"].startswith(hello_dir))
+    assert group["keep"] == os.path.join(hello_dir, HELLO + ".jpg")
+    assert sorted(os.path.relpath(m["path"], os.path.dirname(hello_dir)) for m in group["members"]) == [
+        os.path.join("Hello", HELLO + " - Copy (2).jpg"),
+        os.path.join("Hello", HELLO + " - Copy.jpg"),
+        os.path.join("Hello", HELLO + ".jpg"),
+        os.path.join("main", HELLO + ".jpg"),
+    ]
@@ -0,0 +1,178 @@
+import hashlib
+import http.server
+import io
+import os
+import re
+import threading
+import zipfile
+from dataclasses import replace
+
+import pytest
+
+from signLanguage.components.data_ingestion import DataIngestion
+from signLanguage.entity.config_entity import DataIngestionConfig
+from signLanguage.exception import SignException
+from signLanguage.utils.main_utils import download_url, extract_zip_parallel
+
+PART_SIZE = 4 * 1024
+
+
+def make_archive() -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("export/data.yaml", "train: ../train/images\nnames: ['hello']\n")
+        for i in range(12):
+            # Incompressible, so the archive spans several parts
+            archive.writestr(f"export/train/images/{i}.jpg", os.urandom(2048))
+    return buffer.getvalue()
+
+
+class ArchiveServer:
+    """
+    Serves one archive over HTTP on localhost with Range and ETag support.
+    Once `truncate_after` ranged GETs have been answered, later ones send
+    only half their body and drop the connection.
+    """
+
+    def __init__(self, body: bytes):
+        self.body = body
+        self.truncate_after = None
+        self.ranges = []
+        server = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                match = re.match(r"bytes=(\d+)-(\d+)", self.headers.get("Range", ""))
+                if not match:
+                    self.send_response(200)
+                    self.send_header("Content-Length", str(len(server.body)))
+                    self.send_header("ETag", '"v1"')
+                    self.end_headers()
+                    self.wfile.write(server.body)
+                    return
+
+                start, end = int(match.group(1)), int(match.group(2))
+                chunk = server.body[start:end + 1]
+                if end > start:
+                    server.ranges.append(start)
+                self.send_response(206)
+                self.send_header("Content-Range", f"bytes {start}-{end}/{len(server.body)}")
+                self.send_header("Content-Length", str(len(chunk)))
+                self.send_header("ETag", '"v1"')
+                self.end_headers()
+
+                parts = len(server.ranges)
+                if server.truncate_after is not None and parts > server.truncate_after and end > start:
+                    self.wfile.write(chunk[:len(chunk) // 2])
+                    self.close_connection = True
+                    return
+                self.wfile.write(chunk)
+
+        self.httpd = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.url = f"http://127.0.0.1:{self.httpd.server_port}/sign_language_data.zip"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def archive():
+    return make_archive()
+
+
+@pytest.fixture
+def server(archive):
+    with ArchiveServer(archive) as server:
+        yield server
+
+
+def test_download_resumes_after_truncated_attempt(tmp_path, archive, server):
+    file_path = str(tmp_path / "data.zip")
+    num_parts = -(-len(archive) // PART_SIZE)
+
+    server.truncate_after = 2
+    with pytest.raises(SignException):
+        download_url(server.url, file_path, part_size=PART_SIZE, max_workers=1)
+    assert not os.path.exists(file_path)
+    first_attempt = set(server.ranges)
+
+    server.truncate_after = None
+    server.ranges.clear()
+    download_url(server.url, file_path, part_size=PART_SIZE, max_workers=4)
+
+    with open(file_path, "rb") as f:
+        assert f.read() == archive
+    # Only the parts missing after the first attempt were fetched again
+    assert len(server.ranges) == num_parts - 2
+    assert len(first_attempt - set(server.ranges)) == 2
+    assert not os.path.exists(file_path + ".part.json")
+
+
+def ingestion_for(tmp_path, url, sha256=""):
+    return DataIngestion(replace(
+        DataIngestionConfig(),
+        data_ingestion_dir=str(tmp_path / "ingestion"),
+        feature_store_file_path=str(tmp_path / "ingestion" / "feature_store"),
+        data_download_url=url,
+        data_download_sha256=sha256,
+        download_part_size=PART_SIZE,
+        max_workers=4,
+    ))
+
+
+def test_checksum_mismatch_rejects_archive(tmp_path, server):
+    ingestion = ingestion_for(tmp_path, server.url, sha256="0" * 64)
+
+    with pytest.raises(SignException, match="Checksum mismatch"):
+        ingestion.download_data()
+    assert not os.path.exists(tmp_path / "ingestion" / "sign_language_data.zip")
+
+
+def test_verified_archive_is_reused_until_its_size_changes(tmp_path, archive, server):
+    ingestion = ingestion_for(tmp_path, server.url, sha256=hashlib.sha256(archive).hexdigest())
+    zip_file_path = ingestion.download_data()
+
+    server.ranges.clear()
+    assert ingestion.download_data() == zip_file_path
+    assert server.ranges == []
+
+    with open(zip_file_path, "r+b") as f:
+        f.truncate(len(archive) // 2)
+    ingestion.download_data()
+    assert server.ranges
+    with open(zip_file_path, "rb") as f:
+        assert f.read() == archive
+
+
+def test_extraction_is_parallel_and_skipped_when_current(tmp_path, archive, server):
+    ingestion = ingestion_for(tmp_path, server.url, sha256=hashlib.sha256(archive).hexdigest())
+    feature_store = ingestion.extract_zip_file(ingestion.download_data())
+
+    with zipfile.ZipFile(io.BytesIO(archive)) as source:
+        for name in source.namelist():
+            with open(os.path.join(feature_store, name), "rb") as f:
+                assert f.read() == source.read(name)
+
+    marker = os.path.join(feature_store, ".extracted.json")
+    mtime = os.stat(marker).st_mtime_ns
+    ingestion.extract_zip_file(os.path.join(tmp_path, "ingestion", "sign_language_data.zip"))
+    assert os.stat(marker).st_mtime_ns == mtime
+
+
+def test_extraction_rejects_paths_outside_target(tmp_path):
+    zip_file_path = tmp_path / "evil.zip"
+    with zipfile.ZipFile(zip_file_path, "w") as archive:
+        archive.writestr("../escaped.txt", "nope")
+
+    with pytest.raises(SignException, match="Unsafe path"):
+        extract_zip_parallel(str(zip_file_path), str(tmp_path / "out"), max_workers=2)
+    assert not os.path.exists(tmp_path / "escaped.txt")
@@ -0,0 +1,121 @@
+import os
+
+import cv2
+import numpy as np
+import pytest
+import yaml
+
+from signLanguage.components.data_validation import DataValidation
+from signLanguage.entity.artifacts_entity import DataIngestionArtifact
+from signLanguage.entity.config_entity import DataValidationConfig
+from signLanguage.utils.main_utils import read_json
+
+DATA_YAML = {
+    "path": "C:/sign_data/sign_language.v4i.yolov5pytorch",
+    "train": "../train/images",
+    "test": "../test/images",
+    "nc": 2,
+    "names": ["hello", "yes"],
+}
+
+
+def write_image(path, value):
+    _, jpeg = cv2.imencode(".jpg", np.full((16, 16, 3), value, np.uint8))
+    path.write_bytes(jpeg.tobytes())
+
+
+@pytest.fixture
+def feature_store(tmp_path):
+    export = tmp_path / "feature_store" / "export"
+    for split, values in (("train", (10, 60)), ("test", (110,))):
+        (export / split / "images").mkdir(parents=True)
+        (export / split / "labels").mkdir(parents=True)
+        for i, value in enumerate(values):
+            write_image(export / split / "images" / f"{i}.jpg", value)
+            (export / split / "labels" / f"{i}.txt").write_text(f"{i % 2} 0.5 0.5 0.2 0.2\n")
+    (export / "data.yaml").write_text(yaml.safe_dump(DATA_YAML))
+    (tmp_path / "data.zip").write_bytes(b"zip")
+    return tmp_path
+
+
+def make_validation(root):
+    validation_dir = root / "artifacts" / "data_validation"
+    config = DataValidationConfig(
+        data_validation_dir=str(validation_dir),
+        valid_status_file_dir=str(validation_dir / "status.txt"),
+        report_file_path=str(validation_dir / "report.json"),
+        manifest_file_path=str(root / "artifacts" / "store" / "validation_manifest.json"),
+        max_workers=1,
+        artifact_store_dir=str(root / "artifacts" / "store"),
+    )
+    artifact = DataIngestionArtifact(
+        data_zip_file_path=str(root / "data.zip"),
+        feature_store_path=str(root / "feature_store"),
+    )
+    return DataValidation(data_ingestion_artifact=artifact, data_validation_config=config)
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    # initiate_data_validation links the archive into the working directory
+    workdir = tmp_path / "work"
+    workdir.mkdir()
+    monkeypatch.chdir(workdir)
+    return workdir
+
+
+def test_clean_dataset_is_valid(feature_store, workdir):
+    artifact = make_validation(feature_store).initiate_data_validation()
+
+    assert artifact.validation_status is True
+    report = read_json(artifact.report_file_path)
+    assert (report["images"], report["labels"], report["errors"]) == (3, 3, [])
+    assert os.path.samefile(workdir / "data.zip", feature_store / "data.zip")
+
+
+def test_corrupt_label_fails_validation(feature_store, workdir):
+    labels = feature_store / "feature_store" / "export" / "train" / "labels"
+    (labels / "0.txt").write_text("0 0.5 0.5 0.2\n7 0.5 0.5 0.2 0.2\n1 x 0.5 0.2 0.2\n0 0.5 1.5 0.2 0.2\n")
+
+    artifact = make_validation(feature_store).initiate_data_validation()
+
+    assert artifact.validation_status is False
+    errors = [e for e in read_json(artifact.report_file_path)["errors"] if "0.txt" in e]
+    assert [e.split(": ", 1)[1] for e in errors] == [
+        "line 1: expected 5 fields, got 4",
+        "line 2: class id 7 outside [0, 2)",
+        "line 3: not numeric",
+        "line 4: coordinates outside [0, 1]",
+    ]
+    # A failed validation does not link the archive for training
+    assert not os.path.exists(workdir / "data.zip")
+
+
+def test_broken_image_missing_pair_and_duplicates_are_reported(feature_store):
+    export = feature_store / "feature_store" / "export"
+    (export / "train" / "images" / "1.jpg").write_bytes(b"not a jpeg")
+    (export / "test" / "labels" / "0.txt").unlink()
+    write_image(export / "test" / "images" / "dup.jpg", 10)
+    (export / "test" / "labels" / "dup.txt").write_text("0 0.5 0.5 0.2 0.2\n")
+
+    report = make_validation(feature_store).validate_dataset()
+
+    assert report["valid"] is False
+    assert any(e.endswith("1.jpg: image does not decode") for e in report["errors"])
+    assert any(e.endswith("image 0 has no label file") for e in report["errors"])
+    assert [sorted(os.path.basename(p) for p in group) for group in report["duplicate_groups"]] == [
+        ["0.jpg", "dup.jpg"]
+    ]
+
+
+def test_only_changed_files_are_rechecked(feature_store):
+    validation = make_validation(feature_store)
+    assert validation.validate_dataset()["rechecked_files"] == 6
+    assert validation.validate_dataset()["rechecked_files"] == 0
+
+    label = feature_store / "feature_store" / "export" / "test" / "labels" / "0.txt"
+    label.write_text("5 0.5 0.5 0.2 0.2\n")
+    report = validation.validate_dataset()
+
+    assert report["rechecked_files"] == 1
+    assert report["errors"] == [f"{label}: line 1: class id 5 outside [0, 2)"]
@@ -0,0 +1,70 @@
+import json
+import os
+import subprocess
+import sys
+import textwrap
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs as a script so the pool workers can re-import its module, and so
+# configuring root logging does not replace pytest's handlers
+SCRIPT = textwrap.dedent("""
+    import logging
+    import sys
+
+    from signLanguage import logger
+    from signLanguage.utils.main_utils import process_pool
+
+
+    def work(value):
+        logging.getLogger("worker").info("hashed chunk %s", value)
+        return value
+
+
+    if __name__ == "__main__":
+        logger.lOG_FILE_PATH = sys.argv[1]
+        logger.configure_logging()
+
+        token = logger.stage_var.set("data_dedup")
+        with process_pool(2) as pool:
+            assert sorted(pool.map(work, range(4))) == [0, 1, 2, 3]
+        logger.stage_var.reset(token)
+        logging.info("pipeline done")
+""")
+
+
+def run_script(tmp_path):
+    script = tmp_path / "pipeline.py"
+    script.write_text(SCRIPT)
+    log_file = tmp_path / "log" / "run.log"
+    subprocess.run(
+        [sys.executable, str(script), str(log_file)],
+        cwd=ROOT_DIR,
+        env=dict(os.environ, PYTHONPATH=ROOT_DIR),
+        check=True,
+        timeout=120,
+    )
+    return log_file
+
+
+def test_pool_worker_records_reach_the_parent_log(tmp_path):
+    log_file = run_script(tmp_path)
+
+    records = [json.loads(line) for line in log_file.read_text().splitlines()]
+    worker_records = [r for r in records if r["logger"] == "worker"]
+    assert sorted(r["message"] for r in worker_records) == [
+        f"hashed chunk {i}" for i in range(4)
+    ]
+    assert {r["stage"] for r in worker_records} == {"data_dedup"}
+    assert records[-1]["message"] == "pipeline done"
+
+
+def test_importing_the_logger_configures_nothing():
+    from logging.handlers import QueueHandler
+
+    from signLanguage import logger
+
+    assert logger.listener is None
+    assert not any(
+        isinstance(handler, QueueHandler) for handler in logger.logging.getLogger().handlers
+    )
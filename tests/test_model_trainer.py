@@ -0,0 +1,26 @@
+import os
+
+import pytest
+
+torch = pytest.importorskip("torch")
+
+from signLanguage.components.model_trainer import LAST_CHECKPOINT, ModelTrainer
+from signLanguage.entity.artifacts_entity import DataDedupArtifact
+from signLanguage.entity.config_entity import ModelTrainerConfig
+
+
+class PickledModel:
+    """Stands in for the nn.Module YOLOv5 pickles into its checkpoints"""
+
+
+@pytest.mark.parametrize("epoch, finished", [(-1, True), (3, False)])
+def test_run_finished_reads_yolov5_checkpoints(tmp_path, epoch, finished):
+    config = ModelTrainerConfig(checkpoint_dir=str(tmp_path), run_name="train")
+    trainer = ModelTrainer(DataDedupArtifact("report.json", "data.yaml", 0, 0, 0), config)
+    os.makedirs(os.path.join(trainer.run_dir, "weights"))
+    torch.save(
+        {"epoch": epoch, "model": PickledModel()},
+        os.path.join(trainer.run_dir, "weights", LAST_CHECKPOINT),
+    )
+
+    assert trainer.run_finished() is finished
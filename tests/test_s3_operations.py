@@ -0,0 +1,50 @@
+import pickle
+
+import boto3
+import pytest
+
+moto = pytest.importorskip("moto")
+pytest.importorskip("pandas")
+pytest.importorskip("mypy_boto3_s3")
+
+from signLanguage.configuration.s3_operations import S3Operation
+
+BUCKET = "sign-test"
+
+
+@pytest.fixture
+def s3(monkeypatch):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+    with moto.mock_aws():
+        client = boto3.client("s3", region_name="us-east-1")
+        resource = boto3.resource("s3", region_name="us-east-1")
+        client.create_bucket(Bucket=BUCKET)
+        yield S3Operation(s3_client=client, s3_resource=resource)
+
+
+def test_read_object_decodes_text(s3):
+    s3.s3_client.put_object(Bucket=BUCKET, Key="names.txt", Body="hello\nyes\n".encode())
+    obj = s3.s3_resource.Object(BUCKET, "names.txt")
+
+    assert s3.read_object(obj) == "hello\nyes\n"
+    assert s3.read_object(obj, make_readable=True).read() == "hello\nyes\n"
+
+
+def test_read_object_raw_is_memoryview(s3):
+    payload = bytes(range(256)) * 1024
+    s3.s3_client.put_object(Bucket=BUCKET, Key="blob.bin", Body=payload)
+    obj = s3.s3_resource.Object(BUCKET, "blob.bin")
+
+    data = s3.read_object(obj, decode=False)
+    assert isinstance(data, memoryview)
+    assert data == payload
+    assert s3.read_object(obj, decode=False, make_readable=True).read() == payload
+
+
+def test_load_model_from_s3(s3):
+    model = {"weights": [1.0, 2.0], "names": ["hello"]}
+    s3.s3_client.put_object(Bucket=BUCKET, Key="model.pkl", Body=pickle.dumps(model))
+
+    assert s3.load_model_from_s3(BUCKET, "model.pkl") == model
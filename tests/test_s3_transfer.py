@@ -0,0 +1,109 @@
+import json
+import os
+import socket
+
+import boto3
+import pytest
+
+moto_server = pytest.importorskip("moto.server")
+
+from signLanguage.configuration.s3_transfer import (
+    PARTIAL_SUFFIX,
+    STATE_SUFFIX,
+    download_file_resumable,
+)
+
+BUCKET = "sign-test"
+KEY = "weights/best.pt"
+PART_SIZE = 256 * 1024
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """
+    boto3 client talking real HTTP to a moto server on localhost
+    """
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    server = moto_server.ThreadedMotoServer(ip_address="127.0.0.1", port=free_port())
+    server.start()
+    try:
+        host, port = server.get_host_and_port()
+        s3 = boto3.client(
+            "s3", region_name="us-east-1", endpoint_url=f"http://{host}:{port}"
+        )
+        s3.create_bucket(Bucket=BUCKET)
+        yield s3
+    finally:
+        server.stop()
+
+
+class FlakyClient:
+    """
+    Passes calls through to a real client but fails ranged GETs past the
+    first `allowed` ones, like a connection dropping mid-download
+    """
+
+    def __init__(self, client, allowed: int):
+        self.client = client
+        self.allowed = allowed
+        self.ranges = []
+
+    def head_object(self, **kwargs):
+        return self.client.head_object(**kwargs)
+
+    def get_object(self, **kwargs):
+        self.ranges.append(kwargs["Range"])
+        if len(self.ranges) > self.allowed:
+            raise ConnectionError("connection reset")
+        return self.client.get_object(**kwargs)
+
+
+def test_interrupted_download_resumes_missing_parts(client, tmp_path):
+    payload = os.urandom(5 * PART_SIZE + 123)
+    client.put_object(Bucket=BUCKET, Key=KEY, Body=payload)
+    target = str(tmp_path / "best.pt")
+
+    flaky = FlakyClient(client, allowed=2)
+    with pytest.raises(ConnectionError):
+        download_file_resumable(flaky, BUCKET, KEY, target, part_size=PART_SIZE, max_workers=1)
+
+    assert not os.path.exists(target)
+    with open(target + STATE_SUFFIX) as f:
+        assert json.load(f)["done"] == [0, 1]
+
+    resumed = FlakyClient(client, allowed=100)
+    download_file_resumable(resumed, BUCKET, KEY, target, part_size=PART_SIZE, max_workers=3)
+
+    # Only the four parts that were missing are fetched again
+    starts = sorted(int(r.split("=")[1].split("-")[0]) for r in resumed.ranges)
+    assert starts == [2 * PART_SIZE, 3 * PART_SIZE, 4 * PART_SIZE, 5 * PART_SIZE]
+    with open(target, "rb") as f:
+        assert f.read() == payload
+    assert not os.path.exists(target + PARTIAL_SUFFIX)
+    assert not os.path.exists(target + STATE_SUFFIX)
+
+
+def test_changed_object_restarts_download(client, tmp_path):
+    target = str(tmp_path / "best.pt")
+    client.put_object(Bucket=BUCKET, Key=KEY, Body=os.urandom(3 * PART_SIZE))
+    with pytest.raises(ConnectionError):
+        download_file_resumable(
+            FlakyClient(client, allowed=1), BUCKET, KEY, target, part_size=PART_SIZE, max_workers=1
+        )
+
+    # A new upload changes the ETag, so the recorded parts no longer count
+    payload = os.urandom(3 * PART_SIZE)
+    client.put_object(Bucket=BUCKET, Key=KEY, Body=payload)
+    fresh = FlakyClient(client, allowed=100)
+    download_file_resumable(fresh, BUCKET, KEY, target, part_size=PART_SIZE, max_workers=2)
+
+    assert len(fresh.ranges) == 3
+    with open(target, "rb") as f:
+        assert f.read() == payload
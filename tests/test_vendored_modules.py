@@ -0,0 +1,64 @@
+import os
+import threading
+
+import pytest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_DIR = os.path.join(ROOT_DIR, "sign-language-deployment", "app")
+
+# The API deploys without the training package, so it carries copies of
+# these modules; only the import of the S3_* settings may differ
+VENDORED = [
+    ("signLanguage/configuration/s3_client.py", "s3_client.py"),
+    ("signLanguage/configuration/s3_transfer.py", "s3_transfer.py"),
+    ("signLanguage/utils/json_logging.py", "json_logging.py"),
+]
+
+
+def read(path: str) -> str:
+    with open(path) as f:
+        return f.read()
+
+
+@pytest.mark.parametrize("source, copy", VENDORED)
+def test_deployment_copy_matches_training_module(source, copy):
+    vendored = read(os.path.join(APP_DIR, copy)).replace(
+        "from app.constant import (", "from signLanguage.constant.training_pipeline import ("
+    )
+    assert vendored == read(os.path.join(ROOT_DIR, source))
+
+
+def test_vendored_s3_settings_read_the_same_variables():
+    import ast
+
+    from signLanguage.constant import training_pipeline
+
+    tree = ast.parse(read(os.path.join(APP_DIR, "constant.py")))
+    names = {
+        target.id
+        for node in tree.body if isinstance(node, ast.Assign)
+        for target in node.targets if target.id.startswith("S3_")
+    }
+    assert names
+    assert names <= set(vars(training_pipeline))
+
+
+def test_thread_resources_share_the_pooled_client(monkeypatch):
+    pytest.importorskip("boto3")
+    from signLanguage.configuration import s3_client
+
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+    s3_client.reset_clients()
+    resources = []
+    threads = [
+        threading.Thread(target=lambda: resources.append(s3_client.get_s3_resource()))
+        for _ in range(2)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert resources[0] is not resources[1]
+    assert {id(resource.meta.client) for resource in resources} == {id(s3_client.get_s3_client())}
+    s3_client.reset_clients()